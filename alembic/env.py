@@ -10,6 +10,9 @@ from alembic import context
 
 import app.models.user
 import app.models.task
+import app.models.embedding_cache
+import app.models.leaderboard
+import app.models.daily_plan
 # Import Base and models
 from app.db.session import Base
 
@@ -0,0 +1,33 @@
+"""embedding storage
+
+Revision ID: a7c2e9f04b13
+Revises: f1b7d4a2c8e6
+Create Date: 2026-10-18 16:03:27.915034
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.vectors import convert_columns
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c2e9f04b13'
+down_revision: Union[str, Sequence[str], None] = 'f1b7d4a2c8e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Applies EMBEDDING_DIMENSIONS / EMBEDDING_STORAGE as configured when the
+    # migration runs; a no-op with the defaults. Vectors that changed size
+    # are cleared for `python -m app.cli.reembed` to recompute.
+    convert_columns(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    convert_columns(op.get_bind(), 1536, "vector")
@@ -0,0 +1,42 @@
+"""vector ann indexes
+
+Revision ID: b3f9a1c7d2e4
+Revises: 4ba6947e4712
+Create Date: 2026-10-18 09:12:40.311402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f9a1c7d2e4'
+down_revision: Union[str, Sequence[str], None] = '4ba6947e4712'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so
+    # build the HNSW indexes in autocommit mode without locking writes.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_resume_embedding_hnsw "
+            "ON users USING hnsw (resume_embedding vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_embedding_hnsw "
+            "ON tasks USING hnsw (embedding vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_embedding_hnsw")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_resume_embedding_hnsw")
@@ -0,0 +1,39 @@
+"""daily plan cache
+
+Revision ID: c9e4b7a15d02
+Revises: a7c2e9f04b13
+Create Date: 2026-10-18 17:21:05.448193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e4b7a15d02'
+down_revision: Union[str, Sequence[str], None] = 'a7c2e9f04b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant default: no table rewrite on PostgreSQL 11+
+    op.add_column('users', sa.Column('task_set_version', sa.BigInteger(), server_default='0', nullable=False))
+    op.create_table('daily_plans',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('task_set_version', sa.BigInteger(), nullable=False),
+    sa.Column('plan', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('generated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_plans')
+    op.drop_column('users', 'task_set_version')
@@ -0,0 +1,41 @@
+"""task embedding status
+
+Revision ID: d82b6f0e13c5
+Revises: c41d8e2f6a90
+Create Date: 2026-10-18 11:20:44.107935
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd82b6f0e13c5'
+down_revision: Union[str, Sequence[str], None] = 'c41d8e2f6a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('embedding_status', sa.String(length=20), nullable=True))
+    op.add_column('tasks', sa.Column('embedding_attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('tasks', sa.Column('embedding_retry_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE tasks SET embedding_status = 'ready' WHERE embedding IS NOT NULL")
+    op.create_index(
+        'ix_tasks_embedding_pending',
+        'tasks',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text("embedding_status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_embedding_pending', table_name='tasks')
+    op.drop_column('tasks', 'embedding_retry_at')
+    op.drop_column('tasks', 'embedding_attempts')
+    op.drop_column('tasks', 'embedding_status')
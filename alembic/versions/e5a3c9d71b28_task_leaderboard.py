@@ -0,0 +1,75 @@
+"""task leaderboard
+
+Revision ID: e5a3c9d71b28
+Revises: d82b6f0e13c5
+Create Date: 2026-10-18 13:05:12.391604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a3c9d71b28'
+down_revision: Union[str, Sequence[str], None] = 'd82b6f0e13c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_task_totals',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total_minutes', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('task_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index('ix_user_task_totals_rank', 'user_task_totals', ['total_minutes', 'user_id'], unique=False)
+    op.create_table('user_task_daily_totals',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('total_minutes', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('task_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    op.create_index('ix_user_task_daily_totals_day', 'user_task_daily_totals', ['day'], unique=False)
+
+    # Backfill; afterwards `python -m app.cli.leaderboard check` should be clean
+    op.execute("""
+        INSERT INTO user_task_daily_totals (user_id, day, total_minutes, task_count)
+        SELECT assigned_user_id,
+               COALESCE(created_at, timezone('utc', now()))::date,
+               COALESCE(SUM(total_minutes), 0),
+               COUNT(*)
+        FROM tasks
+        WHERE assigned_user_id IS NOT NULL
+        GROUP BY 1, 2
+    """)
+    op.execute("""
+        INSERT INTO user_task_totals (user_id, total_minutes, task_count)
+        SELECT user_id, SUM(total_minutes), SUM(task_count)
+        FROM user_task_daily_totals
+        GROUP BY user_id
+    """)
+
+    # Built concurrently, after the backfill has committed, so a large tasks
+    # table stays writable meanwhile
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_assigned_user_id "
+            "ON tasks (assigned_user_id)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_task_daily_totals_day', table_name='user_task_daily_totals')
+    op.drop_table('user_task_daily_totals')
+    op.drop_index('ix_user_task_totals_rank', table_name='user_task_totals')
+    op.drop_table('user_task_totals')
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_assigned_user_id")
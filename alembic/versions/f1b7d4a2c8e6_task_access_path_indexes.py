@@ -0,0 +1,40 @@
+"""task access path indexes
+
+Revision ID: f1b7d4a2c8e6
+Revises: e5a3c9d71b28
+Create Date: 2026-10-18 14:12:40.662180
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b7d4a2c8e6'
+down_revision: Union[str, Sequence[str], None] = 'e5a3c9d71b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so a large tasks table stays writable meanwhile.
+    # tasks(assigned_user_id) was added with the leaderboard (e5a3c9d71b28).
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_user_id_created_at_id "
+            "ON tasks (user_id, created_at, id)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_user_id_status "
+            "ON tasks (user_id, status)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_user_id_status")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_user_id_created_at_id")
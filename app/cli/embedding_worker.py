@@ -0,0 +1,33 @@
+"""
+Embedding/assignment queue worker for EMBEDDING_MODE=queue.
+
+Polls tasks with embedding_status = 'pending' (FOR UPDATE SKIP LOCKED, so
+several workers can run side by side), embeds them in batches and assigns
+the nearest user.
+
+    python -m app.cli.embedding_worker --batch-size 50
+    python -m app.cli.embedding_worker --once   # drain the backlog and exit
+"""
+import argparse
+import logging
+
+from app.services.embedding_worker import run_worker
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--once", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    run_worker(
+        batch_size=args.batch_size,
+        poll_interval=args.poll_interval,
+        once=args.once,
+    )
+
+
+if __name__ == "__main__":
+    main()
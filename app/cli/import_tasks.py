@@ -0,0 +1,61 @@
+"""
+Bulk-import tasks from a CSV or JSON Lines file.
+
+    python -m app.cli.import_tasks estimates.csv --owner-email lead@example.com
+    python -m app.cli.import_tasks backlog.jsonl --owner-email lead@example.com --chunk-size 1000
+"""
+import argparse
+import sys
+import time
+
+from app.core.config import TASK_IMPORT_CHUNK_SIZE
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.services.task_import import import_tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="CSV (with header) or .jsonl file, '-' for stdin")
+    parser.add_argument("--owner-email", required=True, help="User who will own the tasks")
+    parser.add_argument("--format", choices=["csv", "jsonl"])
+    parser.add_argument("--chunk-size", type=int, default=TASK_IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "jsonl")
+    started = time.monotonic()
+
+    def progress(report):
+        done = report.imported + report.failed
+        rate = done / max(time.monotonic() - started, 1e-6)
+        print(
+            f"{done} rows processed ({report.imported} imported, "
+            f"{report.failed} failed, {rate:.0f} rows/s)",
+            file=sys.stderr,
+        )
+
+    db = SessionLocal()
+    try:
+        owner = db.query(User.id).filter(User.email == args.owner_email).first()
+        if owner is None:
+            raise SystemExit(f"No user with email {args.owner_email}")
+
+        stream = sys.stdin if args.path == "-" else open(args.path, newline="", encoding="utf-8-sig")
+        with stream:
+            report = import_tasks(
+                db, stream, fmt, owner.id, chunk_size=args.chunk_size, progress=progress
+            )
+    finally:
+        db.close()
+
+    for error in report.errors:
+        print(f"row {error.row}: {error.error}", file=sys.stderr)
+    if report.failed > len(report.errors):
+        print(f"... and {report.failed - len(report.errors)} more failed rows", file=sys.stderr)
+
+    print(report.model_dump_json())
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Maintain the /stats/top-users leaderboard tables.
+
+    python -m app.cli.leaderboard check     # exit 1 if totals drifted from tasks
+    python -m app.cli.leaderboard rebuild   # recompute from tasks
+"""
+import argparse
+import sys
+
+from app.db.session import SessionLocal
+from app.services import leaderboard
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", choices=["check", "rebuild"])
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        if args.command == "rebuild":
+            leaderboard.rebuild(db)
+            print("Leaderboard rebuilt")
+            return
+
+        mismatches = leaderboard.check(db)
+
+    for mismatch in mismatches:
+        print(
+            f"{mismatch['table']} {mismatch['key']}: "
+            f"expected {mismatch['expected']}, stored {mismatch['stored']}"
+        )
+    if mismatches:
+        print(f"{len(mismatches)} mismatches; run `python -m app.cli.leaderboard rebuild`")
+        sys.exit(1)
+    print("Leaderboard is consistent")
+
+
+if __name__ == "__main__":
+    main()
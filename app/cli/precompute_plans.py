@@ -0,0 +1,41 @@
+"""
+Precompute /ai/suggest daily plans for active users (meant for an off-peak cron job).
+
+Only users with an open task whose plan is missing, outdated or past
+PLAN_TTL_SECONDS are rebuilt, at most --concurrency at a time.
+
+    python -m app.cli.precompute_plans --concurrency 8
+    python -m app.cli.precompute_plans --all   # rebuild every active user's plan
+"""
+import argparse
+import logging
+import time
+
+from app.core.config import PLAN_PRECOMPUTE_CONCURRENCY
+from app.db.session import SessionLocal
+from app.services.plan_cache import precompute_plans, users_needing_plans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=PLAN_PRECOMPUTE_CONCURRENCY)
+    parser.add_argument("--all", action="store_true", help="Rebuild current plans too")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with SessionLocal() as db:
+        user_ids = users_needing_plans(db, everything=args.all)
+    print(f"{len(user_ids)} plans to build")
+
+    started = time.perf_counter()
+
+    def progress(done, failed):
+        if (done + failed) % 100 == 0:
+            print(f"{done + failed}/{len(user_ids)} ({failed} failed, {time.perf_counter() - started:.1f}s)")
+
+    done, failed = precompute_plans(user_ids, args.concurrency, progress)
+    print(f"Built {done} plans, {failed} failed, in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
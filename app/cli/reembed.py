@@ -0,0 +1,86 @@
+"""
+Convert embedding columns to the configured size/type and recompute vectors.
+
+    python -m app.cli.reembed --convert            # alter columns, then fill missing vectors
+    python -m app.cli.reembed                      # fill vectors that are NULL (resumable)
+    python -m app.cli.reembed --all --only users   # recompute every resume vector
+    python -m app.cli.reembed --all --reassign     # recompute everything, then re-run assignment
+
+An interrupted run resumes from its checkpoint (REEMBED_CHECKPOINT_PATH)
+when started again with the same options; --restart ignores it.
+
+Running API workers pick up new resume vectors when their resume matrix
+expires (RESUME_MATRIX_TTL_SECONDS) or on restart.
+"""
+import argparse
+import os
+
+from app.core.config import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_DIMENSIONS,
+    EMBEDDING_STORAGE,
+    REEMBED_CHECKPOINT_PATH,
+    REEMBED_WORKERS,
+)
+from app.db.session import engine
+from app.db.vectors import convert_columns
+from app.services import reembed
+
+
+def report(stats):
+    eta = f"{stats['eta_seconds']:.0f}s" if stats["eta_seconds"] is not None else "?"
+    print(
+        f"{stats['target']}: {stats['done']}/{stats['total']} "
+        f"({stats['rows_per_second']} rows/s, ETA {eta}, checkpoint id {stats['checkpoint']})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", choices=list(reembed.TARGETS), help="Just users or just tasks")
+    parser.add_argument("--convert", action="store_true", help="Alter columns to the configured type first")
+    parser.add_argument("--all", action="store_true", help="Recompute vectors that are already set")
+    parser.add_argument("--batch-size", type=int, default=EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=REEMBED_WORKERS, help="Batches embedded at once")
+    parser.add_argument("--checkpoint", default=REEMBED_CHECKPOINT_PATH)
+    parser.add_argument("--restart", action="store_true", help="Ignore any saved checkpoint")
+    parser.add_argument(
+        "--reassign", action="store_true",
+        help="Afterwards re-run assignment for TODO tasks (all of them if resumes changed)",
+    )
+    args = parser.parse_args()
+
+    if args.convert:
+        with engine.begin() as connection:
+            converted = convert_columns(connection)
+        for table, column, old_type in converted:
+            print(f"{table}.{column}: {old_type} -> {EMBEDDING_STORAGE}({EMBEDDING_DIMENSIONS})")
+
+    if args.restart and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    checkpoint = reembed.Checkpoint(args.checkpoint)
+
+    updated = {}
+    resumed = False
+    for target in [args.only] if args.only else reembed.TARGETS:
+        resumed = resumed or checkpoint.load(reembed.run_signature(target, args.all)) > 0
+        done, ids = reembed.reembed(
+            target, args.batch_size, args.workers, everything=args.all,
+            checkpoint=checkpoint, progress=report, collect_ids=args.reassign,
+        )
+        updated[target] = ids
+        print(f"{target}: done, {done} rows")
+
+    if args.reassign:
+        # New resume vectors can change the best match for any task, and rows
+        # embedded before an interruption are not in `updated`
+        everything = resumed or "tasks" not in updated or bool(updated.get("users"))
+        moved = reembed.reassign_tasks(
+            None if everything else updated["tasks"], args.batch_size,
+            progress=lambda checked, moved: print(f"reassign: {checked} checked, {moved} moved"),
+        )
+        print(f"reassign: done, {moved} tasks moved")
+
+
+if __name__ == "__main__":
+    main()
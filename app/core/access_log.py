@@ -0,0 +1,123 @@
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.config import (
+    ACCESS_LOG_QUEUE_SIZE,
+    ACCESS_LOG_SAMPLE_RATE,
+    ACCESS_LOG_SLOW_MS,
+)
+
+# orjson is optional; it's several times faster than json for these dicts
+try:
+    import orjson
+
+    ENCODER = "orjson"
+
+    def dumps(data) -> str:
+        return orjson.dumps(data, default=str).decode("utf-8")
+except ImportError:
+    ENCODER = "json"
+
+    def dumps(data) -> str:
+        return json.dumps(data, separators=(",", ":"), default=str)
+
+
+class JSONFormatter(logging.Formatter):
+    """Encodes dict messages; runs on the listener thread, not the event loop."""
+
+    def format(self, record):
+        if isinstance(record.msg, dict):
+            return dumps(record.msg)
+        return super().format(record)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: records are dropped when the queue is full."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Leave formatting to the listener thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class AccessLog:
+    """
+    Structured access log written by a background QueueListener, so a slow
+    stdout never stalls request handling. Successful, fast requests are
+    sampled at `sample_rate`; errors and requests slower than `slow_ms`
+    are always kept.
+    """
+
+    def __init__(self, queue_size: int, sample_rate: float, slow_ms: float):
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.sampled_out = 0
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+
+        self.logger = logging.getLogger("sprintsync.access")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def should_log(self, status_code: int, latency_ms: float) -> bool:
+        if status_code >= 400 or latency_ms >= self.slow_ms:
+            return True
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def log(self, data: dict, level: int = logging.INFO):
+        if not self.should_log(data.get("status_code", 500), data.get("latency_ms", 0)):
+            self.sampled_out += 1
+            return
+
+        if self._listener is None:
+            self.start()
+        self.logger.log(level, data)
+
+    def start(self):
+        with self._lock:
+            if self._listener is not None:
+                return
+            output = logging.StreamHandler(sys.stdout)
+            output.setFormatter(JSONFormatter())
+            self._listener = QueueListener(self.handler.queue, output)
+            self._listener.start()
+
+    def stop(self):
+        """Flush queued records and stop the writer thread."""
+        with self._lock:
+            if self._listener is not None:
+                self._listener.stop()
+                self._listener = None
+
+    def stats(self):
+        return {
+            "queued": self.handler.queue.qsize(),
+            "dropped": self.handler.dropped,
+            "sampled_out": self.sampled_out,
+            "sample_rate": self.sample_rate,
+            "encoder": ENCODER,
+        }
+
+
+access_log = AccessLog(
+    queue_size=ACCESS_LOG_QUEUE_SIZE,
+    sample_rate=ACCESS_LOG_SAMPLE_RATE,
+    slow_ms=ACCESS_LOG_SLOW_MS,
+)
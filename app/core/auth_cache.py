@@ -0,0 +1,96 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+
+from sqlalchemy import event
+
+from app.core.config import (
+    TOKEN_CACHE_SIZE,
+    TOKEN_CACHE_TTL_SECONDS,
+    PRINCIPAL_CACHE_SIZE,
+    PRINCIPAL_CACHE_TTL_SECONDS,
+)
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user, detached from any session."""
+    id: int
+    email: str
+    is_admin: bool
+
+
+class TTLCache:
+    """Bounded LRU whose entries also expire after a per-entry TTL."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value, ttl_seconds: float = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+
+        with self.lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self.lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_cache = TTLCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL_SECONDS)
+principal_cache = TTLCache(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_principal(mapper, connection, target):
+    # Other workers drop their copy when PRINCIPAL_CACHE_TTL_SECONDS expires
+    principal_cache.invalidate(target.id)
+
+
+def stats():
+    principal = principal_cache.stats()
+    return {
+        "token": token_cache.stats(),
+        "principal": principal,
+        # Every principal hit is a users query that didn't happen
+        "db_lookups_saved": principal["hits"],
+    }
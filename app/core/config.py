@@ -2,4 +2,126 @@ import os
 
 SECRET_KEY = "super-secret-development-key"
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60
\ No newline at end of file
+ACCESS_TOKEN_EXPIRE_MINUTES = 60
+
+# Password hashing: bcrypt cost factor and the process pool it runs in.
+# Hashes with a different cost are upgraded on the next successful login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+# Hash/verify jobs allowed in flight before new ones are rejected with 503
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+# get_current_user caches (per worker): verified JWTs and slim user principals
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+
+# Database: "sync" (psycopg2, threadpool handlers) or "async" (asyncpg,
+# async handlers from app/routers/aio; requires the `async` extra)
+DB_MODE = os.getenv("DB_MODE", "sync")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Connections per engine opened in the background at start-up; /health/ready
+# answers 503 until the primary has accepted them
+DB_POOL_WARMUP_CONNECTIONS = int(os.getenv("DB_POOL_WARMUP_CONNECTIONS", str(DB_POOL_SIZE)))
+DB_WARMUP_RETRY_SECONDS = float(os.getenv("DB_WARMUP_RETRY_SECONDS", "1"))
+DB_WARMUP_MAX_RETRY_SECONDS = float(os.getenv("DB_WARMUP_MAX_RETRY_SECONDS", "30"))
+
+# Read replicas (DATABASE_REPLICA_URLS, comma separated) for read-only endpoints
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_CHECK_INTERVAL_SECONDS = float(os.getenv("REPLICA_CHECK_INTERVAL_SECONDS", "2"))
+# After a user writes, their reads stay on the primary for this long
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+# pgvector ANN search parameters, applied to every new DB connection
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "40"))
+IVFFLAT_PROBES = int(os.getenv("IVFFLAT_PROBES", "10"))
+
+# Task auto-assignment: "sql" ranks users in Postgres, "numpy" uses the
+# in-process resume matrix (app/services/assignment_service.py)
+ASSIGNMENT_ENGINE = os.getenv("ASSIGNMENT_ENGINE", "sql")
+RESUME_MATRIX_TTL_SECONDS = int(os.getenv("RESUME_MATRIX_TTL_SECONDS", "300"))
+
+# POST /ai/rebalance: each user may take up to the average open minutes
+# times (1 + slack); tasks consider their N most similar users, and the
+# current assignee gets a small similarity bonus so near-ties don't churn.
+REBALANCE_CAPACITY_SLACK = float(os.getenv("REBALANCE_CAPACITY_SLACK", "0.2"))
+REBALANCE_CANDIDATES = int(os.getenv("REBALANCE_CANDIDATES", "32"))
+REBALANCE_STICKINESS = float(os.getenv("REBALANCE_STICKINESS", "0.02"))
+
+# Embeddings: "openai" (remote API) or "local" (CPU hashing + random projection,
+# see app/services/embedding_providers.py)
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai")
+LOCAL_EMBEDDING_SEED = int(os.getenv("LOCAL_EMBEDDING_SEED", "0"))
+# Token directions the `local` provider keeps per process (4 bytes x
+# EMBEDDING_DIMENSIONS each, so ~25 MB at 1536 dimensions)
+LOCAL_EMBEDDING_CACHE_SIZE = int(os.getenv("LOCAL_EMBEDDING_CACHE_SIZE", "4096"))
+OPENAI_EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+# Stored vectors: dimensions (below 1536 uses text-embedding-3's shortened
+# output) and column type, "vector" (float32) or "halfvec" (float16).
+# After changing either run `python -m app.cli.reembed --convert`.
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "1536"))
+EMBEDDING_STORAGE = os.getenv("EMBEDDING_STORAGE", "vector")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))
+EMBEDDING_CACHE_PERSIST = os.getenv("EMBEDDING_CACHE_PERSIST", "true").lower() == "true"
+# Max inputs per embeddings API call for batch callers (bulk import, backfills)
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+# Single-text requests (task creation, registration) are collected for up
+# to this long, or until the batch is full, and sent as one call with
+# identical texts deduplicated. 0 sends each request on its own.
+EMBEDDING_DISPATCH_WINDOW_MS = float(os.getenv("EMBEDDING_DISPATCH_WINDOW_MS", "5"))
+EMBEDDING_DISPATCH_MAX_BATCH = int(os.getenv("EMBEDDING_DISPATCH_MAX_BATCH", "64"))
+# Batches in flight at once
+EMBEDDING_DISPATCH_CONCURRENCY = int(os.getenv("EMBEDDING_DISPATCH_CONCURRENCY", "4"))
+
+# How create_task computes embeddings/assignment: "sync" (inline),
+# "background" (in-process worker pool) or "queue" (left pending for
+# `python -m app.cli.embedding_worker`)
+EMBEDDING_MODE = os.getenv("EMBEDDING_MODE", "sync")
+EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "4"))
+EMBEDDING_MAX_ATTEMPTS = int(os.getenv("EMBEDDING_MAX_ATTEMPTS", "5"))
+EMBEDDING_RETRY_BASE_SECONDS = float(os.getenv("EMBEDDING_RETRY_BASE_SECONDS", "2"))
+# A claimed task is not picked up by another worker for this long; if its
+# worker dies, the task becomes due again once the lease runs out
+EMBEDDING_CLAIM_LEASE_SECONDS = int(os.getenv("EMBEDDING_CLAIM_LEASE_SECONDS", "120"))
+# Background mode: how often pending tasks that are due (retries, or left
+# queued by a restart) are swept back into the worker pool
+EMBEDDING_SWEEP_INTERVAL_SECONDS = float(os.getenv("EMBEDDING_SWEEP_INTERVAL_SECONDS", "5"))
+
+# /ai/suggest plan cache (daily_plans). A plan is fresh while its task-set
+# version matches and it is younger than the TTL; with stale-while-revalidate
+# an outdated plan up to PLAN_MAX_STALE_SECONDS old is served while a
+# background worker rebuilds it.
+PLAN_TTL_SECONDS = int(os.getenv("PLAN_TTL_SECONDS", "21600"))
+PLAN_STALE_WHILE_REVALIDATE = os.getenv("PLAN_STALE_WHILE_REVALIDATE", "true").lower() == "true"
+PLAN_MAX_STALE_SECONDS = int(os.getenv("PLAN_MAX_STALE_SECONDS", "86400"))
+PLAN_REFRESH_WORKERS = int(os.getenv("PLAN_REFRESH_WORKERS", "2"))
+# Plans generated at once by `python -m app.cli.precompute_plans`
+PLAN_PRECOMPUTE_CONCURRENCY = int(os.getenv("PLAN_PRECOMPUTE_CONCURRENCY", "4"))
+
+# `python -m app.cli.reembed`: concurrent embedding batches and where an
+# interrupted run records its progress
+REEMBED_WORKERS = int(os.getenv("REEMBED_WORKERS", "4"))
+REEMBED_CHECKPOINT_PATH = os.getenv("REEMBED_CHECKPOINT_PATH", ".reembed-checkpoint.json")
+
+# Bulk task import
+TASK_IMPORT_CHUNK_SIZE = int(os.getenv("TASK_IMPORT_CHUNK_SIZE", "500"))
+# Per-row errors kept in the import report; later failures are only counted
+TASK_IMPORT_MAX_ERRORS = int(os.getenv("TASK_IMPORT_MAX_ERRORS", "100"))
+
+# Streaming task export
+TASK_EXPORT_CHUNK_SIZE = int(os.getenv("TASK_EXPORT_CHUNK_SIZE", "2000"))
+
+# Set to a shared, empty-at-startup directory when running several workers
+# so /metrics/prometheus aggregates all of them (prometheus_client reads it too)
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+# Access log: successful requests are sampled; errors and slow ones are always kept
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+ACCESS_LOG_SLOW_MS = float(os.getenv("ACCESS_LOG_SLOW_MS", "1000"))
+ACCESS_LOG_QUEUE_SIZE = int(os.getenv("ACCESS_LOG_QUEUE_SIZE", "10000"))
+
+# Serialise listings, stats and metrics straight from rows (orjson if installed)
+# instead of re-validating them through response models
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "true").lower() == "true"
@@ -1,48 +1,106 @@
+import math
 import time
-import json
 import logging
 import traceback
-from fastapi import Request
+from app.core.access_log import access_log
 from app.core.metrics import metrics
+from app.core.config import READ_YOUR_WRITES_SECONDS
+from app.db.replicas import LAST_WRITE_COOKIE
+from app.db.session import replica_router
 
 logger = logging.getLogger("sprintsync")
 logging.basicConfig(level=logging.INFO)
 
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
 
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
 
-    try:
-        response = await call_next(request)
-        latency = round((time.time() - start_time) * 1000, 2)
-        metrics.record_request(request.url.path, latency, response.status_code)
+def route_template(scope) -> str:
+    """
+    The matched route's path template (e.g. /tasks/{task_id}), so latency
+    labels don't grow with every id; unmatched paths share one label.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
 
+
+def last_write_cookie() -> bytes:
+    return (
+        f"{LAST_WRITE_COOKIE}={time.time()}; HttpOnly; "
+        f"Max-Age={math.ceil(READ_YOUR_WRITES_SECONDS)}; Path=/; SameSite=lax"
+    ).encode("latin-1")
+
+
+class RequestLoggingMiddleware:
+    """
+    Access logging, request metrics and read-your-writes marking as a plain
+    ASGI middleware. The status code is taken from http.response.start and
+    the user from scope["state"] (set by get_current_user), so responses,
+    including streamed ones, pass through without being re-wrapped.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        method = scope["method"]
+        status_code = 500
         user_id = None
-        if hasattr(request.state, "user"):
-            user_id = getattr(request.state.user, "id", None)
 
-        log_data = {
-            "method": request.method,
-            "path": request.url.path,
-            "status_code": response.status_code,
-            "user_id": user_id,
-            "latency_ms": latency,
-        }
+        async def send_wrapper(message):
+            nonlocal status_code, user_id
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                user = scope.get("state", {}).get("user")
+                user_id = getattr(user, "id", None)
 
-        logger.info(json.dumps(log_data))
-        return response
+                if (
+                    user_id is not None
+                    and method not in READ_ONLY_METHODS
+                    and status_code < 400
+                ):
+                    # Keep this user's reads on the primary for a moment
+                    replica_router.mark_write(user_id)
+                    if replica_router.replicas:
+                        message["headers"] = [
+                            *message.get("headers", []),
+                            (b"set-cookie", last_write_cookie()),
+                        ]
+            await send(message)
 
-    except Exception as e:
-        latency = round((time.time() - start_time) * 1000, 2)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            latency = round((time.perf_counter() - start_time) * 1000, 2)
+            metrics.record_request(
+                scope["path"], latency, 500, method=method, route=route_template(scope)
+            )
 
-        error_log = {
-            "method": request.method,
-            "path": request.url.path,
-            "status_code": 500,
-            "latency_ms": latency,
-            "error": str(e),
-            "traceback": traceback.format_exc(),
-        }
+            error_log = {
+                "method": method,
+                "path": scope["path"],
+                "status_code": 500,
+                "latency_ms": latency,
+                "error": str(e),
+                "traceback": traceback.format_exc(),
+            }
+
+            access_log.log(error_log, logging.ERROR)
+            raise
 
-        logger.error(json.dumps(error_log))
-        raise
\ No newline at end of file
+        latency = round((time.perf_counter() - start_time) * 1000, 2)
+        metrics.record_request(
+            scope["path"], latency, status_code, method=method, route=route_template(scope)
+        )
+
+        access_log.log({
+            "method": method,
+            "path": scope["path"],
+            "status_code": status_code,
+            "user_id": user_id,
+            "latency_ms": latency,
+        })
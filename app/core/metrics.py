@@ -1,36 +1,190 @@
+import bisect
+import os
 from collections import defaultdict
-from threading import Lock
+from threading import Lock, local
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.core.config import PROMETHEUS_MULTIPROC_DIR
+
+# Log-spaced bucket upper bounds in ms, four per doubling from 0.1ms to
+# ~100s, so interpolated percentiles land within ~10% of the true value.
+LATENCY_BUCKETS_MS = tuple(0.1 * 2 ** (i / 4) for i in range(81))
+
+PROMETHEUS_BUCKETS_SECONDS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+# In multiprocess mode (PROMETHEUS_MULTIPROC_DIR set) prometheus_client
+# backs this with mmap files that every worker writes to.
+REQUEST_LATENCY = Histogram(
+    "sprintsync_http_request_duration_seconds",
+    "HTTP request latency by route template, method and status code",
+    ["method", "route", "status"],
+    buckets=PROMETHEUS_BUCKETS_SECONDS,
+)
+
+# Embedding micro-batching (app/services/embedding_service.py)
+EMBEDDING_DISPATCH_BATCH = Histogram(
+    "sprintsync_embedding_batch_size",
+    "Texts per batched embeddings call from the dispatcher",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+EMBEDDING_DISPATCH_WAIT = Histogram(
+    "sprintsync_embedding_dispatch_wait_seconds",
+    "Time a text waited for its batch to be sent",
+    buckets=(0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+EMBEDDING_DISPATCH_COALESCED = Counter(
+    "sprintsync_embedding_coalesced",
+    "Embedding requests served by an identical text already queued or in flight",
+)
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, latency_ms: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.count += 1
+        self.total += latency_ms
+
+    def merge(self, other: "LatencyHistogram"):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, q: float):
+        """Estimate the q-quantile (0..1), interpolating inside its bucket."""
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = LATENCY_BUCKETS_MS[i - 1] if i else 0.0
+                upper = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else lower
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return LATENCY_BUCKETS_MS[-1]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "average_ms": round(self.total / self.count, 2) if self.count else 0,
+            "p50_ms": round(self.percentile(0.50), 2) if self.count else None,
+            "p95_ms": round(self.percentile(0.95), 2) if self.count else None,
+            "p99_ms": round(self.percentile(0.99), 2) if self.count else None,
+        }
+
+
+class _Shard:
+    """One thread's counters; only that thread writes to it."""
+
+    __slots__ = ("requests_by_path", "error_count", "latency", "prometheus")
 
-class Metrics:
     def __init__(self):
-        self.total_requests = 0
-        self.error_count = 0
-        self.total_latency = 0.0
         self.requests_by_path = defaultdict(int)
-        self.lock = Lock()
+        self.error_count = 0
+        # (method, route, status) -> LatencyHistogram
+        self.latency = {}
+        # (method, route, status) -> labelled prometheus child
+        self.prometheus = {}
+
 
-    def record_request(self, path: str, latency_ms: float, status_code: int):
-        with self.lock:
-            self.total_requests += 1
-            self.total_latency += latency_ms
-            self.requests_by_path[path] += 1
+class Metrics:
+    """
+    Request metrics recorded into per-thread shards, so the request path
+    takes no shared lock; readers merge the shards on demand. Numbers are
+    for this worker process only; /metrics/prometheus aggregates workers.
+    """
 
-            if status_code >= 400:
-                self.error_count += 1
+    def __init__(self):
+        self._local = local()
+        self._shards = []
+        self._shards_lock = Lock()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard()
+            self._local.shard = shard
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def record_request(self, path: str, latency_ms: float, status_code: int, method: str = "GET", route: str = None):
+        shard = self._shard()
+        shard.requests_by_path[path] += 1
+        if status_code >= 400:
+            shard.error_count += 1
+
+        key = (method, route or path, status_code)
+        histogram = shard.latency.get(key)
+        if histogram is None:
+            histogram = shard.latency[key] = LatencyHistogram()
+            shard.prometheus[key] = REQUEST_LATENCY.labels(key[0], key[1], str(status_code))
+        histogram.observe(latency_ms)
+        shard.prometheus[key].observe(latency_ms / 1000)
 
     def get_metrics(self):
-        avg_latency = (
-            self.total_latency / self.total_requests
-            if self.total_requests > 0
-            else 0
-        )
+        with self._shards_lock:
+            shards = list(self._shards)
+
+        requests_by_path = defaultdict(int)
+        error_count = 0
+        latency = defaultdict(LatencyHistogram)
+        overall = LatencyHistogram()
 
+        for shard in shards:
+            error_count += shard.error_count
+            for path, count in dict(shard.requests_by_path).items():
+                requests_by_path[path] += count
+            for key, histogram in dict(shard.latency).items():
+                latency[key].merge(histogram)
+                overall.merge(histogram)
+
+        latency_by_route = defaultdict(dict)
+        for (method, route, status_code), histogram in sorted(latency.items()):
+            latency_by_route[f"{method} {route}"][str(status_code)] = histogram.summary()
+
+        summary = overall.summary()
         return {
-            "total_requests": self.total_requests,
-            "error_count": self.error_count,
-            "average_latency_ms": round(avg_latency, 2),
-            "requests_by_path": dict(self.requests_by_path),
+            "worker_pid": os.getpid(),
+            "total_requests": overall.count,
+            "error_count": error_count,
+            "average_latency_ms": summary["average_ms"],
+            "p50_latency_ms": summary["p50_ms"],
+            "p95_latency_ms": summary["p95_ms"],
+            "p99_latency_ms": summary["p99_ms"],
+            "requests_by_path": dict(requests_by_path),
+            "latency_by_route": dict(latency_by_route),
         }
 
 
-metrics = Metrics()
\ No newline at end of file
+def prometheus_exposition():
+    """(body, content_type) in Prometheus text format, across all workers in multiprocess mode."""
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+metrics = Metrics()
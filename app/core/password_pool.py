@@ -0,0 +1,127 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from threading import BoundedSemaphore, Lock
+
+from passlib.context import CryptContext
+
+from app.core.config import (
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_PENDING,
+)
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
+
+
+class PasswordPoolBusy(Exception):
+    """Raised instead of queueing when too many hash jobs are in flight."""
+
+
+# Run inside the pool's worker processes
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(password, hashed_password)
+
+
+class PasswordPool:
+    """
+    Runs bcrypt in separate processes so its CPU burn doesn't hold the GIL
+    of the API worker. At most `max_pending` jobs may be queued or running;
+    beyond that callers get PasswordPoolBusy straight away.
+    With workers=0 everything runs inline (useful for scripts).
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._slots = BoundedSemaphore(max_pending)
+        self._executor = None
+        self._executor_lock = Lock()
+        self._counter_lock = Lock()
+        self.pending = 0
+        self.rejected = 0
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._counter_lock:
+                self.rejected += 1
+            raise PasswordPoolBusy()
+
+        with self._counter_lock:
+            self.pending += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+
+        future.add_done_callback(self._release)
+        return future
+
+    def hash(self, password: str) -> str:
+        if not self.workers:
+            return _hash(password)
+        return self.submit(_hash, password).result()
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        if not self.workers:
+            return _verify(password, hashed_password)
+        return self.submit(_verify, password, hashed_password).result()
+
+    async def hash_async(self, password: str) -> str:
+        if not self.workers:
+            return _hash(password)
+        return await asyncio.wrap_future(self.submit(_hash, password))
+
+    async def verify_async(self, password: str, hashed_password: str) -> bool:
+        if not self.workers:
+            return _verify(password, hashed_password)
+        return await asyncio.wrap_future(self.submit(_verify, password, hashed_password))
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+        }
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # spawn: forking a threaded server process isn't safe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def _release(self, future):
+        with self._counter_lock:
+            self.pending -= 1
+        self._slots.release()
+
+
+password_pool = PasswordPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True for hashes made with another scheme or bcrypt cost than configured."""
+    try:
+        cost = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return cost != BCRYPT_ROUNDS or pwd_context.needs_update(hashed_password)
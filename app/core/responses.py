@@ -0,0 +1,55 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.config import FAST_JSON_RESPONSES
+
+# orjson is optional; without it the fast path still skips re-validation
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        # SUM() over integer columns comes back as NUMERIC; encode it the
+        # way jsonable_encoder does
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is installed."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def json_response(content, headers=None) -> JSONResponse:
+    """
+    Response for content built from trusted DB rows or our own counters:
+    serialised as-is in fast mode, skipping response_model validation and
+    jsonable_encoder. With FAST_JSON_RESPONSES off it goes through the
+    standard encoder instead.
+    """
+    if FAST_JSON_RESPONSES:
+        return FastJSONResponse(content, headers=headers)
+    return JSONResponse(jsonable_encoder(content), headers=headers)
+
+
+def rows_as_dicts(rows):
+    return [row._asdict() for row in rows]
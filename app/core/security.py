@@ -1,25 +1,37 @@
-from passlib.context import CryptContext
+import hashlib
+import time
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
-from app.models.user import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import SessionLocal, AsyncSessionLocal, replica_router
+from app.db.replicas import LAST_WRITE_COOKIE
+from app.core.password_pool import password_pool, password_needs_rehash
+from app.core.auth_cache import Principal, principal_cache, token_cache
+from app.repositories import users as user_repo
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi import Request
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_pool.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_pool.verify(plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_pool.hash_async(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.verify_async(plain_password, hashed_password)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -37,6 +49,19 @@ def verify_access_token(token: str):
         return None
 
 
+def verify_access_token_cached(token: str):
+    """verify_access_token, memoised by token digest until the token expires."""
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = token_cache.get(digest)
+    if payload is not None:
+        return payload
+
+    payload = verify_access_token(token)
+    if payload is not None:
+        token_cache.put(digest, payload, ttl_seconds=payload.get("exp", 0) - time.time())
+    return payload
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -45,21 +70,114 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _read_routing(request: Request):
+    """
+    (user_id, last_write_at) used to keep a user's reads on the primary
+    right after their own writes. The token is only decoded, not trusted
+    for anything beyond picking a database.
+    """
+    user_id = None
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        payload = verify_access_token_cached(authorization[7:])
+        if payload and payload.get("sub"):
+            user_id = int(payload["sub"])
+
+    try:
+        last_write_at = float(request.cookies.get(LAST_WRITE_COOKIE, ""))
+    except ValueError:
+        last_write_at = None
+
+    return user_id, last_write_at
+
+
+def open_read_session(request: Request) -> Session:
+    """A replica-routed session the caller is responsible for closing."""
+    return SessionLocal(bind=replica_router.engine_for(*_read_routing(request)))
+
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints, routed to a healthy replica if any."""
+    db = open_read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    bind = replica_router.async_engine_for(*_read_routing(request))
+    async with AsyncSessionLocal(bind=bind) as db:
+        yield db
+
+
+def _user_id_from_token(token: str) -> int:
+    payload = verify_access_token_cached(token)
+
+    if payload is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+    return int(payload.get("sub"))
+
+
+def _load_principal(db: Session, user_id: int):
+    row = user_repo.get_principal_row(db, user_id)
+
+    if row is None and db.get_bind() is not replica_router.primary:
+        # Replica may not have replayed a brand-new registration yet
+        with SessionLocal() as primary_db:
+            row = user_repo.get_principal_row(primary_db, user_id)
+
+    if row is None:
+        return None
+
+    principal = Principal(id=row.id, email=row.email, is_admin=row.is_admin)
+    principal_cache.put(user_id, principal)
+    return principal
+
+
 def get_current_user(
     request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-):
-    token = credentials.credentials
+    db: Session = Depends(get_read_db),
+) -> Principal:
+    user_id = _user_id_from_token(credentials.credentials)
 
-    payload = verify_access_token(token)
+    # The session only checks out a connection if the cache misses
+    user = principal_cache.get(user_id) or _load_principal(db, user_id)
 
-    if payload is None:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    if user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    request.state.user = user
+    return user
+
+
+async def get_current_user_async(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> Principal:
+    user_id = _user_id_from_token(credentials.credentials)
+
+    user = principal_cache.get(user_id)
+
+    if user is None:
+        row = await db.run_sync(user_repo.get_principal_row, user_id)
 
-    user_id = payload.get("sub")
+        if row is None and db.bind is not replica_router.async_primary:
+            # Replica may not have replayed a brand-new registration yet
+            async with AsyncSessionLocal() as primary_db:
+                row = await primary_db.run_sync(user_repo.get_principal_row, user_id)
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+        if row is not None:
+            user = Principal(id=row.id, email=row.email, is_admin=row.is_admin)
+            principal_cache.put(user_id, user)
 
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
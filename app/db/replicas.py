@@ -0,0 +1,123 @@
+import itertools
+import logging
+import threading
+import time
+
+from sqlalchemy import text
+
+from app.core.config import (
+    REPLICA_MAX_LAG_SECONDS,
+    REPLICA_CHECK_INTERVAL_SECONDS,
+    READ_YOUR_WRITES_SECONDS,
+)
+
+logger = logging.getLogger("sprintsync")
+
+# Set on responses to writes so stickiness also holds across workers
+LAST_WRITE_COOKIE = "sprintsync_last_write"
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+class ReplicaRouter:
+    """
+    Picks the engine for read-only sessions: round-robin over replicas whose
+    replication lag is within REPLICA_MAX_LAG_SECONDS, falling back to the
+    primary when none are healthy or the user wrote something recently.
+    Lag is polled by a background thread so requests never wait on it.
+    """
+
+    def __init__(self, primary, replicas, async_primary=None, async_replicas=None):
+        self.primary = primary
+        self.replicas = replicas
+        self.async_primary = async_primary
+        self.async_replicas = async_replicas or []
+        self.lag = [None] * len(replicas)
+        self.lock = threading.Lock()
+        self._checker_lock = threading.Lock()
+        self._healthy = []
+        self._next = itertools.count()
+        self._last_write = {}
+        self._checker = None
+
+    def mark_write(self, user_id: int):
+        now = time.monotonic()
+        with self.lock:
+            self._last_write[user_id] = now
+            if len(self._last_write) > 10000:
+                cutoff = now - READ_YOUR_WRITES_SECONDS
+                self._last_write = {
+                    uid: at for uid, at in self._last_write.items() if at > cutoff
+                }
+
+    def recently_wrote(self, user_id=None, last_write_at=None) -> bool:
+        if last_write_at is not None and time.time() - last_write_at < READ_YOUR_WRITES_SECONDS:
+            return True
+
+        written = self._last_write.get(user_id) if user_id is not None else None
+        return written is not None and time.monotonic() - written < READ_YOUR_WRITES_SECONDS
+
+    def choose(self, user_id=None, last_write_at=None):
+        """Index of the replica to read from, or None for the primary."""
+        if not self.replicas or self.recently_wrote(user_id, last_write_at):
+            return None
+
+        self._ensure_checker()
+        healthy = self._healthy
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    def engine_for(self, user_id=None, last_write_at=None):
+        index = self.choose(user_id, last_write_at)
+        return self.primary if index is None else self.replicas[index]
+
+    def async_engine_for(self, user_id=None, last_write_at=None):
+        index = self.choose(user_id, last_write_at)
+        return self.async_primary if index is None else self.async_replicas[index]
+
+    def check_lag(self):
+        healthy = []
+        for index, replica in enumerate(self.replicas):
+            try:
+                with replica.connect() as connection:
+                    lag = float(connection.execute(REPLICA_LAG_QUERY).scalar() or 0)
+            except Exception:
+                logger.warning("replica %s lag check failed", index, exc_info=True)
+                lag = None
+
+            self.lag[index] = lag
+            if lag is not None and lag <= REPLICA_MAX_LAG_SECONDS:
+                healthy.append(index)
+
+        self._healthy = healthy
+
+    def stats(self):
+        return {
+            "replicas": len(self.replicas),
+            "healthy": len(self._healthy),
+            "lag_seconds": list(self.lag),
+        }
+
+    def _ensure_checker(self):
+        if self._checker is not None:
+            return
+
+        with self._checker_lock:
+            if self._checker is None:
+                # First check runs inline so the very first reads can use replicas
+                self.check_lag()
+                self._checker = threading.Thread(
+                    target=self._check_loop, name="replica-lag", daemon=True
+                )
+                self._checker.start()
+
+    def _check_loop(self):
+        while True:
+            time.sleep(REPLICA_CHECK_INTERVAL_SECONDS)
+            self.check_lag()
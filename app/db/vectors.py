@@ -0,0 +1,92 @@
+"""
+Column type for stored embeddings, chosen by EMBEDDING_DIMENSIONS and
+EMBEDDING_STORAGE, and the DDL that converts existing columns to it.
+
+"halfvec" halves table and index size (16-bit floats); cosine rankings
+barely move since the vectors are unit length. pgvector has no int8
+vector type, so halfvec is the smallest storage that HNSW can index
+without a re-ranking step.
+"""
+import numpy as np
+from pgvector.sqlalchemy import HALFVEC, Vector
+from sqlalchemy import text
+
+from app.core.config import EMBEDDING_DIMENSIONS, EMBEDDING_STORAGE
+
+STORAGE_TYPES = {"vector": Vector, "halfvec": HALFVEC}
+COSINE_OPS = {"vector": "vector_cosine_ops", "halfvec": "halfvec_cosine_ops"}
+
+if EMBEDDING_STORAGE not in STORAGE_TYPES:
+    raise ValueError(f"Unknown EMBEDDING_STORAGE {EMBEDDING_STORAGE!r}")
+
+EMBEDDING_OPS = COSINE_OPS[EMBEDDING_STORAGE]
+
+# (table, column, HNSW index or None) for every stored embedding
+EMBEDDING_COLUMNS = [
+    ("users", "resume_embedding", "ix_users_resume_embedding_hnsw"),
+    ("tasks", "embedding", "ix_tasks_embedding_hnsw"),
+    ("embedding_cache", "embedding", None),
+]
+
+
+def embedding_type():
+    return STORAGE_TYPES[EMBEDDING_STORAGE](EMBEDDING_DIMENSIONS)
+
+
+def to_numpy(value) -> np.ndarray:
+    """float32 array from a loaded vector (halfvec columns load as HalfVector)."""
+    if hasattr(value, "to_numpy"):
+        value = value.to_numpy()
+    return np.asarray(value, dtype=np.float32)
+
+
+def column_type(connection, table: str, column: str) -> str:
+    return connection.execute(
+        text(
+            "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+            "WHERE attrelid = CAST(:table AS regclass) AND attname = :column"
+        ),
+        {"table": table, "column": column},
+    ).scalar()
+
+
+def convert_columns(connection, dimensions: int = EMBEDDING_DIMENSIONS, storage: str = EMBEDDING_STORAGE):
+    """
+    Alter every embedding column to `storage(dimensions)` and rebuild its
+    HNSW index. Same-size vectors are cast in place; vectors of another
+    size cannot be, so they are set to NULL (cache entries are deleted)
+    for `python -m app.cli.reembed` to recompute. Returns the converted
+    (table, column, old_type) triples; columns already of the target type
+    are left alone.
+
+    ALTER ... TYPE rewrites the table under an exclusive lock, so run this
+    in a maintenance window on large tables.
+    """
+    target = f"{storage}({dimensions})"
+    converted = []
+
+    for table, column, index in EMBEDDING_COLUMNS:
+        current = column_type(connection, table, column)
+        if current == target:
+            continue
+
+        same_size = current.endswith(f"({dimensions})")
+        if index:
+            connection.execute(text(f"DROP INDEX IF EXISTS {index}"))
+        if table == "embedding_cache" and not same_size:
+            connection.execute(text("DELETE FROM embedding_cache"))
+
+        using = f"{column}::{target}" if same_size else "NULL"
+        connection.execute(
+            text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {target} USING {using}")
+        )
+        if index:
+            connection.execute(
+                text(
+                    f"CREATE INDEX {index} ON {table} USING hnsw ({column} {COSINE_OPS[storage]}) "
+                    "WITH (m = 16, ef_construction = 64)"
+                )
+            )
+        converted.append((table, column, current))
+
+    return converted
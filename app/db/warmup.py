@@ -0,0 +1,158 @@
+"""
+Connection-pool warm-up and readiness.
+
+Start-up does not wait for the database. PoolWarmup opens pooled
+connections in a background thread, retrying with backoff until the
+primary answers, so the first requests find connections already
+established. /health (liveness) never touches the database;
+/health/ready (readiness) answers 503 until warm-up has reached the
+primary.
+"""
+import asyncio
+import logging
+import threading
+import time
+
+from sqlalchemy import text
+
+from app.core.config import (
+    DB_POOL_WARMUP_CONNECTIONS,
+    DB_WARMUP_MAX_RETRY_SECONDS,
+    DB_WARMUP_RETRY_SECONDS,
+)
+from app.db.session import engine, replica_engines
+
+logger = logging.getLogger("sprintsync")
+
+STARTING = "starting"
+READY = "ready"
+
+
+def open_connections(engine, count: int) -> int:
+    """
+    Hold `count` connections at once (capped at the pool size, as overflow
+    connections are not kept) and hand them back to the pool.
+    """
+    connections = []
+    try:
+        for _ in range(min(count, engine.pool.size())):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+async def open_async_connections(engine, count: int) -> int:
+    connections = []
+    try:
+        for _ in range(min(count, engine.sync_engine.pool.size())):
+            connection = await engine.connect()
+            connections.append(connection)
+            await connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            await connection.close()
+    return len(connections)
+
+
+class PoolWarmup:
+    """Background warm-up of the primary (required) and replica (best effort) pools."""
+
+    def __init__(self, primary, replicas, connections: int, retry_seconds: float, max_retry_seconds: float):
+        self.primary = primary
+        self.replicas = replicas
+        self.connections = connections
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.state = STARTING
+        self.attempts = 0
+        self.warmed = 0
+        self.last_error = None
+        self.seconds_to_ready = None
+        self._started_at = None
+        self._thread = None
+        self._async_task = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    def start(self, async_engine=None):
+        """Begin warming up; `async_engine` is warmed on the running event loop."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._started_at = time.perf_counter()
+            self._thread = threading.Thread(target=self._run, name="db-warmup", daemon=True)
+            self._thread.start()
+
+        if async_engine is not None:
+            # asyncpg connections belong to the loop that opened them
+            self._async_task = asyncio.get_running_loop().create_task(
+                self._warm_async(async_engine)
+            )
+
+    def stop(self):
+        self._stop.set()
+        if self._async_task is not None:
+            self._async_task.cancel()
+
+    def status(self):
+        return {
+            "status": self.state,
+            "attempts": self.attempts,
+            "warmed_connections": self.warmed,
+            "seconds_to_ready": self.seconds_to_ready,
+            "last_error": self.last_error,
+        }
+
+    def _run(self):
+        delay = self.retry_seconds
+        while not self._stop.is_set():
+            self.attempts += 1
+            try:
+                self.warmed = open_connections(self.primary, self.connections)
+            except Exception as e:
+                # Only the error type is reported: /health/ready is unauthenticated
+                self.last_error = type(e).__name__
+                logger.warning("database warm-up attempt %s failed: %s", self.attempts, e)
+                self._stop.wait(delay)
+                delay = min(2 * delay, self.max_retry_seconds)
+                continue
+
+            self.last_error = None
+            self.seconds_to_ready = round(time.perf_counter() - self._started_at, 3)
+            self.state = READY
+            logger.info("database ready after %ss (%s connections)", self.seconds_to_ready, self.warmed)
+            break
+
+        for index, replica in enumerate(self.replicas):
+            if self._stop.is_set():
+                return
+            try:
+                open_connections(replica, self.connections)
+            except Exception as e:
+                # The replica router already skips replicas it cannot reach
+                logger.warning("replica %s warm-up failed: %s", index, e)
+
+    async def _warm_async(self, async_engine):
+        try:
+            await open_async_connections(async_engine, self.connections)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("async pool warm-up failed: %s", e)
+
+
+pool_warmup = PoolWarmup(
+    engine,
+    replica_engines,
+    DB_POOL_WARMUP_CONNECTIONS,
+    DB_WARMUP_RETRY_SECONDS,
+    DB_WARMUP_MAX_RETRY_SECONDS,
+)
@@ -1,25 +1,50 @@
-from fastapi import FastAPI
-from app.db.session import engine
-from sqlalchemy import text
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from app.db.session import async_engine
+from app.db.warmup import pool_warmup
 from app.db.session import Base
 from app.models import user  # Important import
-from app.routers import auth
-from app.core.security import get_current_user
-from app.models.user import User
+from app.core.config import DB_MODE, EMBEDDING_MODE, FAST_JSON_RESPONSES
+from app.core.responses import FastJSONResponse
+from app.core.security import get_current_user, get_current_user_async
+from app.core.auth_cache import Principal
 from fastapi import Depends
 from app.models import task
-from app.routers import tasks
-from app.routers import ai
-from app.core.logging_middleware import log_requests
+from app.models import leaderboard
+from app.models import daily_plan
+from app.core.logging_middleware import RequestLoggingMiddleware
+from app.core.access_log import access_log
 from app.routers import metrics
-from app.routers import stats
+from app.services.embedding_worker import embedding_pipeline
+from app.services.plan_cache import plan_refresher
+from app.services.embedding_service import embedding_dispatcher
+from app.core.password_pool import password_pool, PasswordPoolBusy
+
+if DB_MODE == "async":
+    from app.routers.aio import auth, tasks, ai, stats
+    current_user_dependency = get_current_user_async
+else:
+    from app.routers import auth, tasks, ai, stats
+    current_user_dependency = get_current_user
 
 app = FastAPI(
     title="SprintSync API",
     version="0.1.0",
-    description="Internal sprint tracking tool for AI consultancy"
+    description="Internal sprint tracking tool for AI consultancy",
+    default_response_class=FastJSONResponse if FAST_JSON_RESPONSES else JSONResponse,
 )
-app.middleware("http")(log_requests)
+app.add_middleware(RequestLoggingMiddleware)
+
+
+@app.exception_handler(PasswordPoolBusy)
+async def password_pool_busy(request: Request, exc: PasswordPoolBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many concurrent logins, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
 app.include_router(auth.router)
 app.include_router(tasks.router)
 app.include_router(ai.router)
@@ -28,22 +53,43 @@ app.include_router(stats.router)
 
 
 @app.on_event("startup")
-def startup():
-    # Test connection
-    with engine.connect() as connection:
-        connection.execute(text("SELECT 1"))
-    print("Database connected successfully ✅")
+async def startup():
+    # Connections are opened in the background; /health/ready reports when
+    # the database is reachable instead of start-up blocking on it
+    pool_warmup.start(async_engine)
+    if EMBEDDING_MODE == "background":
+        # Also re-queues tasks left pending when the previous process stopped
+        embedding_pipeline.start()
+
 
-    # Create tables
-    print("Tables created successfully ✅")
+@app.on_event("shutdown")
+async def shutdown():
+    pool_warmup.stop()
+    embedding_pipeline.shutdown()
+    plan_refresher.shutdown()
+    embedding_dispatcher.close()
+    password_pool.shutdown()
+    access_log.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
+# Liveness: the process is up and serving; never touches the database
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
 
+
+# Readiness: 503 until the connection pool has reached the database
+@app.get("/health/ready")
+def readiness_check(response: Response):
+    status = pool_warmup.status()
+    if not pool_warmup.ready:
+        response.status_code = 503
+    return status
+
 @app.get("/me")
-def read_current_user(current_user: User = Depends(get_current_user)):
+def read_current_user(current_user: Principal = Depends(current_user_dependency)):
     return {
         "id": current_user.id,
         "email": current_user.email,
@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class DailyPlan(Base):
+    """The last /ai/suggest plan generated for a user, and the task set it was built from."""
+
+    __tablename__ = "daily_plans"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    # users.task_set_version when the plan's tasks were read
+    task_set_version = Column(BigInteger, nullable=False)
+    plan = Column(JSONB, nullable=False)
+    generated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+from app.db.session import Base
+from app.db.vectors import embedding_type
+
+
+class EmbeddingCacheEntry(Base):
+    __tablename__ = "embedding_cache"
+
+    # sha256 of model + normalised input text
+    key = Column(String(64), primary_key=True)
+    model = Column(String(100), nullable=False)
+    embedding = Column(embedding_type(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,30 @@
+from sqlalchemy import BigInteger, Column, Date, ForeignKey, Index, Integer
+from app.db.session import Base
+
+
+class UserTaskTotal(Base):
+    """Running totals of the tasks assigned to each user (the leaderboard)."""
+
+    __tablename__ = "user_task_totals"
+    __table_args__ = (
+        # Top-N reads walk this index and stop after N rows
+        Index("ix_user_task_totals_rank", "total_minutes", "user_id"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_minutes = Column(BigInteger, nullable=False, default=0, server_default="0")
+    task_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class UserTaskDailyTotal(Base):
+    """The same totals bucketed by task creation day, for windowed leaderboards."""
+
+    __tablename__ = "user_task_daily_totals"
+    __table_args__ = (
+        Index("ix_user_task_daily_totals_day", "day"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    total_minutes = Column(BigInteger, nullable=False, default=0, server_default="0")
+    task_count = Column(Integer, nullable=False, default=0, server_default="0")
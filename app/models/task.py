@@ -1,12 +1,30 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index, text
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.db.session import Base
-from pgvector.sqlalchemy import Vector
+from app.db.vectors import EMBEDDING_OPS, embedding_type
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index(
+            "ix_tasks_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": EMBEDDING_OPS},
+        ),
+        # Small partial index the embedding workers poll
+        Index(
+            "ix_tasks_embedding_pending",
+            "id",
+            postgresql_where=text("embedding_status = 'pending'"),
+        ),
+        # Owner listing/export, newest first and keyset-paginated
+        Index("ix_tasks_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_tasks_user_id_status", "user_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -18,11 +36,17 @@ class Task(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     # Auto-assigned user
-    assigned_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    assigned_user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    embedding = Column(Vector(1536), nullable=True)
+    # Deferred: only loaded when explicitly selected
+    embedding = deferred(Column(embedding_type(), nullable=True))
+
+    # pending -> ready / failed when embeddings are computed in the background
+    embedding_status = Column(String(20), nullable=True)
+    embedding_attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    embedding_retry_at = Column(DateTime(timezone=True), nullable=True)
 
     owner = relationship(
         "User",
@@ -1,18 +1,30 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import BigInteger, Column, Integer, String, Boolean, DateTime, Text, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from app.db.session import Base
-from pgvector.sqlalchemy import Vector
+from app.db.vectors import EMBEDDING_OPS, embedding_type
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # ANN index used by auto-assignment (cosine distance)
+        Index(
+            "ix_users_resume_embedding_hnsw",
+            "resume_embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"resume_embedding": EMBEDDING_OPS},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_admin = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Bumped whenever a task the user owns changes; keys the cached daily plan
+    task_set_version = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     tasks = relationship(
         "Task",
@@ -21,4 +33,5 @@ class User(Base):
     )
 
     resume_text = Column(Text, nullable=True)
-    resume_embedding = Column(Vector(1536), nullable=True)
\ No newline at end of file
+    # Deferred: only loaded when explicitly selected
+    resume_embedding = deferred(Column(embedding_type(), nullable=True))
\ No newline at end of file
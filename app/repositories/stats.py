@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.leaderboard import UserTaskDailyTotal, UserTaskTotal
+from app.models.user import User
+
+
+def top_users(db: Session, limit: int = 5, days=None):
+    """
+    Top users by assigned task minutes, read from the leaderboard tables.
+    With `days`, only tasks created in the last `days` days (UTC) count.
+    """
+    if days is None:
+        return (
+            db.query(User.id, User.email, UserTaskTotal.total_minutes)
+            .join(UserTaskTotal, UserTaskTotal.user_id == User.id)
+            .filter(UserTaskTotal.task_count > 0)
+            .order_by(UserTaskTotal.total_minutes.desc(), UserTaskTotal.user_id.desc())
+            .limit(limit)
+            .all()
+        )
+
+    # Rank on the daily table first so only the top `limit` rows join users
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    total_minutes = func.sum(UserTaskDailyTotal.total_minutes).label("total_minutes")
+    ranked = (
+        db.query(UserTaskDailyTotal.user_id, total_minutes)
+        .filter(UserTaskDailyTotal.day >= since)
+        .group_by(UserTaskDailyTotal.user_id)
+        .having(func.sum(UserTaskDailyTotal.task_count) > 0)
+        .order_by(total_minutes.desc(), UserTaskDailyTotal.user_id.desc())
+        .limit(limit)
+        .subquery()
+    )
+    return (
+        db.query(User.id, User.email, ranked.c.total_minutes)
+        .join(ranked, ranked.c.user_id == User.id)
+        .order_by(ranked.c.total_minutes.desc(), User.id.desc())
+        .all()
+    )
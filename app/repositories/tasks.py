@@ -0,0 +1,121 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from app.models.task import Task
+from app.schemas.task import TaskCreate, TaskListQuery, TaskResponse
+# Register the flush listeners that keep the leaderboard and the users'
+# task-set versions (daily plan cache keys) in step with tasks
+from app.services import leaderboard, plan_versions  # noqa: F401
+
+# Exactly the columns TaskResponse renders, so listings never load vectors
+TASK_RESPONSE_COLUMNS = [getattr(Task, name) for name in TaskResponse.model_fields]
+
+# What the daily planner reads
+PLAN_TASK_COLUMNS = [
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.total_minutes,
+    Task.created_at,
+]
+
+
+def new_task(task: TaskCreate, user_id: int) -> Task:
+    return Task(
+        title=task.title,
+        description=task.description,
+        status=task.status,
+        total_minutes=task.total_minutes,
+        user_id=user_id
+    )
+
+
+def encode_cursor(created_at: datetime, task_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), task_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str):
+    """Inverse of encode_cursor; raises ValueError for anything malformed."""
+    try:
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def get_owned_task(db: Session, task_id: int, user_id: int):
+    return (
+        db.query(Task)
+        .filter(Task.id == task_id, Task.user_id == user_id)
+        .first()
+    )
+
+
+def list_plan_tasks(db: Session, user_id: int):
+    return (
+        db.query(*PLAN_TASK_COLUMNS)
+        .filter(Task.user_id == user_id)
+        .order_by(Task.created_at, Task.id)
+        .all()
+    )
+
+
+def page_owned_tasks(db: Session, user_id: int, params: TaskListQuery):
+    """
+    One page of a user's tasks, newest first, using keyset pagination on
+    (created_at, id). Returns (rows, next_cursor); next_cursor is None on
+    the last page.
+    """
+    query = db.query(*TASK_RESPONSE_COLUMNS).filter(Task.user_id == user_id)
+
+    if params.status is not None:
+        query = query.filter(Task.status == params.status)
+    if params.assigned_user_id is not None:
+        query = query.filter(Task.assigned_user_id == params.assigned_user_id)
+    if params.created_after is not None:
+        query = query.filter(Task.created_at >= params.created_after)
+    if params.created_before is not None:
+        query = query.filter(Task.created_at < params.created_before)
+    if params.cursor is not None:
+        query = query.filter(
+            tuple_(Task.created_at, Task.id) < tuple_(*decode_cursor(params.cursor))
+        )
+
+    rows = (
+        query.order_by(Task.created_at.desc(), Task.id.desc())
+        .limit(params.limit + 1)
+        .all()
+    )
+
+    if len(rows) <= params.limit:
+        return rows, None
+
+    last = rows[params.limit - 1]
+    return rows[:params.limit], encode_cursor(last.created_at, last.id)
+
+
+def add_task(db: Session, task: Task):
+    db.add(task)
+    db.commit()
+    db.refresh(task)
+    return task
+
+
+def update_task(db: Session, task: Task, values: dict):
+    for key, value in values.items():
+        setattr(task, key, value)
+
+    db.commit()
+    db.refresh(task)
+    return task
+
+
+def delete_task(db: Session, task: Task):
+    db.delete(task)
+    db.commit()
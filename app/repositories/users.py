@@ -0,0 +1,32 @@
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+
+
+def get_user(db: Session, user_id: int):
+    return db.query(User).filter(User.id == user_id).first()
+
+
+def get_principal_row(db: Session, user_id: int):
+    """Only the columns auth needs; skips resume text and embedding."""
+    return (
+        db.query(User.id, User.email, User.is_admin)
+        .filter(User.id == user_id)
+        .first()
+    )
+
+
+def get_user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def update_password(db: Session, user: User, hashed_password: str):
+    user.hashed_password = hashed_password
+    db.commit()
+
+
+def add_user(db: Session, user: User):
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
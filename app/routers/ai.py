@@ -1,28 +1,37 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
-from app.models.task import Task
-from app.models.user import User
-from app.core.security import get_current_user
-from app.services.ai_service import generate_daily_plan
+from app.core.auth_cache import Principal
+from app.core.security import get_current_user, get_db, get_read_db
+from app.schemas.task import RebalanceReport
+from app.services.plan_cache import get_plan
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.get("/suggest")
 def suggest_daily_plan(
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    plan, state = get_plan(db, current_user.id)
+
+    response.headers["X-Plan-Cache"] = state
+    return plan
+
+
+# 🟢 Rebalance TODO Tasks Across Users (admin only)
+@router.post("/rebalance", response_model=RebalanceReport)
+def rebalance(
+    dry_run: bool = Query(True),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    tasks = db.query(Task).filter(Task.user_id == current_user.id).all()
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    # Imported on first use: admin-only, and not worth every worker's start-up
+    from app.services.rebalance import rebalance_backlog
 
-    return generate_daily_plan(tasks)
\ No newline at end of file
+    return rebalance_backlog(db, dry_run=dry_run)
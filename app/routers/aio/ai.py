@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.auth_cache import Principal
+from app.core.security import get_async_read_db, get_current_user_async, get_db
+from app.schemas.task import RebalanceReport
+from app.services import plan_cache
+
+router = APIRouter(prefix="/ai", tags=["AI"])
+
+
+@router.get("/suggest")
+async def suggest_daily_plan(
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    row = await db.run_sync(plan_cache.cached_plan, current_user.id)
+    state = plan_cache.plan_state(row)
+
+    if state == plan_cache.MISS:
+        # Plan generation (an LLM call once the stub goes) runs off the event loop
+        plan = await run_in_threadpool(plan_cache.refresh_plan, current_user.id)
+    else:
+        plan = row.plan
+        if state == plan_cache.STALE:
+            plan_cache.plan_refresher.submit(current_user.id)
+
+    response.headers["X-Plan-Cache"] = state
+    return plan
+
+
+@router.post("/rebalance", response_model=RebalanceReport)
+async def rebalance(
+    dry_run: bool = Query(True),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    from app.services.rebalance import rebalance_backlog
+
+    # Seconds of NumPy work for a large backlog; keep it off the event loop
+    # with a sync session instead of AsyncSession.run_sync.
+    return await run_in_threadpool(rebalance_backlog, db, dry_run)
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
+from app.core.security import (
+    get_async_db,
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash,
+    create_access_token,
+)
+from app.services.embedding_service import get_embedding_async
+from app.services.assignment_service import resume_matrix
+from app.repositories import users as user_repo
+
+router = APIRouter(prefix="/auth", tags=["Authentication"])
+
+
+@router.post("/register", response_model=UserResponse)
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing_user = await db.run_sync(user_repo.get_user_by_email, user.email)
+    if existing_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    new_user = User(
+        email=user.email,
+        hashed_password=await hash_password_async(user.password),
+        is_admin=False,
+        resume_text=user.resume_text
+    )
+
+    resume_embedding = None
+    if user.resume_text:
+        resume_embedding = await get_embedding_async(user.resume_text)
+        new_user.resume_embedding = resume_embedding
+
+    await db.run_sync(user_repo.add_user, new_user)
+
+    if resume_embedding is not None:
+        resume_matrix.upsert(new_user.id, resume_embedding)
+
+    return new_user
+
+
+@router.post("/login", response_model=Token)
+async def login(user: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    db_user = await db.run_sync(user_repo.get_user_by_email, user.email)
+
+    if not db_user:
+        raise HTTPException(status_code=400, detail="Invalid credentials")
+
+    if not await verify_password_async(user.password, db_user.hashed_password):
+        raise HTTPException(status_code=400, detail="Invalid credentials")
+
+    # Upgrade hashes made with an older BCRYPT_ROUNDS while we have the password
+    if password_needs_rehash(db_user.hashed_password):
+        new_hash = await hash_password_async(user.password)
+        await db.run_sync(user_repo.update_password, db_user, new_hash)
+
+    access_token = create_access_token(
+        data={"sub": str(db_user.id), "email": db_user.email}
+    )
+
+    return {"access_token": access_token, "token_type": "bearer"}
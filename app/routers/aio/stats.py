@@ -0,0 +1,30 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import get_async_read_db
+from app.core.responses import json_response
+from app.repositories import stats as stats_repo
+
+router = APIRouter(prefix="/stats", tags=["Stats"])
+
+
+@router.get("/top-users")
+async def top_users(
+    limit: int = Query(5, ge=1, le=100),
+    days: Optional[int] = Query(None, ge=1, le=366),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    results = await db.run_sync(stats_repo.top_users, limit, days)
+
+    return json_response({
+        "top_users": [
+            {
+                "user_id": r.id,
+                "email": r.email,
+                "total_minutes": r.total_minutes or 0
+            }
+            for r in results
+        ]
+    })
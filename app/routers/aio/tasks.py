@@ -0,0 +1,155 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated, List
+
+from app.core.auth_cache import Principal
+from app.schemas.task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskStatusUpdate,
+    TaskImportReport,
+    TaskListQuery,
+)
+from app.core.security import get_async_db, get_async_read_db, get_current_user_async
+from app.services.embedding_service import get_embedding_async
+from app.services.assignment_service import find_best_user_id
+from app.services.embedding_worker import embedding_pipeline
+from app.core.config import EMBEDDING_MODE, FAST_JSON_RESPONSES
+from app.core.responses import json_response, rows_as_dicts
+from app.repositories import tasks as task_repo
+from app.routers.tasks import bulk_import_tasks, export_all_tasks, export_tasks
+
+router = APIRouter(prefix="/tasks", tags=["Tasks"])
+
+
+# 🟢 Create Task
+@router.post("/", response_model=TaskResponse)
+async def create_task(
+    task: TaskCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    new_task = task_repo.new_task(task, current_user.id)
+
+    if task.description and EMBEDDING_MODE == "sync":
+        new_task.embedding = await get_embedding_async(task.description)
+        new_task.assigned_user_id = await db.run_sync(find_best_user_id, new_task.embedding)
+        new_task.embedding_status = "ready"
+    elif task.description:
+        # Commit now; a worker fills in embedding and assignee later
+        new_task.embedding_status = "pending"
+
+    await db.run_sync(task_repo.add_task, new_task)
+
+    if new_task.embedding_status == "pending" and EMBEDDING_MODE == "background":
+        embedding_pipeline.submit(new_task.id)
+
+    return new_task
+
+
+# 🟢 Bulk Import Tasks: stays on the sync session because rows are
+# written with psycopg2's COPY support
+router.add_api_route(
+    "/bulk",
+    bulk_import_tasks,
+    methods=["POST"],
+    response_model=TaskImportReport,
+)
+
+
+# 🟢 Export Tasks: also sync, streamed from a psycopg2 server-side cursor.
+# Registered before /{task_id} so "export" isn't parsed as an id.
+router.add_api_route("/export", export_tasks, methods=["GET"])
+router.add_api_route("/export/all", export_all_tasks, methods=["GET"])
+
+
+# 🟢 Get All Tasks (Only Current User's), one page at a time
+@router.get("/", response_model=List[TaskResponse])
+async def get_tasks(
+    response: Response,
+    params: Annotated[TaskListQuery, Query()],
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    try:
+        tasks, next_cursor = await db.run_sync(
+            task_repo.page_owned_tasks, current_user.id, params
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+
+    if FAST_JSON_RESPONSES:
+        # Rows are exactly TaskResponse's columns, straight from our own DB
+        return json_response(rows_as_dicts(tasks), headers=headers)
+
+    response.headers.update(headers or {})
+    return tasks
+
+
+# 🟢 Get Single Task
+@router.get("/{task_id}", response_model=TaskResponse)
+async def get_task(
+    task_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    task = await db.run_sync(task_repo.get_owned_task, task_id, current_user.id)
+
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return task
+
+
+# 🟢 Update Task
+@router.put("/{task_id}", response_model=TaskResponse)
+async def update_task(
+    task_id: int,
+    task_update: TaskUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    task = await db.run_sync(task_repo.get_owned_task, task_id, current_user.id)
+
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return await db.run_sync(
+        task_repo.update_task, task, task_update.model_dump(exclude_unset=True)
+    )
+
+
+# 🟢 Update Status Only
+@router.patch("/{task_id}/status", response_model=TaskResponse)
+async def update_status(
+    task_id: int,
+    status_update: TaskStatusUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    task = await db.run_sync(task_repo.get_owned_task, task_id, current_user.id)
+
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return await db.run_sync(task_repo.update_task, task, {"status": status_update.status})
+
+
+# 🟢 Delete Task
+@router.delete("/{task_id}")
+async def delete_task(
+    task_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    task = await db.run_sync(task_repo.get_owned_task, task_id, current_user.id)
+
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    await db.run_sync(task_repo.delete_task, task)
+
+    return {"detail": "Task deleted successfully"}
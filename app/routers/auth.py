@@ -6,7 +6,10 @@ from app.schemas.user import UserCreate, UserResponse
 from app.core.security import hash_password
 from app.schemas.user import UserLogin, Token
 from app.core.security import verify_password, create_access_token
+from app.core.security import password_needs_rehash
 from app.services.embedding_service import get_embedding
+from app.services.assignment_service import resume_matrix
+from app.repositories import users as user_repo
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -21,7 +24,7 @@ def get_db():
 
 @router.post("/register", response_model=UserResponse)
 def register(user: UserCreate, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.email == user.email).first()
+    existing_user = user_repo.get_user_by_email(db, user.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
@@ -32,18 +35,21 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
         resume_text=user.resume_text
     )
 
+    resume_embedding = None
     if user.resume_text:
-        new_user.resume_embedding = get_embedding(user.resume_text)
+        resume_embedding = get_embedding(user.resume_text)
+        new_user.resume_embedding = resume_embedding
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    user_repo.add_user(db, new_user)
+
+    if resume_embedding is not None:
+        resume_matrix.upsert(new_user.id, resume_embedding)
 
     return new_user
 
 @router.post("/login", response_model=Token)
 def login(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = user_repo.get_user_by_email(db, user.email)
 
     if not db_user:
         raise HTTPException(status_code=400, detail="Invalid credentials")
@@ -51,6 +57,10 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
     if not verify_password(user.password, db_user.hashed_password):
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
+    # Upgrade hashes made with an older BCRYPT_ROUNDS while we have the password
+    if password_needs_rehash(db_user.hashed_password):
+        user_repo.update_password(db, db_user, hash_password(user.password))
+
     access_token = create_access_token(
         data={"sub": str(db_user.id), "email": db_user.email}
     )
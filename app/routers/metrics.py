@@ -1,8 +1,30 @@
-from fastapi import APIRouter
-from app.core.metrics import metrics
+from fastapi import APIRouter, Response
+from app.core.metrics import metrics, prometheus_exposition
+from app.services.embedding_cache import embedding_cache
+from app.services.embedding_service import embedding_dispatcher
+from app.db.session import replica_router
+from app.core import auth_cache
+from app.core.password_pool import password_pool
+from app.core.access_log import access_log
+from app.core.responses import json_response
 
 router = APIRouter(tags=["Metrics"])
 
 @router.get("/metrics")
 def get_metrics():
-    return metrics.get_metrics()
\ No newline at end of file
+    return json_response({
+        **metrics.get_metrics(),
+        "embedding_cache": embedding_cache.stats(),
+        "embedding_dispatcher": embedding_dispatcher.stats(),
+        "replicas": replica_router.stats(),
+        "auth_cache": auth_cache.stats(),
+        "password_pool": password_pool.stats(),
+        "access_log": access_log.stats(),
+    })
+
+
+# 🟢 Prometheus text format; aggregated across workers in multiprocess mode
+@router.get("/metrics/prometheus")
+def get_prometheus_metrics():
+    body, content_type = prometheus_exposition()
+    return Response(content=body, media_type=content_type)
@@ -1,37 +1,23 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.db.session import SessionLocal
-from app.models.user import User
-from app.models.task import Task
+from app.core.security import get_read_db
+from app.core.responses import json_response
+from app.repositories import stats as stats_repo
 
 router = APIRouter(prefix="/stats", tags=["Stats"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.get("/top-users")
-def top_users(db: Session = Depends(get_db)):
-    results = (
-        db.query(
-            User.id,
-            User.email,
-            func.sum(Task.total_minutes).label("total_minutes")
-        )
-        .join(Task, Task.assigned_user_id == User.id)
-        .group_by(User.id)
-        .order_by(func.sum(Task.total_minutes).desc())
-        .limit(5)
-        .all()
-    )
+def top_users(
+    limit: int = Query(5, ge=1, le=100),
+    days: Optional[int] = Query(None, ge=1, le=366),
+    db: Session = Depends(get_read_db),
+):
+    results = stats_repo.top_users(db, limit=limit, days=days)
 
-    return {
+    return json_response({
         "top_users": [
             {
                 "user_id": r.id,
@@ -40,4 +26,4 @@ def top_users(db: Session = Depends(get_db)):
             }
             for r in results
         ]
-    }
\ No newline at end of file
+    })
\ No newline at end of file
@@ -1,20 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Annotated, List, Optional
+from functools import partial
+import io
+import tempfile
 
 from app.db.session import SessionLocal
-from app.models.task import Task
-from app.models.user import User
+from app.core.auth_cache import Principal
 from app.schemas.task import (
     TaskCreate,
     TaskUpdate,
     TaskResponse,
     TaskStatusUpdate,
+    TaskImportReport,
+    TaskListQuery,
 )
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_read_db, open_read_session
 from app.services.embedding_service import get_embedding
-from sqlalchemy import func
-from app.models.user import User
+from app.services.assignment_service import find_best_user_id
+from app.services.embedding_worker import embedding_pipeline
+from app.core.config import EMBEDDING_MODE, FAST_JSON_RESPONSES
+from app.core.responses import json_response, rows_as_dicts
+from app.repositories import tasks as task_repo
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
@@ -30,45 +39,107 @@ def get_db():
 
 # 🟢 Create Task
 @router.post("/", response_model=TaskResponse)
-def create_task(task: TaskCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-
-    new_task = Task(
-        title=task.title,
-        description=task.description,
-        status=task.status,
-        total_minutes=task.total_minutes,
-        user_id=current_user.id
-    )
+def create_task(task: TaskCreate, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+
+    new_task = task_repo.new_task(task, current_user.id)
 
-    if task.description:
+    if task.description and EMBEDDING_MODE == "sync":
         new_task.embedding = get_embedding(task.description)
+        new_task.assigned_user_id = find_best_user_id(db, new_task.embedding)
+        new_task.embedding_status = "ready"
+    elif task.description:
+        # Commit now; a worker fills in embedding and assignee later
+        new_task.embedding_status = "pending"
+
+    task_repo.add_task(db, new_task)
 
-        best_user = (
-            db.query(User)
-            .filter(User.resume_embedding != None)
-            .order_by(
-                User.resume_embedding.cosine_distance(new_task.embedding)
-            )
-            .first()
+    if new_task.embedding_status == "pending" and EMBEDDING_MODE == "background":
+        embedding_pipeline.submit(new_task.id)
+
+    return new_task
+
+
+# 🟢 Bulk Import Tasks (CSV or JSON Lines body)
+@router.post("/bulk", response_model=TaskImportReport)
+async def bulk_import_tasks(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|jsonl)$"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if "csv" in content_type else "jsonl"
+
+    # Spool the upload (to disk once it gets large) so the import can parse
+    # it as a stream without holding the whole body in memory.
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as upload:
+        async for chunk in request.stream():
+            upload.write(chunk)
+        upload.seek(0)
+
+        lines = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+        # Imported on first use: rarely called, and not worth every worker's start-up
+        from app.services.task_import import import_tasks
+
+        return await run_in_threadpool(
+            import_tasks, db, lines, format, current_user.id
         )
 
-        if best_user:
-            new_task.assigned_user_id = best_user.id
 
-    db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+def export_response(request: Request, format: str, user_id=None):
+    from app.services.task_export import EXPORT_MEDIA_TYPES, stream_tasks
 
-    return new_task
+    return StreamingResponse(
+        stream_tasks(partial(open_read_session, request), format, user_id),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
+
+
+# 🟢 Export Current User's Tasks (streamed NDJSON or CSV)
+@router.get("/export")
+def export_tasks(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: Principal = Depends(get_current_user),
+):
+    return export_response(request, format, current_user.id)
+
+
+# 🟢 Export Every User's Tasks (admin only)
+@router.get("/export/all")
+def export_all_tasks(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: Principal = Depends(get_current_user),
+):
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
 
+    return export_response(request, format)
 
-# 🟢 Get All Tasks (Only Current User's)
+
+# 🟢 Get All Tasks (Only Current User's), one page at a time
 @router.get("/", response_model=List[TaskResponse])
 def get_tasks(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    params: Annotated[TaskListQuery, Query()],
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    tasks = db.query(Task).filter(Task.user_id == current_user.id).all()
+    try:
+        tasks, next_cursor = task_repo.page_owned_tasks(db, current_user.id, params)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+
+    if FAST_JSON_RESPONSES:
+        # Rows are exactly TaskResponse's columns, straight from our own DB
+        return json_response(rows_as_dicts(tasks), headers=headers)
+
+    response.headers.update(headers or {})
     return tasks
 
 
@@ -76,14 +147,10 @@ def get_tasks(
 @router.get("/{task_id}", response_model=TaskResponse)
 def get_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    task = (
-        db.query(Task)
-        .filter(Task.id == task_id, Task.user_id == current_user.id)
-        .first()
-    )
+    task = task_repo.get_owned_task(db, task_id, current_user.id)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -97,24 +164,14 @@ def update_task(
     task_id: int,
     task_update: TaskUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    task = (
-        db.query(Task)
-        .filter(Task.id == task_id, Task.user_id == current_user.id)
-        .first()
-    )
+    task = task_repo.get_owned_task(db, task_id, current_user.id)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    for key, value in task_update.model_dump(exclude_unset=True).items():
-        setattr(task, key, value)
-
-    db.commit()
-    db.refresh(task)
-
-    return task
+    return task_repo.update_task(db, task, task_update.model_dump(exclude_unset=True))
 
 
 # 🟢 Update Status Only
@@ -123,23 +180,14 @@ def update_status(
     task_id: int,
     status_update: TaskStatusUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    task = (
-        db.query(Task)
-        .filter(Task.id == task_id, Task.user_id == current_user.id)
-        .first()
-    )
+    task = task_repo.get_owned_task(db, task_id, current_user.id)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    task.status = status_update.status
-
-    db.commit()
-    db.refresh(task)
-
-    return task
+    return task_repo.update_task(db, task, {"status": status_update.status})
 
 
 # 🟢 Delete Task
@@ -147,18 +195,13 @@ def update_status(
 def delete_task(
     task_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    task = (
-        db.query(Task)
-        .filter(Task.id == task_id, Task.user_id == current_user.id)
-        .first()
-    )
+    task = task_repo.get_owned_task(db, task_id, current_user.id)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    db.delete(task)
-    db.commit()
+    task_repo.delete_task(db, task)
 
     return {"detail": "Task deleted successfully"}
\ No newline at end of file
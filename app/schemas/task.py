@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -28,6 +28,51 @@ class TaskResponse(TaskBase):
     status: str
     total_minutes: int
     created_at: datetime
+    assigned_user_id: Optional[int] = None
+    # pending while the embedding/assignment is computed in the background
+    embedding_status: Optional[str] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class TaskListQuery(BaseModel):
+    limit: int = Field(100, ge=1, le=1000)
+    # Opaque X-Next-Cursor value from the previous page
+    cursor: Optional[str] = None
+    status: Optional[str] = None
+    assigned_user_id: Optional[int] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+
+class TaskImportError(BaseModel):
+    row: int
+    error: str
+
+
+class TaskImportReport(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    errors: List[TaskImportError] = []
+
+
+class RebalanceChange(BaseModel):
+    task_id: int
+    from_user_id: Optional[int] = None
+    to_user_id: int
+    total_minutes: int
+
+
+class RebalanceReport(BaseModel):
+    dry_run: bool
+    tasks: int
+    users: int
+    moved: int
+    changes: List[RebalanceChange] = []
+    mean_similarity_before: Optional[float] = None
+    mean_similarity_after: Optional[float] = None
+    # max / mean / stddev of open minutes per user
+    load_minutes_before: Optional[Dict[str, float]] = None
+    load_minutes_after: Optional[Dict[str, float]] = None
+    timings_ms: Dict[str, float] = {}
@@ -1,13 +1,13 @@
-from typing import List
-from app.models.task import Task
+from typing import Sequence
 
 # Toggle this later for real LLM
 USE_AI_STUB = True
 
 
-def generate_daily_plan(tasks: List[Task]):
+def generate_daily_plan(tasks: Sequence):
     """
-    Generate a daily plan for a user based on their tasks.
+    Generate a daily plan for a user based on their tasks
+    (rows with the PLAN_TASK_COLUMNS fields).
     """
 
     if USE_AI_STUB:
@@ -0,0 +1,176 @@
+import threading
+import time
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    ASSIGNMENT_ENGINE,
+    EMBEDDING_DIMENSIONS,
+    RESUME_MATRIX_TTL_SECONDS,
+)
+from app.db.vectors import to_numpy
+from app.models.user import User
+
+
+def normalize_rows(vectors) -> np.ndarray:
+    """
+    Return `vectors` as a float32 matrix with every row scaled to unit length.
+    Zero rows are left as zeros so they never win a cosine ranking.
+    """
+    matrix = np.array(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class ResumeMatrix:
+    """
+    All resume embeddings as one contiguous, L2-normalised float32 matrix.
+
+    Row i belongs to user `user_ids[i]`, so cosine similarity against every
+    user is a single matrix-vector product. Readers work on an immutable
+    snapshot; writers append into spare capacity and publish a new snapshot.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIMENSIONS):
+        self.dim = dim
+        self.lock = threading.Lock()
+        self.loaded_at = None
+        self._buffer = np.zeros((0, dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._rows = {}
+        self._snapshot = (self._ids[:0], self._buffer[:0])
+
+    def __len__(self):
+        return len(self._snapshot[0])
+
+    def load(self, db: Session):
+        rows = (
+            db.query(User.id, User.resume_embedding)
+            .filter(User.resume_embedding != None)
+            .order_by(User.id)
+            .all()
+        )
+
+        ids = np.array([r.id for r in rows], dtype=np.int64)
+        vectors = (
+            normalize_rows([to_numpy(r.resume_embedding) for r in rows])
+            if rows
+            else np.zeros((0, self.dim), dtype=np.float32)
+        )
+
+        with self.lock:
+            self.dim = vectors.shape[1]
+            self._buffer = np.ascontiguousarray(vectors)
+            self._ids = ids
+            self._rows = {int(user_id): i for i, user_id in enumerate(ids)}
+            self._publish(len(ids))
+            self.loaded_at = time.monotonic()
+
+    def ensure_fresh(self, db: Session):
+        if (
+            self.loaded_at is None
+            or time.monotonic() - self.loaded_at > RESUME_MATRIX_TTL_SECONDS
+        ):
+            self.load(db)
+
+    def upsert(self, user_id: int, embedding):
+        """Add or replace one user's resume vector without a full reload."""
+        if self.loaded_at is None:
+            # Nothing loaded yet; the first load() will pick the user up.
+            return
+
+        vector = normalize_rows(embedding)[0]
+
+        with self.lock:
+            row = self._rows.get(user_id)
+            if row is not None:
+                # Copy on write, as in remove(): a reader scoring the current
+                # snapshot must not see this row change mid-product.
+                buffer = self._buffer.copy()
+                buffer[row] = vector
+                self._buffer = buffer
+                self._publish(len(self._rows))
+                return
+
+            size = len(self._rows)
+            if size == len(self._buffer):
+                self._grow(max(2 * size, 64))
+
+            self._buffer[size] = vector
+            self._ids[size] = user_id
+            self._rows[user_id] = size
+            self._publish(size + 1)
+
+    def remove(self, user_id: int):
+        with self.lock:
+            if user_id not in self._rows:
+                return
+
+            # Copy instead of swapping rows in place so readers holding the
+            # previous snapshot never see a row move under them.
+            keep = self._ids[: len(self._rows)] != user_id
+            self._buffer = np.ascontiguousarray(self._buffer[: len(self._rows)][keep])
+            self._ids = self._ids[: len(self._rows)][keep]
+            self._rows = {int(uid): i for i, uid in enumerate(self._ids)}
+            self._publish(len(self._ids))
+
+    def top_k(self, embedding, k: int = 1):
+        """Return up to `k` (user_id, cosine_similarity) pairs, best first."""
+        ids, matrix = self._snapshot
+        if len(ids) == 0:
+            return []
+
+        scores = matrix @ normalize_rows(embedding)[0]
+        k = min(k, len(ids))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+
+        return [(int(ids[i]), float(scores[i])) for i in best]
+
+    def best_matches(self, embeddings):
+        """
+        Nearest user for every row of `embeddings` in one matrix product.
+        Returns a list of user ids (None when no resumes are loaded).
+        """
+        ids, matrix = self._snapshot
+        if len(ids) == 0:
+            return [None] * len(embeddings)
+
+        scores = normalize_rows(embeddings) @ matrix.T
+        return [int(ids[i]) for i in scores.argmax(axis=1)]
+
+    def _grow(self, capacity: int):
+        buffer = np.zeros((capacity, self.dim), dtype=np.float32)
+        ids = np.zeros(capacity, dtype=np.int64)
+        size = len(self._rows)
+        buffer[:size] = self._buffer[:size]
+        ids[:size] = self._ids[:size]
+        self._buffer = buffer
+        self._ids = ids
+
+    def _publish(self, size: int):
+        self._snapshot = (self._ids[:size], self._buffer[:size])
+
+
+resume_matrix = ResumeMatrix()
+
+
+def find_best_user_id(db: Session, embedding):
+    """Pick the user whose resume is closest (cosine) to `embedding`."""
+    if ASSIGNMENT_ENGINE == "numpy":
+        resume_matrix.ensure_fresh(db)
+        matches = resume_matrix.top_k(embedding, k=1)
+        return matches[0][0] if matches else None
+
+    best_user = (
+        db.query(User.id)
+        .filter(User.resume_embedding != None)
+        .order_by(User.resume_embedding.cosine_distance(embedding))
+        .first()
+    )
+    return best_user.id if best_user else None
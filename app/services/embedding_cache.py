@@ -0,0 +1,150 @@
+import hashlib
+import logging
+import unicodedata
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import EMBEDDING_CACHE_SIZE, EMBEDDING_CACHE_PERSIST
+from app.db.session import SessionLocal
+from app.db.vectors import to_numpy
+from app.models.embedding_cache import EmbeddingCacheEntry
+
+logger = logging.getLogger("sprintsync")
+
+
+def cache_key(model: str, text: str) -> str:
+    """Content address for an embedding: model plus whitespace-normalised text."""
+    normalized = " ".join(unicodedata.normalize("NFC", text).split())
+    return hashlib.sha256(f"{model}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache: a bounded in-process LRU in front of the
+    shared `embedding_cache` table, so hits survive restarts and are
+    shared between workers.
+    """
+
+    def __init__(self, max_size: int, persist: bool = True):
+        self.max_size = max_size
+        self.persist = persist
+        self._entries = OrderedDict()
+        self.lock = Lock()
+
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str):
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """Look up several keys at once; returns {key: embedding} for hits."""
+        found = {}
+        missing = []
+
+        with self.lock:
+            for key in keys:
+                embedding = self._entries.get(key)
+                if embedding is None:
+                    missing.append(key)
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = embedding
+            self.memory_hits += len(found)
+
+        loaded = self._load(missing) if self.persist and missing else {}
+        for key, embedding in loaded.items():
+            found[key] = self._remember(key, embedding)
+
+        with self.lock:
+            self.db_hits += len(loaded)
+            self.misses += len(missing) - len(loaded)
+
+        return found
+
+    def put(self, key: str, model: str, embedding):
+        return self.put_many(model, {key: embedding})[key]
+
+    def put_many(self, model: str, entries):
+        """Cache several {key: embedding} pairs with one DB round trip."""
+        entries = {key: self._remember(key, emb) for key, emb in entries.items()}
+        if self.persist and entries:
+            self._store(model, entries)
+        return entries
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self.lock:
+            hits = self.memory_hits + self.db_hits
+            lookups = hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "memory_hits": self.memory_hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0,
+            }
+
+    def _remember(self, key: str, embedding):
+        # float32 arrays are ~8x smaller than lists of Python floats, and
+        # read-only so callers can't corrupt a shared cached vector.
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.flags.writeable = False
+
+        with self.lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return embedding
+
+    def _load(self, keys):
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(EmbeddingCacheEntry.key, EmbeddingCacheEntry.embedding)
+                .filter(EmbeddingCacheEntry.key.in_(keys))
+                .all()
+            )
+            return {row.key: to_numpy(row.embedding) for row in rows}
+        except SQLAlchemyError:
+            logger.warning("embedding cache lookup failed", exc_info=True)
+            return {}
+        finally:
+            db.close()
+
+    def _store(self, model: str, entries):
+        db = SessionLocal()
+        try:
+            db.execute(
+                insert(EmbeddingCacheEntry)
+                .values(
+                    [
+                        {"key": key, "model": model, "embedding": embedding}
+                        for key, embedding in entries.items()
+                    ]
+                )
+                .on_conflict_do_nothing(index_elements=["key"])
+            )
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            logger.warning("embedding cache write failed", exc_info=True)
+        finally:
+            db.close()
+
+
+embedding_cache = EmbeddingCache(EMBEDDING_CACHE_SIZE, persist=EMBEDDING_CACHE_PERSIST)
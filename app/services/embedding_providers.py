@@ -0,0 +1,151 @@
+"""
+Embedding backends selected by EMBEDDING_PROVIDER.
+
+"openai" calls the embeddings API (the client is created on first use).
+"local" computes vectors on the CPU: a hashing vectoriser over word
+unigrams and bigrams, randomly projected into the vector dimension. It is
+deterministic and offline; similar wording gives similar vectors, but it
+has no semantic model behind it.
+"""
+import hashlib
+import math
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+from app.core.config import (
+    EMBEDDING_DIMENSIONS,
+    EMBEDDING_PROVIDER,
+    LOCAL_EMBEDDING_CACHE_SIZE,
+    LOCAL_EMBEDDING_SEED,
+    OPENAI_EMBEDDING_MODEL,
+)
+
+# Full output size of the OpenAI embedding models this app uses
+NATIVE_DIMENSIONS = 1536
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class EmbeddingProvider:
+    """Turns a batch of texts into vectors, in input order."""
+
+    # Model name used to namespace the embedding cache
+    model: str
+    dimensions: int = EMBEDDING_DIMENSIONS
+    # Whether results are worth caching (remote calls) or cheaper to recompute
+    cacheable: bool = True
+
+    @property
+    def cache_namespace(self) -> str:
+        """Embedding cache namespace: vectors of different sizes never mix."""
+        if self.dimensions == NATIVE_DIMENSIONS:
+            return self.model
+        return f"{self.model}@{self.dimensions}"
+
+    def embed(self, texts):
+        raise NotImplementedError
+
+
+class OpenAIProvider(EmbeddingProvider):
+    def __init__(
+        self,
+        model: str = OPENAI_EMBEDDING_MODEL,
+        dimensions: int = EMBEDDING_DIMENSIONS,
+        client=None,
+    ):
+        self.model = model
+        self.dimensions = dimensions
+        self._client = client
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from openai import OpenAI
+
+                    self._client = OpenAI()
+        return self._client
+
+    def embed(self, texts):
+        kwargs = {}
+        if self.dimensions != NATIVE_DIMENSIONS:
+            # text-embedding-3 models return a shortened (Matryoshka) vector
+            kwargs["dimensions"] = self.dimensions
+        response = self.client.embeddings.create(model=self.model, input=list(texts), **kwargs)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+class HashingProvider(EmbeddingProvider):
+    """
+    Feature hashing with an implicit random projection: each token maps to
+    a fixed Gaussian direction seeded from its hash, and a text is the
+    (1 + log tf)-weighted sum of its tokens' directions, L2-normalised.
+    Equivalent to projecting the hashed bag-of-words with a random matrix
+    without ever materialising that matrix.
+    """
+
+    cacheable = False
+
+    def __init__(
+        self,
+        dimensions: int = EMBEDDING_DIMENSIONS,
+        seed: int = LOCAL_EMBEDDING_SEED,
+        cache_size: int = LOCAL_EMBEDDING_CACHE_SIZE,
+    ):
+        self.dimensions = dimensions
+        self.seed = seed
+        self.model = f"local-hashing-{dimensions}-{seed}"
+        # Directions are cheap to regenerate; the bound keeps bigram-heavy
+        # traffic from growing each worker by a vector per distinct token
+        self._direction = lru_cache(maxsize=cache_size)(self._token_direction)
+
+    def _token_direction(self, token: str) -> np.ndarray:
+        digest = hashlib.blake2b(
+            token.encode("utf-8"), digest_size=8, key=str(self.seed).encode("ascii")
+        ).digest()
+        rng = np.random.default_rng(int.from_bytes(digest, "little"))
+        direction = rng.standard_normal(self.dimensions).astype(np.float32)
+        direction.flags.writeable = False
+        return direction
+
+    @staticmethod
+    def tokens(text: str):
+        words = TOKEN_PATTERN.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for token, count in Counter(self.tokens(text)).items():
+            vector += (1.0 + math.log(count)) * self._direction(token)
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed(self, texts):
+        return [self.embed_one(text).tolist() for text in texts]
+
+
+PROVIDERS = {
+    "openai": OpenAIProvider,
+    "local": HashingProvider,
+}
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> EmbeddingProvider:
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                if EMBEDDING_PROVIDER not in PROVIDERS:
+                    raise ValueError(f"Unknown EMBEDDING_PROVIDER {EMBEDDING_PROVIDER!r}")
+                _provider = PROVIDERS[EMBEDDING_PROVIDER]()
+    return _provider
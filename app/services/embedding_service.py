@@ -1,16 +1,233 @@
+import asyncio
 import os
-from openai import OpenAI
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from app.core.config import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_DIMENSIONS,
+    EMBEDDING_DISPATCH_CONCURRENCY,
+    EMBEDDING_DISPATCH_MAX_BATCH,
+    EMBEDDING_DISPATCH_WINDOW_MS,
+)
+from app.core.metrics import (
+    EMBEDDING_DISPATCH_BATCH,
+    EMBEDDING_DISPATCH_COALESCED,
+    EMBEDDING_DISPATCH_WAIT,
+    LatencyHistogram,
+)
+from app.services.embedding_cache import embedding_cache, cache_key
+from app.services.embedding_providers import get_provider
 
-client = OpenAI()
 
 def get_embedding(text: str):
+    if _dispatching():
+        return embedding_dispatcher.embed(text)
+    return get_embeddings([text])[0]
+
+
+async def get_embedding_async(text: str):
+    """get_embedding for async handlers; waits on the batch without holding a thread."""
+    if _dispatching():
+        return await asyncio.wrap_future(embedding_dispatcher.submit(text))
+    return await asyncio.to_thread(get_embedding, text)
+
+
+def get_embeddings(texts):
+    """
+    Embed several texts with the configured provider, reusing cached vectors
+    and sending the rest in batches of EMBEDDING_BATCH_SIZE. Results follow
+    the input order.
+    """
     # If running in CI or tests, return fake embedding
     if os.getenv("OPENAI_API_KEY") == "dummy-key-for-ci":
-        return [0.0] * 1536
+        return [[0.0] * EMBEDDING_DIMENSIONS for _ in texts]
+
+    texts = list(texts)
+    provider = get_provider()
+    if not provider.cacheable:
+        return [
+            vector
+            for start in range(0, len(texts), EMBEDDING_BATCH_SIZE)
+            for vector in provider.embed(texts[start:start + EMBEDDING_BATCH_SIZE])
+        ]
+
+    keys = [cache_key(provider.cache_namespace, text) for text in texts]
+    embeddings = embedding_cache.get_many(keys)
+
+    # Identical texts in one call are only sent once
+    pending = {}
+    for key, text in zip(keys, texts):
+        if key not in embeddings:
+            pending.setdefault(key, text)
+
+    pending = list(pending.items())
+    for start in range(0, len(pending), EMBEDDING_BATCH_SIZE):
+        batch = pending[start:start + EMBEDDING_BATCH_SIZE]
+        vectors = provider.embed([text for _, text in batch])
+        embeddings.update(
+            embedding_cache.put_many(
+                provider.cache_namespace,
+                {key: vector for (key, _), vector in zip(batch, vectors)},
+            )
+        )
 
-    response = client.embeddings.create(
-        model="text-embedding-3-small",
-        input=text,
+    return [embeddings[key] for key in keys]
+
+
+def _dispatching() -> bool:
+    # Local vectors are computed in-process, so there is no round trip to share
+    return (
+        EMBEDDING_DISPATCH_WINDOW_MS > 0
+        and os.getenv("OPENAI_API_KEY") != "dummy-key-for-ci"
+        and get_provider().cacheable
     )
 
-    return response.data[0].embedding
\ No newline at end of file
+
+class EmbeddingDispatcher:
+    """
+    Micro-batches single-text embedding requests from concurrent callers.
+
+    A queued text waits at most `window_ms` for others to join it (less if
+    `max_batch` texts arrive first); the batch then goes out as one
+    get_embeddings call and every caller's future receives its own vector.
+    A caller asking for a text that is already queued or in flight shares
+    that request's future instead of adding another.
+    """
+
+    def __init__(self, window_ms: float, max_batch: int, concurrency: int, embed_batch=None):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.concurrency = concurrency
+        self._embed_batch = embed_batch or get_embeddings
+        self._cond = threading.Condition()
+        # (key, text, enqueued_at) waiting for the next batch
+        self._queue = []
+        # key -> Future, for texts queued or in flight
+        self._inflight = {}
+        self._thread = None
+        self._executor = None
+        self._closed = False
+
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.texts = 0
+        self.largest_batch = 0
+        self.wait = LatencyHistogram()
+
+    def submit(self, text: str) -> Future:
+        key = cache_key(get_provider().cache_namespace, text)
+        with self._cond:
+            closed = self._closed
+            if not closed:
+                self.requests += 1
+                future = self._inflight.get(key)
+                if future is not None:
+                    self.coalesced += 1
+                    EMBEDDING_DISPATCH_COALESCED.inc()
+                    return future
+
+                future = Future()
+                self._inflight[key] = future
+                self._queue.append((key, text, time.perf_counter()))
+                self._start()
+                if len(self._queue) == 1 or len(self._queue) >= self.max_batch:
+                    self._cond.notify()
+                return future
+
+        # Shutting down: nothing will collect the queue any more. Embed
+        # without the lock so the final batches and stats() aren't blocked.
+        future = Future()
+        future.set_result(self._embed_batch([text])[0])
+        return future
+
+    def embed(self, text: str):
+        return self.submit(text).result()
+
+    def close(self):
+        """Send whatever is queued, then stop the dispatcher thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "coalescing_ratio": round(self.coalesced / self.requests, 4) if self.requests else 0,
+                "batches": self.batches,
+                "average_batch_size": round(self.texts / self.batches, 2) if self.batches else 0,
+                "largest_batch_size": self.largest_batch,
+                "queued": len(self._queue),
+                "wait": self.wait.summary(),
+            }
+
+    def _start(self):
+        # Called with the lock held
+        if self._thread is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="embedding-batch"
+            )
+            self._thread = threading.Thread(
+                target=self._collect, name="embedding-dispatcher", daemon=True
+            )
+            self._thread.start()
+
+    def _collect(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    break
+
+                deadline = self._queue[0][2] + self.window
+                while len(self._queue) < self.max_batch and not self._closed:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._queue[:self.max_batch]
+                del self._queue[:self.max_batch]
+
+            self._executor.submit(self._send, batch)
+
+        self._executor.shutdown(wait=False)
+
+    def _send(self, batch):
+        sent_at = time.perf_counter()
+        try:
+            vectors = self._embed_batch([text for _, text, _ in batch])
+            error = None
+        except Exception as e:
+            vectors = [None] * len(batch)
+            error = e
+
+        with self._cond:
+            futures = [self._inflight.pop(key) for key, _, _ in batch]
+            self.batches += 1
+            self.texts += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            for _, _, enqueued_at in batch:
+                self.wait.observe((sent_at - enqueued_at) * 1000)
+
+        EMBEDDING_DISPATCH_BATCH.observe(len(batch))
+        for _, _, enqueued_at in batch:
+            EMBEDDING_DISPATCH_WAIT.observe(sent_at - enqueued_at)
+
+        for future, vector in zip(futures, vectors):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(vector)
+
+
+embedding_dispatcher = EmbeddingDispatcher(
+    EMBEDDING_DISPATCH_WINDOW_MS,
+    EMBEDDING_DISPATCH_MAX_BATCH,
+    EMBEDDING_DISPATCH_CONCURRENCY,
+)
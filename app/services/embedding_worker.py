@@ -0,0 +1,235 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import case, func, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    EMBEDDING_CLAIM_LEASE_SECONDS,
+    EMBEDDING_MAX_ATTEMPTS,
+    EMBEDDING_RETRY_BASE_SECONDS,
+    EMBEDDING_SWEEP_INTERVAL_SECONDS,
+    EMBEDDING_WORKERS,
+)
+from app.db.session import SessionLocal
+from app.models.task import Task
+from app.services.assignment_service import find_best_user_id
+from app.services.embedding_service import get_embeddings
+# Assignments below go through the ORM; this registers the leaderboard listener
+from app.services import leaderboard  # noqa: F401
+
+logger = logging.getLogger("sprintsync")
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+# Tasks claimed per sweep batch (background mode)
+SWEEP_BATCH_SIZE = 50
+
+
+def claim_pending(db: Session, task_ids=None, limit: int = 50, due_only: bool = True):
+    """
+    Claim up to `limit` pending tasks that are due for an attempt and return
+    their (id, description) rows. SKIP LOCKED lets any number of workers poll
+    the same table without double-processing; the claim is a lease on
+    embedding_retry_at, committed right away so no row lock is held while
+    the embeddings API is called.
+    """
+    query = db.query(Task.id, Task.description).filter(Task.embedding_status == PENDING)
+    if due_only:
+        query = query.filter(
+            or_(Task.embedding_retry_at == None, Task.embedding_retry_at <= func.now())
+        )
+    if task_ids is not None:
+        query = query.filter(Task.id.in_(task_ids))
+
+    rows = query.order_by(Task.id).limit(limit).with_for_update(skip_locked=True, of=Task).all()
+    if rows:
+        db.execute(
+            update(Task)
+            .where(Task.id.in_([row.id for row in rows]))
+            .values(
+                embedding_retry_at=func.now()
+                + func.make_interval(0, 0, 0, 0, 0, 0, EMBEDDING_CLAIM_LEASE_SECONDS)
+            )
+        )
+    db.commit()
+    return rows
+
+
+def embed_claimed(db: Session, rows) -> int:
+    """
+    Embed and assign tasks returned by claim_pending. Returns how many
+    failed; failures are rescheduled with exponential backoff until
+    EMBEDDING_MAX_ATTEMPTS is reached.
+    """
+    claimed_ids = [row.id for row in rows]
+
+    try:
+        embeddings = get_embeddings([row.description for row in rows])
+        assignees = [find_best_user_id(db, embedding) for embedding in embeddings]
+        db.rollback()
+
+        # Lock only for the write; a task edited or deleted meanwhile is skipped
+        tasks = {
+            task.id: task
+            for task in db.query(Task)
+            .filter(Task.id.in_(claimed_ids), Task.embedding_status == PENDING)
+            .with_for_update()
+        }
+        for row, embedding, assignee in zip(rows, embeddings, assignees):
+            task = tasks.get(row.id)
+            if task is None or task.description != row.description:
+                continue
+            task.embedding = embedding
+            task.assigned_user_id = assignee
+            task.embedding_status = READY
+            task.embedding_retry_at = None
+        db.commit()
+        return 0
+    except Exception:
+        db.rollback()
+        logger.exception("embedding failed for tasks %s", claimed_ids)
+        record_failure(db, claimed_ids)
+        return len(claimed_ids)
+
+
+def process_pending(db: Session, task_ids=None, limit: int = 50, due_only: bool = True):
+    """Claim, embed and assign one batch of pending tasks. Returns (claimed, failed) counts."""
+    rows = claim_pending(db, task_ids=task_ids, limit=limit, due_only=due_only)
+    if not rows:
+        return 0, 0
+    return len(rows), embed_claimed(db, rows)
+
+
+def record_failure(db: Session, task_ids):
+    attempts = Task.embedding_attempts + 1
+    db.execute(
+        update(Task)
+        .where(Task.id.in_(task_ids))
+        .values(
+            embedding_attempts=attempts,
+            embedding_status=case(
+                (attempts >= EMBEDDING_MAX_ATTEMPTS, FAILED), else_=PENDING
+            ),
+            embedding_retry_at=func.now()
+            + func.make_interval(
+                0, 0, 0, 0, 0, 0,
+                EMBEDDING_RETRY_BASE_SECONDS * func.power(2, Task.embedding_attempts),
+            ),
+        )
+    )
+    db.commit()
+
+
+class EmbeddingPipeline:
+    """
+    In-process worker pool for EMBEDDING_MODE=background. A submitted task
+    gets one attempt in a worker thread; a failed attempt is rescheduled
+    through embedding_retry_at, and a sweeper thread hands due pending
+    tasks (retries, or tasks still queued when the last process stopped)
+    back to the pool.
+    """
+
+    def __init__(self, workers: int, sweep_interval: float):
+        self.workers = workers
+        self.sweep_interval = sweep_interval
+        self._executor = None
+        self._sweeper = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        # Batches submitted and not finished; the sweep only claims when
+        # the pool has a free worker, so claimed rows don't wait out their lease
+        self._inflight = 0
+
+    def submit(self, task_id: int):
+        return self._submit(self._run, task_id)
+
+    def start(self):
+        """Start the sweeper; its first pass picks up tasks left pending by a restart."""
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            # A fresh event per sweeper, so one left over from a previous
+            # start() stops instead of running alongside
+            self._stop = threading.Event()
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, args=(self._stop,), name="embedding-sweep", daemon=True
+            )
+            self._sweeper.start()
+
+    def shutdown(self):
+        # Queued tasks stay pending in the database; the next start() sweeps them up
+        self._stop.set()
+        with self._lock:
+            self._sweeper = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="embedding"
+                )
+            self._inflight += 1
+            future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self._inflight -= 1
+
+    def _run(self, task_id: int):
+        with SessionLocal() as db:
+            process_pending(db, task_ids=[task_id], limit=1)
+
+    def _embed(self, rows):
+        with SessionLocal() as db:
+            embed_claimed(db, rows)
+
+    def _sweep_loop(self, stop: threading.Event):
+        while not stop.is_set():
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("embedding sweep failed")
+            stop.wait(self.sweep_interval)
+
+    def sweep(self):
+        """Claim a batch of due pending tasks for every idle worker."""
+        with self._lock:
+            idle = self.workers - self._inflight
+        for _ in range(idle):
+            if self._stop.is_set():
+                return
+            with SessionLocal() as db:
+                rows = claim_pending(db, limit=SWEEP_BATCH_SIZE)
+            if not rows:
+                return
+            self._submit(self._embed, rows)
+
+
+embedding_pipeline = EmbeddingPipeline(EMBEDDING_WORKERS, EMBEDDING_SWEEP_INTERVAL_SECONDS)
+
+
+def run_worker(batch_size: int = 50, poll_interval: float = 1.0, once: bool = False):
+    """Queue consumer loop used by `python -m app.cli.embedding_worker`."""
+    while True:
+        db = SessionLocal()
+        try:
+            claimed, failed = process_pending(db, limit=batch_size)
+        finally:
+            db.close()
+
+        if claimed:
+            logger.info("embedded %s tasks (%s failed)", claimed - failed, failed)
+            continue
+        if once:
+            return
+        time.sleep(poll_interval)
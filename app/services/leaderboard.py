@@ -0,0 +1,218 @@
+"""
+Incrementally maintained per-user task totals behind /stats/top-users.
+
+Every flush that creates, deletes, reassigns or re-estimates a Task turns
+into +/- deltas that are upserted into user_task_totals and
+user_task_daily_totals on the same connection, so the leaderboard commits
+(or rolls back) together with the task change. Writers that bypass the
+ORM (COPY import) call apply_task_rows() themselves.
+"""
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import Date, cast, delete, event, func, inspect, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.leaderboard import UserTaskDailyTotal, UserTaskTotal
+from app.models.task import Task
+
+TRACKED_ATTRIBUTES = ("assigned_user_id", "created_at", "total_minutes")
+
+
+def _day(created_at):
+    return (created_at or datetime.utcnow()).date()
+
+
+def _add(deltas, user_id, created_at, minutes, sign):
+    if user_id is None:
+        return
+    entry = deltas[(user_id, _day(created_at))]
+    entry[0] += sign * (minutes or 0)
+    entry[1] += sign
+
+
+def _previous(state, name):
+    history = state.attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.obj(), name)
+
+
+def task_deltas(session: Session):
+    """{(user_id, day): [minutes, count]} for the Task changes being flushed."""
+    deltas = defaultdict(lambda: [0, 0])
+
+    for task in session.new:
+        if isinstance(task, Task):
+            _add(deltas, task.assigned_user_id, task.created_at, task.total_minutes, 1)
+
+    for task in session.deleted:
+        if isinstance(task, Task):
+            state = inspect(task)
+            _add(deltas, *(_previous(state, name) for name in TRACKED_ATTRIBUTES), -1)
+
+    for task in session.dirty:
+        if not isinstance(task, Task):
+            continue
+        state = inspect(task)
+        if not any(state.attrs[name].history.has_changes() for name in TRACKED_ATTRIBUTES):
+            continue
+        _add(deltas, *(_previous(state, name) for name in TRACKED_ATTRIBUTES), -1)
+        _add(deltas, task.assigned_user_id, task.created_at, task.total_minutes, 1)
+
+    return deltas
+
+
+def _upsert(connection, model, rows):
+    table = model.__table__
+    statement = insert(table).values(rows)
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[column.name for column in table.primary_key],
+            set_={
+                "total_minutes": table.c.total_minutes + statement.excluded.total_minutes,
+                "task_count": table.c.task_count + statement.excluded.task_count,
+            },
+        )
+    )
+
+
+def apply_deltas(connection, deltas):
+    """
+    Upsert deltas into both tables. Keys are applied in sorted order so
+    concurrent writers lock leaderboard rows in the same order.
+    """
+    deltas = {key: value for key, value in deltas.items() if value != [0, 0]}
+    if not deltas:
+        return
+
+    totals = defaultdict(lambda: [0, 0])
+    for (user_id, _), (minutes, count) in deltas.items():
+        totals[user_id][0] += minutes
+        totals[user_id][1] += count
+
+    _upsert(connection, UserTaskTotal, [
+        {"user_id": user_id, "total_minutes": minutes, "task_count": count}
+        for user_id, (minutes, count) in sorted(totals.items())
+    ])
+    _upsert(connection, UserTaskDailyTotal, [
+        {"user_id": user_id, "day": day, "total_minutes": minutes, "task_count": count}
+        for (user_id, day), (minutes, count) in sorted(deltas.items())
+    ])
+
+
+def apply_task_rows(connection, rows, sign: int = 1):
+    """
+    Record tasks written outside the ORM. rows are
+    (assigned_user_id, created_at, total_minutes) tuples; sign=-1 removes them.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for assigned_user_id, created_at, total_minutes in rows:
+        _add(deltas, assigned_user_id, created_at, total_minutes, sign)
+    apply_deltas(connection, deltas)
+
+
+def apply_reassignments(connection, moves):
+    """
+    Record assignee changes written outside the ORM. moves are
+    (from_user_id, to_user_id, created_at, total_minutes) tuples.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for from_user_id, to_user_id, created_at, total_minutes in moves:
+        _add(deltas, from_user_id, created_at, total_minutes, -1)
+        _add(deltas, to_user_id, created_at, total_minutes, 1)
+    apply_deltas(connection, deltas)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_task_changes(session, flush_context):
+    deltas = task_deltas(session)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    pass
+
+
+# Make the ORM load the old value before an unloaded attribute is
+# overwritten; otherwise the delta for the previous assignee is lost.
+for _name in ("assigned_user_id", "total_minutes"):
+    event.listen(getattr(Task, _name), "set", _load_previous_value, active_history=True)
+
+
+def _expected_daily_totals():
+    day = cast(func.coalesce(Task.created_at, func.timezone("utc", func.now())), Date)
+    return (
+        select(
+            Task.assigned_user_id,
+            day,
+            func.coalesce(func.sum(Task.total_minutes), 0),
+            func.count(),
+        )
+        .where(Task.assigned_user_id.isnot(None))
+        .group_by(Task.assigned_user_id, day)
+    )
+
+
+def rebuild(db: Session):
+    """Recompute both tables from tasks. Concurrent task writers wait for it."""
+    db.execute(text("LOCK TABLE user_task_totals, user_task_daily_totals IN EXCLUSIVE MODE"))
+    db.execute(delete(UserTaskDailyTotal))
+    db.execute(delete(UserTaskTotal))
+    db.execute(
+        insert(UserTaskDailyTotal).from_select(
+            ["user_id", "day", "total_minutes", "task_count"],
+            _expected_daily_totals(),
+        )
+    )
+    db.execute(
+        insert(UserTaskTotal).from_select(
+            ["user_id", "total_minutes", "task_count"],
+            select(
+                UserTaskDailyTotal.user_id,
+                func.sum(UserTaskDailyTotal.total_minutes),
+                func.sum(UserTaskDailyTotal.task_count),
+            ).group_by(UserTaskDailyTotal.user_id),
+        )
+    )
+    db.commit()
+
+
+def check(db: Session):
+    """
+    Compare the stored totals with a fresh aggregate of tasks. Returns a
+    list of mismatches (empty when consistent), each a dict with the
+    table, key, expected and stored (minutes, count).
+    """
+    expected_daily = {
+        (user_id, day): (int(minutes), count)
+        for user_id, day, minutes, count in db.execute(_expected_daily_totals())
+    }
+    expected_totals = defaultdict(lambda: (0, 0))
+    for (user_id, _), (minutes, count) in expected_daily.items():
+        running_minutes, running_count = expected_totals[user_id]
+        expected_totals[user_id] = (running_minutes + minutes, running_count + count)
+
+    stored_daily = {
+        (row.user_id, row.day): (row.total_minutes, row.task_count)
+        for row in db.query(UserTaskDailyTotal)
+    }
+    stored_totals = {
+        row.user_id: (row.total_minutes, row.task_count)
+        for row in db.query(UserTaskTotal)
+    }
+
+    mismatches = []
+    for table, expected, stored in (
+        (UserTaskTotal.__tablename__, expected_totals, stored_totals),
+        (UserTaskDailyTotal.__tablename__, expected_daily, stored_daily),
+    ):
+        for key in sorted(set(expected) | set(stored), key=str):
+            want = expected.get(key, (0, 0))
+            have = stored.get(key, (0, 0))
+            if want != have:
+                mismatches.append({"table": table, "key": key, "expected": want, "stored": have})
+
+    return mismatches
@@ -0,0 +1,187 @@
+"""
+Cached daily plans for /ai/suggest.
+
+Each user's latest plan is stored in daily_plans with the
+users.task_set_version it was built from (see plan_versions). Serving
+costs one indexed query when the plan is current. An outdated plan is
+either rebuilt inline or, with PLAN_STALE_WHILE_REVALIDATE, served as-is
+while a background worker rebuilds it. `python -m app.cli.precompute_plans`
+builds plans for active users ahead of time.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import exists, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    PLAN_MAX_STALE_SECONDS,
+    PLAN_PRECOMPUTE_CONCURRENCY,
+    PLAN_REFRESH_WORKERS,
+    PLAN_STALE_WHILE_REVALIDATE,
+    PLAN_TTL_SECONDS,
+)
+from app.db.session import SessionLocal
+from app.models.daily_plan import DailyPlan
+from app.models.task import Task
+from app.models.user import User
+from app.repositories import tasks as task_repo
+from app.services.ai_service import generate_daily_plan
+
+logger = logging.getLogger("sprintsync")
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+def cached_plan(db: Session, user_id: int):
+    """The user's current task-set version and stored plan (NULLs if none), in one query."""
+    return (
+        db.query(
+            User.task_set_version,
+            DailyPlan.task_set_version.label("plan_version"),
+            DailyPlan.plan,
+            DailyPlan.generated_at,
+        )
+        .outerjoin(DailyPlan, DailyPlan.user_id == User.id)
+        .filter(User.id == user_id)
+        .first()
+    )
+
+
+def plan_state(row, now=None) -> str:
+    if row is None or row.plan is None:
+        return MISS
+
+    age = ((now or datetime.now(timezone.utc)) - row.generated_at).total_seconds()
+    if row.plan_version == row.task_set_version and age <= PLAN_TTL_SECONDS:
+        return FRESH
+    if PLAN_STALE_WHILE_REVALIDATE and age <= PLAN_MAX_STALE_SECONDS:
+        return STALE
+    return MISS
+
+
+def refresh_plan(user_id: int):
+    """Generate the user's plan and store it on the primary; returns the plan."""
+    with SessionLocal() as db:
+        # Read the version before the tasks: a change racing with this makes
+        # the stored plan look outdated, never the other way round.
+        version = db.query(User.task_set_version).filter(User.id == user_id).scalar()
+        plan = generate_daily_plan(task_repo.list_plan_tasks(db, user_id))
+        if version is None:
+            return plan
+
+        statement = insert(DailyPlan).values(
+            user_id=user_id, task_set_version=version, plan=plan, generated_at=func.now()
+        )
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={
+                    "task_set_version": statement.excluded.task_set_version,
+                    "plan": statement.excluded.plan,
+                    "generated_at": statement.excluded.generated_at,
+                },
+                # A slow refresh must not overwrite a newer plan
+                where=DailyPlan.task_set_version <= statement.excluded.task_set_version,
+            )
+        )
+        db.commit()
+    return plan
+
+
+class PlanRefresher:
+    """
+    Background plan rebuilds for stale-while-revalidate. At most one
+    rebuild per user is queued or running at a time.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = None
+        self._inflight = set()
+        self._lock = threading.Lock()
+
+    def submit(self, user_id: int) -> bool:
+        with self._lock:
+            if user_id in self._inflight:
+                return False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="plan-refresh"
+                )
+            self._inflight.add(user_id)
+        self._executor.submit(self._run, user_id)
+        return True
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _run(self, user_id: int):
+        try:
+            refresh_plan(user_id)
+        except Exception:
+            logger.exception("plan refresh failed for user %s", user_id)
+        finally:
+            with self._lock:
+                self._inflight.discard(user_id)
+
+
+plan_refresher = PlanRefresher(PLAN_REFRESH_WORKERS)
+
+
+def get_plan(db: Session, user_id: int):
+    """(plan, state) for /ai/suggest; `db` may be a read replica session."""
+    row = cached_plan(db, user_id)
+    state = plan_state(row)
+    if state == FRESH:
+        return row.plan, state
+    if state == STALE:
+        plan_refresher.submit(user_id)
+        return row.plan, state
+    return refresh_plan(user_id), state
+
+
+def users_needing_plans(db: Session, everything: bool = False):
+    """
+    Ids of active users (owning at least one open task) whose plan is
+    missing, outdated or older than PLAN_TTL_SECONDS; all of them with
+    `everything`.
+    """
+    query = (
+        db.query(User.id)
+        .outerjoin(DailyPlan, DailyPlan.user_id == User.id)
+        .filter(exists().where(Task.user_id == User.id, Task.status != "DONE"))
+    )
+    if not everything:
+        query = query.filter(
+            or_(
+                DailyPlan.user_id == None,
+                DailyPlan.task_set_version != User.task_set_version,
+                DailyPlan.generated_at < func.now() - timedelta(seconds=PLAN_TTL_SECONDS),
+            )
+        )
+    return [row.id for row in query.order_by(User.id)]
+
+
+def precompute_plans(user_ids, concurrency: int = PLAN_PRECOMPUTE_CONCURRENCY, progress=None):
+    """Rebuild plans for `user_ids`, at most `concurrency` at a time. Returns (done, failed)."""
+    done = failed = 0
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="plan-precompute") as pool:
+        futures = {pool.submit(refresh_plan, user_id): user_id for user_id in user_ids}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                done += 1
+            except Exception:
+                failed += 1
+                logger.exception("plan precompute failed for user %s", futures[future])
+            if progress:
+                progress(done, failed)
+    return done, failed
@@ -0,0 +1,55 @@
+"""
+users.task_set_version: a counter bumped in the same transaction as any
+change to the tasks a user owns that the daily planner can see. A cached
+plan is current exactly when it was built from the current version.
+
+ORM writes are tracked by the flush listener below; writers that bypass
+the ORM (COPY import) call bump_task_set_versions() themselves.
+"""
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+
+from app.models.task import Task
+from app.models.user import User
+
+# Task attributes the planner reads (PLAN_TASK_COLUMNS in
+# app/repositories/tasks.py); embedding or assignment changes leave plans alone
+PLANNED_ATTRIBUTES = ("title", "description", "status", "total_minutes")
+
+
+def bump_task_set_versions(connection, user_ids):
+    # Sorted so concurrent writers lock user rows in the same order
+    user_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+    if user_ids:
+        connection.execute(
+            update(User)
+            .where(User.id.in_(user_ids))
+            .values(task_set_version=User.task_set_version + 1)
+        )
+
+
+def changed_owners(session: Session):
+    owners = set()
+    for task in session.new:
+        if isinstance(task, Task):
+            owners.add(task.user_id)
+
+    for task in session.deleted:
+        if isinstance(task, Task):
+            owners.add(task.user_id)
+
+    for task in session.dirty:
+        if not isinstance(task, Task):
+            continue
+        state = inspect(task)
+        if any(state.attrs[name].history.has_changes() for name in PLANNED_ATTRIBUTES):
+            owners.add(task.user_id)
+
+    return owners
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_on_task_changes(session, flush_context):
+    owners = changed_owners(session)
+    if owners:
+        bump_task_set_versions(session.connection(), owners)
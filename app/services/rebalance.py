@@ -0,0 +1,204 @@
+"""
+Backlog rebalancing behind POST /ai/rebalance.
+
+create_task assigns each task to its single nearest resume, so a few
+generalists collect most of the work. Rebalancing reassigns every open
+TODO task with an embedding in one pass: the task x user cosine
+similarity matrix is one matrix product, and tasks are then assigned
+greedily, most similar (task, user) pairs first, subject to a per-user
+budget of open minutes. Tasks already IN_PROGRESS, and open tasks
+without an embedding, keep their assignee and count against that budget.
+"""
+import time
+
+import numpy as np
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    REBALANCE_CANDIDATES,
+    REBALANCE_CAPACITY_SLACK,
+    REBALANCE_STICKINESS,
+)
+from app.db.vectors import to_numpy
+from app.models.task import Task
+from app.models.user import User
+from app.services.assignment_service import normalize_rows
+from app.services.leaderboard import apply_reassignments
+
+TODO = "TODO"
+DONE = "DONE"
+
+
+def capacities(minutes: np.ndarray, fixed_load: np.ndarray, slack: float = REBALANCE_CAPACITY_SLACK):
+    """Open minutes each user can still take: the even share plus slack, minus fixed work."""
+    share = (minutes.sum() + fixed_load.sum()) / len(fixed_load)
+    return np.maximum(share * (1 + slack) - fixed_load, 0)
+
+
+def plan_assignment(similarity: np.ndarray, minutes: np.ndarray, capacity: np.ndarray, candidates: int = REBALANCE_CANDIDATES):
+    """
+    Capacity-constrained assignment of tasks (rows) to users (columns).
+
+    Each task's `candidates` most similar users are ranked across all tasks
+    at once and taken best-first while the user has capacity left. Tasks
+    whose candidates are all full go to the most similar user that still
+    fits them, or failing that to the user with the most room. Returns the
+    column index per task.
+    """
+    n_tasks, n_users = similarity.shape
+    k = min(candidates, n_users)
+    top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+    scores = np.take_along_axis(similarity, top, axis=1)
+    order = np.argsort(-scores, axis=None, kind="stable")
+
+    minutes = minutes.tolist()
+    remaining = capacity.astype(np.float64).tolist()
+    assignment = [-1] * n_tasks
+    unassigned = n_tasks
+
+    for task, user in zip((order // k).tolist(), top.ravel()[order].tolist()):
+        if assignment[task] >= 0 or minutes[task] > remaining[user]:
+            continue
+        assignment[task] = user
+        remaining[user] -= minutes[task]
+        unassigned -= 1
+        if not unassigned:
+            break
+
+    assignment = np.array(assignment, dtype=np.int64)
+    remaining = np.array(remaining)
+    for task in np.flatnonzero(assignment < 0):
+        fits = remaining >= minutes[task]
+        user = int(np.argmax(np.where(fits, similarity[task], -np.inf))) if fits.any() else int(np.argmax(remaining))
+        assignment[task] = user
+        remaining[user] -= minutes[task]
+
+    return assignment
+
+
+def load_summary(load: np.ndarray) -> dict:
+    return {
+        "max": int(load.max()),
+        "mean": round(float(load.mean()), 1),
+        "stddev": round(float(load.std()), 1),
+    }
+
+
+def rebalance_backlog(db: Session, dry_run: bool = True) -> dict:
+    """
+    Reassign TODO tasks and return a report with the per-task diff. Unless
+    `dry_run`, the open tasks are locked while planning and the changes are
+    written with one executemany UPDATE, leaderboard deltas included.
+    """
+    timings = {}
+    started = time.perf_counter()
+
+    query = db.query(
+        Task.id,
+        Task.status,
+        Task.assigned_user_id,
+        Task.created_at,
+        Task.total_minutes,
+        Task.embedding,
+    ).filter(Task.status != DONE)
+    if not dry_run:
+        query = query.with_for_update(of=Task)
+    tasks = query.order_by(Task.id).all()
+
+    users = (
+        db.query(User.id, User.resume_embedding)
+        .filter(User.resume_embedding != None)
+        .order_by(User.id)
+        .all()
+    )
+    timings["load_ms"] = (time.perf_counter() - started) * 1000
+
+    # Work someone has started stays with them
+    movable = [task for task in tasks if task.status == TODO and task.embedding is not None]
+    movable_ids = {task.id for task in movable}
+    report = {
+        "dry_run": dry_run,
+        "tasks": len(movable),
+        "users": len(users),
+        "moved": 0,
+        "changes": [],
+    }
+    if not movable or not users:
+        db.rollback()
+        return {**report, "timings_ms": {"load_ms": round(timings["load_ms"], 2)}}
+
+    started = time.perf_counter()
+    user_ids = np.array([user.id for user in users], dtype=np.int64)
+    column = {int(user_id): i for i, user_id in enumerate(user_ids)}
+    similarity = normalize_rows([to_numpy(task.embedding) for task in movable]) @ normalize_rows(
+        [to_numpy(user.resume_embedding) for user in users]
+    ).T
+    timings["similarity_ms"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    minutes = np.array([task.total_minutes or 0 for task in movable], dtype=np.float64)
+    current = np.array([column.get(task.assigned_user_id, -1) for task in movable], dtype=np.int64)
+
+    fixed_load = np.zeros(len(users))
+    for task in tasks:
+        if task.id not in movable_ids and task.assigned_user_id in column:
+            fixed_load[column[task.assigned_user_id]] += task.total_minutes or 0
+
+    rows = np.arange(len(movable))
+    kept = current >= 0
+    similarity_before = similarity[rows[kept], current[kept]]
+
+    biased = similarity.copy()
+    biased[rows[kept], current[kept]] += REBALANCE_STICKINESS
+    assignment = plan_assignment(biased, minutes, capacities(minutes, fixed_load))
+    timings["assign_ms"] = (time.perf_counter() - started) * 1000
+
+    load_before = fixed_load.copy()
+    np.add.at(load_before, current[kept], minutes[kept])
+    load_after = fixed_load + np.bincount(assignment, weights=minutes, minlength=len(users))
+
+    changes = [
+        {
+            "task_id": task.id,
+            "from_user_id": task.assigned_user_id,
+            "to_user_id": int(user_ids[user]),
+            "total_minutes": task.total_minutes or 0,
+        }
+        for task, user in zip(movable, assignment.tolist())
+        if task.assigned_user_id != int(user_ids[user])
+    ]
+
+    report.update(
+        moved=len(changes),
+        changes=changes,
+        mean_similarity_before=round(float(similarity_before.mean()), 4) if kept.any() else None,
+        mean_similarity_after=round(float(similarity[rows, assignment].mean()), 4),
+        load_minutes_before=load_summary(load_before),
+        load_minutes_after=load_summary(load_after),
+    )
+
+    started = time.perf_counter()
+    if dry_run or not changes:
+        db.rollback()
+    else:
+        db.execute(
+            update(Task),
+            [{"id": change["task_id"], "assigned_user_id": change["to_user_id"]} for change in changes],
+        )
+        # The executemany UPDATE bypasses the ORM flush listener
+        created_at = {task.id: task.created_at for task in movable}
+        apply_reassignments(db.connection(), [
+            (
+                change["from_user_id"],
+                change["to_user_id"],
+                created_at[change["task_id"]],
+                change["total_minutes"],
+            )
+            for change in changes
+        ])
+        db.commit()
+    timings["write_ms"] = (time.perf_counter() - started) * 1000
+
+    report["timings_ms"] = {name: round(ms, 2) for name, ms in timings.items()}
+    return report
@@ -0,0 +1,290 @@
+"""
+Recompute or backfill stored embeddings, e.g. after EMBEDDING_DIMENSIONS,
+EMBEDDING_STORAGE or EMBEDDING_PROVIDER changed, or after loading rows
+without vectors.
+
+Rows are read in primary-key (keyset) order and handed out in chunks to a
+bounded pool of workers; each worker embeds its chunk with one batched
+call and writes it back with one executemany UPDATE in its own
+transaction. Chunks finish out of order, so the checkpoint records the
+highest id below which every chunk has committed, and an interrupted run
+resumes from there.
+
+Tasks embed their description, or their title when the description is
+empty, so title-only tasks get vectors too. Tasks still pending for the
+embedding worker are left to it.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_DIMENSIONS,
+    EMBEDDING_STORAGE,
+    REEMBED_WORKERS,
+)
+from app.db.session import SessionLocal
+from app.db.vectors import to_numpy
+from app.models.task import Task
+from app.models.user import User
+from app.services.assignment_service import ResumeMatrix
+from app.services.embedding_providers import get_provider
+from app.services.embedding_service import get_embeddings
+from app.services.leaderboard import apply_reassignments
+
+# name -> (model, text to embed, embedding column)
+TARGETS = {
+    "users": (User, func.nullif(func.trim(User.resume_text), ""), User.resume_embedding),
+    "tasks": (
+        Task,
+        func.coalesce(func.nullif(func.trim(Task.description), ""), Task.title),
+        Task.embedding,
+    ),
+}
+
+
+def _filters(target: str, everything: bool):
+    model, source, embedding = TARGETS[target]
+    filters = [source != None]
+    if target == "tasks":
+        filters.append(Task.embedding_status.is_distinct_from("pending"))
+    if not everything:
+        filters.append(embedding == None)
+    return filters
+
+
+def count_rows(db: Session, target: str, after_id: int = 0, everything: bool = False) -> int:
+    model = TARGETS[target][0]
+    return db.execute(
+        select(func.count()).select_from(model).where(model.id > after_id, *_filters(target, everything))
+    ).scalar()
+
+
+def next_batch(db: Session, target: str, after_id: int, limit: int, everything: bool = False):
+    """Up to `limit` (id, text) rows with id > after_id that need a vector."""
+    model, source, _ = TARGETS[target]
+    query = (
+        select(model.id, source)
+        .where(model.id > after_id, *_filters(target, everything))
+        .order_by(model.id)
+        .limit(limit)
+    )
+    return db.execute(query).all()
+
+
+def reembed_rows(target: str, rows) -> int:
+    """Embed `rows` and store the vectors with one executemany UPDATE."""
+    model, _, embedding = TARGETS[target]
+    vectors = get_embeddings([row[1] for row in rows])
+
+    values = [{"id": row[0], embedding.key: vector} for row, vector in zip(rows, vectors)]
+    if target == "tasks":
+        for value in values:
+            value["embedding_status"] = "ready"
+
+    with SessionLocal() as db:
+        db.execute(update(model), values)
+        db.commit()
+    return len(rows)
+
+
+def run_signature(target: str, everything: bool) -> str:
+    """Checkpoints only resume a run with the same target, mode and vector settings."""
+    mode = "all" if everything else "missing"
+    return f"{target}:{mode}:{get_provider().cache_namespace}:{EMBEDDING_STORAGE}({EMBEDDING_DIMENSIONS})"
+
+
+class Checkpoint:
+    """Per-run low-water marks in a small JSON file, rewritten atomically."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, data):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def load(self, signature: str) -> int:
+        return self._read().get(signature, 0)
+
+    def save(self, signature: str, after_id: int):
+        with self._lock:
+            data = self._read()
+            data[signature] = after_id
+            self._write(data)
+
+    def clear(self, signature: str):
+        with self._lock:
+            data = self._read()
+            if data.pop(signature, None) is not None:
+                self._write(data)
+
+
+def reembed(
+    target: str,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    workers: int = REEMBED_WORKERS,
+    everything: bool = False,
+    checkpoint: Checkpoint = None,
+    progress=None,
+    collect_ids: bool = False,
+):
+    """
+    Re-embed every matching row of `target`. Returns (rows updated, ids of
+    those rows); the ids are only gathered with `collect_ids`, otherwise
+    the list is empty. `progress` is called after each committed chunk with
+    a dict of done/total counts, rows per second and the ETA in seconds.
+    """
+    signature = run_signature(target, everything)
+    after_id = checkpoint.load(signature) if checkpoint else 0
+
+    with SessionLocal() as db:
+        total = count_rows(db, target, after_id, everything)
+
+    started = time.perf_counter()
+    done = 0
+    updated_ids = []
+    # chunk sequence number -> last id, for chunks still running; committed
+    # chunks after a running one wait in `finished` for the low-water mark
+    running = {}
+    finished = {}
+    next_to_commit = 0
+    sequence = 0
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reembed") as pool, SessionLocal() as db:
+        futures = {}
+        cursor = after_id
+        exhausted = False
+
+        while futures or not exhausted:
+            # Keep the pool busy, with at most one chunk queued per worker
+            while not exhausted and len(futures) < 2 * workers:
+                rows = next_batch(db, target, cursor, batch_size, everything)
+                db.rollback()
+                if not rows:
+                    exhausted = True
+                    break
+                cursor = rows[-1][0]
+                ids = [row[0] for row in rows] if collect_ids else None
+                futures[pool.submit(reembed_rows, target, rows)] = (sequence, ids)
+                running[sequence] = cursor
+                sequence += 1
+
+            if not futures:
+                break
+
+            completed, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in completed:
+                chunk, ids = futures.pop(future)
+                # Re-raises the first failure; the checkpoint keeps what committed
+                done += future.result()
+                if collect_ids:
+                    updated_ids.extend(ids)
+                finished[chunk] = running.pop(chunk)
+
+            while next_to_commit in finished:
+                after_id = finished.pop(next_to_commit)
+                next_to_commit += 1
+            if checkpoint:
+                checkpoint.save(signature, after_id)
+
+            if progress:
+                elapsed = time.perf_counter() - started
+                rate = done / elapsed if elapsed else 0
+                progress({
+                    "target": target,
+                    "done": done,
+                    "total": total,
+                    "rows_per_second": round(rate, 1),
+                    "eta_seconds": round(max(total - done, 0) / rate, 1) if rate else None,
+                    "checkpoint": after_id,
+                })
+
+    if checkpoint:
+        checkpoint.clear(signature)
+    return done, updated_ids
+
+
+def _reassign_chunks(task_ids, batch_size: int):
+    """Filters selecting successive chunks of tasks: by id list, or keyset over all."""
+    if task_ids is not None:
+        ids = sorted(task_ids)
+        for start in range(0, len(ids), batch_size):
+            yield Task.id.in_(ids[start:start + batch_size])
+        return
+
+    after_id = 0
+    while after_id is not None:
+        # The caller sends back the last id it saw, or None when done
+        after_id = yield Task.id > after_id
+
+
+def reassign_tasks(task_ids=None, batch_size: int = EMBEDDING_BATCH_SIZE, progress=None) -> int:
+    """
+    Re-run nearest-resume assignment for TODO tasks with a vector: the given
+    `task_ids`, or all of them. Tasks already in progress keep their
+    assignee, as in /ai/rebalance. Moves are written in bulk per chunk, with
+    leaderboard deltas. Returns how many tasks changed assignee.
+    """
+    checked = moved = 0
+    with SessionLocal() as db:
+        matrix = ResumeMatrix()
+        matrix.load(db)
+        db.rollback()
+        if not len(matrix):
+            return 0
+
+        chunks = _reassign_chunks(task_ids, batch_size)
+        selection = next(chunks, None)
+        while selection is not None:
+            tasks = (
+                db.query(Task.id, Task.assigned_user_id, Task.created_at, Task.total_minutes, Task.embedding)
+                .filter(selection, Task.embedding != None, Task.status == "TODO")
+                .order_by(Task.id)
+                .limit(batch_size)
+                .with_for_update(of=Task)
+                .all()
+            )
+
+            best = matrix.best_matches([to_numpy(task.embedding) for task in tasks]) if tasks else []
+            moves = [
+                (task.id, task.assigned_user_id, user_id, task.created_at, task.total_minutes or 0)
+                for task, user_id in zip(tasks, best)
+                if user_id != task.assigned_user_id
+            ]
+            if moves:
+                db.execute(
+                    update(Task),
+                    [{"id": task_id, "assigned_user_id": to_user} for task_id, _, to_user, _, _ in moves],
+                )
+                # The executemany UPDATE bypasses the ORM flush listener
+                apply_reassignments(db.connection(), [move[1:] for move in moves])
+            db.commit()
+
+            checked += len(tasks)
+            moved += len(moves)
+            if progress:
+                progress(checked, moved)
+
+            try:
+                selection = chunks.send(tasks[-1].id if tasks else None)
+            except StopIteration:
+                selection = None
+
+    return moved
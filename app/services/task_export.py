@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import TASK_EXPORT_CHUNK_SIZE
+from app.models.task import Task
+
+EXPORT_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "total_minutes",
+    "user_id",
+    "assigned_user_id",
+    "created_at",
+    "embedding_status",
+)
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def iter_task_rows(db: Session, user_id=None, chunk_size: int = TASK_EXPORT_CHUNK_SIZE):
+    """
+    Yield export rows from a server-side cursor, fetching chunk_size rows
+    at a time, so memory stays flat however many tasks there are.
+    All users' tasks are exported when user_id is None.
+    """
+    query = select(*(getattr(Task, name) for name in EXPORT_COLUMNS))
+    if user_id is None:
+        query = query.order_by(Task.id)
+    else:
+        # Follows ix_tasks_user_id_created_at_id, so rows stream without a sort
+        query = query.where(Task.user_id == user_id).order_by(Task.created_at, Task.id)
+
+    result = db.execute(query.execution_options(yield_per=chunk_size))
+    try:
+        yield from result
+    finally:
+        result.close()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot export {type(value).__name__}")
+
+
+def ndjson_chunks(rows, chunk_size: int = TASK_EXPORT_CHUNK_SIZE):
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=_json_default))
+        if len(buffer) >= chunk_size:
+            yield "\n".join(buffer) + "\n"
+            buffer = []
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+
+def csv_chunks(rows, chunk_size: int = TASK_EXPORT_CHUNK_SIZE):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_tasks(open_session, fmt: str, user_id=None, chunk_size: int = TASK_EXPORT_CHUNK_SIZE):
+    """
+    Encoded export chunks for a StreamingResponse. The session is opened
+    on first iteration and closed when the stream ends or is abandoned,
+    independent of the request's dependency lifecycle.
+    """
+    encode = csv_chunks if fmt == "csv" else ndjson_chunks
+
+    db = open_session()
+    try:
+        yield from encode(iter_task_rows(db, user_id, chunk_size), chunk_size)
+    finally:
+        db.close()
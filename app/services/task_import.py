@@ -0,0 +1,216 @@
+import csv
+import io
+import json
+from datetime import datetime
+from itertools import islice
+
+import numpy as np
+import psycopg2
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import TASK_IMPORT_CHUNK_SIZE, TASK_IMPORT_MAX_ERRORS
+from app.schemas.task import TaskCreate, TaskImportError, TaskImportReport
+from app.services.assignment_service import resume_matrix
+from app.services.embedding_service import get_embeddings
+from app.services.leaderboard import apply_task_rows
+from app.services.plan_versions import bump_task_set_versions
+
+TASK_COPY_COLUMNS = (
+    "title",
+    "description",
+    "status",
+    "total_minutes",
+    "user_id",
+    "assigned_user_id",
+    "created_at",
+    "embedding",
+    "embedding_status",
+)
+
+
+def iter_records(lines, fmt: str):
+    """
+    Yield (row_number, dict) pairs from CSV (with a header row) or JSON Lines.
+    Unparseable JSON lines are yielded as (row_number, error_message).
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for row_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row_number, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield row_number, "Expected a JSON object"
+            continue
+        yield row_number, record
+
+
+def record_to_task(record: dict) -> TaskCreate:
+    """
+    Validate one input record. Besides TaskCreate's own fields this accepts
+    the column names of our estimates sprint sheets (Task, Story, Actual).
+    """
+    data = {
+        key: value
+        for key, value in record.items()
+        if key in TaskCreate.model_fields and value not in (None, "")
+    }
+
+    if "title" not in data and record.get("Task"):
+        data["title"] = record["Task"]
+    if "description" not in data and record.get("Story"):
+        data["description"] = record["Story"]
+    if "total_minutes" not in data and record.get("Actual"):
+        try:
+            data["total_minutes"] = round(float(record["Actual"]) * 60)
+        except ValueError:
+            raise ValueError(f"Invalid Actual hours: {record['Actual']!r}")
+
+    return TaskCreate(**data)
+
+
+def _copy_value(value) -> str:
+    """Encode a value for COPY ... FROM STDIN (text format)."""
+    if value is None:
+        return r"\N"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (np.ndarray, list)):
+        return "[" + ",".join(repr(float(v)) for v in value) + "]"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class TaskImporter:
+    """
+    Imports tasks for one owner in chunks: one batched embedding call and
+    one vectorised assignment pass per chunk, written with COPY and
+    committed per chunk so a bad chunk doesn't lose earlier work. Only the
+    first `max_errors` row errors are kept; the rest are counted in `failed`.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        user_id: int,
+        chunk_size: int = TASK_IMPORT_CHUNK_SIZE,
+        max_errors: int = TASK_IMPORT_MAX_ERRORS,
+        progress=None,
+    ):
+        self.db = db
+        self.user_id = user_id
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.progress = progress
+        self.report = TaskImportReport()
+
+    def run(self, records):
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                break
+            self.import_chunk(chunk)
+            if self.progress:
+                self.progress(self.report)
+
+        return self.report
+
+    def import_chunk(self, chunk):
+        row_numbers = []
+        tasks = []
+
+        for row_number, record in chunk:
+            try:
+                if isinstance(record, str):
+                    raise ValueError(record)
+                tasks.append(record_to_task(record))
+                row_numbers.append(row_number)
+            except (ValueError, ValidationError) as e:
+                self._fail(row_number, str(e))
+
+        if not tasks:
+            return
+
+        embeddings = [None] * len(tasks)
+        assignees = [None] * len(tasks)
+        described = [i for i, task in enumerate(tasks) if task.description]
+
+        if described:
+            vectors = get_embeddings([tasks[i].description for i in described])
+            resume_matrix.ensure_fresh(self.db)
+            matches = resume_matrix.best_matches(np.asarray(vectors, dtype=np.float32))
+            for i, vector, user_id in zip(described, vectors, matches):
+                embeddings[i] = vector
+                assignees[i] = user_id
+
+        now = datetime.utcnow()
+        buffer = io.StringIO()
+        for task, embedding, assignee in zip(tasks, embeddings, assignees):
+            values = (
+                task.title,
+                task.description,
+                task.status,
+                task.total_minutes,
+                self.user_id,
+                assignee,
+                now,
+                embedding,
+                "ready" if embedding is not None else None,
+            )
+            buffer.write("\t".join(_copy_value(v) for v in values) + "\n")
+        buffer.seek(0)
+
+        try:
+            cursor = self.db.connection().connection.cursor()
+            cursor.copy_expert(
+                f"COPY tasks ({', '.join(TASK_COPY_COLUMNS)}) FROM STDIN",
+                buffer,
+            )
+            # COPY bypasses the ORM flush listeners
+            apply_task_rows(
+                self.db.connection(),
+                [(assignee, now, task.total_minutes) for task, assignee in zip(tasks, assignees)],
+            )
+            bump_task_set_versions(self.db.connection(), [self.user_id])
+            self.db.commit()
+        except (SQLAlchemyError, psycopg2.Error) as e:
+            self.db.rollback()
+            for row_number in row_numbers:
+                self._fail(row_number, str(e.__cause__ or e))
+            return
+
+        self.report.imported += len(tasks)
+
+    def _fail(self, row_number: int, error: str):
+        self.report.failed += 1
+        if len(self.report.errors) < self.max_errors:
+            self.report.errors.append(TaskImportError(row=row_number, error=error))
+
+
+def import_tasks(
+    db: Session,
+    lines,
+    fmt: str,
+    user_id: int,
+    chunk_size: int = TASK_IMPORT_CHUNK_SIZE,
+    max_errors: int = TASK_IMPORT_MAX_ERRORS,
+    progress=None,
+):
+    importer = TaskImporter(db, user_id, chunk_size=chunk_size, max_errors=max_errors, progress=progress)
+    return importer.run(iter_records(lines, fmt))
@@ -0,0 +1,103 @@
+"""
+Task-to-user matching: in-process resume matrix vs. Postgres ORDER BY.
+
+For each user count, builds synthetic resume vectors, then times the
+ResumeMatrix top-1 lookup and the exact pgvector query over a temporary
+table holding the same vectors.
+
+    python -m benchmarks.assignment --users 1000,10000,100000 --queries 50
+    python -m benchmarks.assignment --skip-sql
+"""
+import argparse
+import io
+import json
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+from app.services.assignment_service import ResumeMatrix
+from benchmarks.common import summarise
+
+
+def bench_numpy(vectors, queries):
+    matrix = ResumeMatrix(dim=vectors.shape[1])
+    matrix.loaded_at = time.monotonic()
+
+    start = time.perf_counter()
+    for user_id, vector in enumerate(vectors, start=1):
+        matrix.upsert(user_id, vector)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        matrix.top_k(query, k=1)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "build_ms": round(build_ms, 1),
+        "matrix_mb": round(vectors.astype(np.float32).nbytes / 2**20, 1),
+        **summarise(latencies, digits=3),
+    }
+
+
+def bench_sql(vectors, queries):
+    from app.db.session import engine
+
+    dim = vectors.shape[1]
+    with engine.connect() as connection:
+        connection.execute(
+            text(f"CREATE TEMP TABLE bench_resumes (id serial, embedding vector({dim}))")
+        )
+
+        buffer = io.StringIO()
+        for vector in vectors:
+            buffer.write("[" + ",".join(f"{v:.6f}" for v in vector) + "]\n")
+        buffer.seek(0)
+        cursor = connection.connection.cursor()
+        cursor.copy_expert("COPY bench_resumes (embedding) FROM STDIN", buffer)
+        connection.execute(text("ANALYZE bench_resumes"))
+
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            connection.execute(
+                text(
+                    "SELECT id FROM bench_resumes "
+                    "ORDER BY embedding <=> CAST(:query AS vector) LIMIT 1"
+                ),
+                {"query": str(query.tolist())},
+            ).first()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        connection.rollback()
+
+    return summarise(latencies, digits=3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", default="1000,10000,100000")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--skip-sql", action="store_true")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    report = []
+
+    for count in [int(v) for v in args.users.split(",")]:
+        vectors = rng.standard_normal((count, args.dim), dtype=np.float32)
+        result = {"users": count, "numpy": bench_numpy(vectors, queries)}
+        if not args.skip_sql:
+            result["sql"] = bench_sql(vectors, queries)
+        report.append(result)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
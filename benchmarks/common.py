@@ -0,0 +1,40 @@
+"""
+Helpers shared by the benchmark scripts: latency percentiles and
+summaries, and waiting for a server started in a subprocess.
+"""
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values, q, digits: int = 2):
+    """Nearest-rank percentile (`q` in 0..1) of `values`, or None if empty."""
+    values = sorted(values)
+    return round(values[max(int(len(values) * q) - 1, 0)], digits) if values else None
+
+
+def summarise(latencies, digits: int = 2) -> dict:
+    """Count, p50/p95/p99 and mean of `latencies` in milliseconds."""
+    if not latencies:
+        return {"count": 0, "p50_ms": None, "p95_ms": None, "p99_ms": None, "mean_ms": None}
+    return {
+        "count": len(latencies),
+        "p50_ms": round(statistics.median(latencies), digits),
+        "p95_ms": percentile(latencies, 0.95, digits),
+        "p99_ms": percentile(latencies, 0.99, digits),
+        "mean_ms": round(statistics.fmean(latencies), digits),
+    }
+
+
+def wait_until_up(url: str, timeout: float = 30.0):
+    """Poll `url` until it answers 200, e.g. a freshly started server's /health/ready."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
@@ -0,0 +1,104 @@
+"""
+Throughput of the sync (threadpool) and async (asyncpg) DB stacks under
+high client concurrency.
+
+Starts one uvicorn server per DB_MODE, registers a benchmark user, then
+hammers authenticated read endpoints with `--concurrency` simultaneous
+connections for `--duration` seconds.
+
+    python -m benchmarks.concurrency --concurrency 500 --duration 20
+    python -m benchmarks.concurrency --modes async --path /tasks/
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+from benchmarks.common import summarise, wait_until_up
+
+
+async def get_token(client: httpx.AsyncClient) -> str:
+    credentials = {"email": f"bench-{uuid.uuid4().hex[:8]}@example.com", "password": "bench123"}
+    await client.post("/auth/register", json=credentials)
+    response = await client.post("/auth/login", json=credentials)
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def hammer(base_url: str, path: str, concurrency: int, duration: float):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        token = await get_token(client)
+        headers = {"Authorization": f"Bearer {token}"}
+        latencies = []
+        errors = 0
+        deadline = time.monotonic() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path, headers=headers)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    return {
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        **summarise(latencies),
+    }
+
+
+def run_mode(mode: str, args) -> dict:
+    env = {**os.environ, "DB_MODE": mode}
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(args.port), "--workers", str(args.workers),
+            "--log-level", "warning",
+        ],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_until_up(f"{base_url}/health/ready")
+        return asyncio.run(hammer(base_url, args.path, args.concurrency, args.duration))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modes", default="sync,async")
+    parser.add_argument("--path", default="/tasks/")
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    report = {
+        "path": args.path,
+        "concurrency": args.concurrency,
+        "results": {mode: run_mode(mode, args) for mode in args.modes.split(",")},
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
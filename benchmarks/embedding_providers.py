@@ -0,0 +1,93 @@
+"""
+Local CPU embedding provider versus the remote provider, the latter talking
+to benchmarks.embeddings_stub with a configurable round-trip latency.
+
+Reports single-text latency (p50/p95/p99) and batch throughput per
+provider. The embedding cache is bypassed so every call does real work.
+
+    python -m benchmarks.embedding_providers --stub-latency-ms 80
+    python -m benchmarks.embedding_providers --batch-sizes 1,32,256 --calls 200
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+import uuid
+
+from openai import OpenAI
+
+from app.services.embedding_providers import HashingProvider, OpenAIProvider
+from benchmarks.common import summarise, wait_until_up
+
+
+def texts(count: int):
+    run_id = uuid.uuid4().hex[:8]
+    return [
+        f"Run {run_id} task {i}: implement the reporting export for sprint {i % 40} "
+        f"and document the new API parameters"
+        for i in range(count)
+    ]
+
+
+def single_latency(provider, calls: int) -> dict:
+    latencies = []
+    for text in texts(calls):
+        start = time.perf_counter()
+        provider.embed([text])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return summarise(latencies, digits=3)
+
+
+def batch_throughput(provider, batch_size: int, calls: int) -> float:
+    inputs = texts(batch_size * calls)
+    start = time.perf_counter()
+    for i in range(calls):
+        provider.embed(inputs[i * batch_size:(i + 1) * batch_size])
+    return round(len(inputs) / (time.perf_counter() - start), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--stub-port", type=int, default=8901)
+    parser.add_argument("--stub-latency-ms", type=float, default=80.0)
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--batch-sizes", default="1,32,256")
+    args = parser.parse_args()
+
+    stub = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.embeddings_stub",
+        "--port", str(args.stub_port),
+        "--latency-ms", str(args.stub_latency_ms),
+    ])
+    try:
+        wait_until_up(f"http://127.0.0.1:{args.stub_port}/stats")
+        remote = OpenAIProvider(
+            client=OpenAI(base_url=f"http://127.0.0.1:{args.stub_port}/v1", api_key="stub")
+        )
+        providers = {"remote_stub": remote, "local": HashingProvider()}
+
+        results = {}
+        for name, provider in providers.items():
+            provider.embed(["warm up"])
+            results[name] = {
+                "single": single_latency(provider, args.calls),
+                "texts_per_second": {
+                    size: batch_throughput(provider, int(size), max(args.calls // 10, 1))
+                    for size in args.batch_sizes.split(",")
+                },
+            }
+    finally:
+        stub.terminate()
+        stub.wait()
+
+    report = {
+        "stub_latency_ms": args.stub_latency_ms,
+        "calls": args.calls,
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Local stand-in for the OpenAI embeddings API with configurable latency.
+
+Vectors are deterministic per input text (seeded from its sha256) and
+unit length, so identical texts embed identically and different texts
+get distinct vectors. Point the app at it with:
+
+    python -m benchmarks.embeddings_stub --port 8900 --latency-ms 80 --jitter-ms 20
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=stub uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import random
+from typing import List, Optional, Union
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+DEFAULT_DIMENSIONS = 1536
+
+
+class EmbeddingRequest(BaseModel):
+    model: str
+    input: Union[str, List[str]]
+    encoding_format: Optional[str] = None
+    dimensions: Optional[int] = None
+
+
+def stub_embedding(text: str, dimensions: int = DEFAULT_DIMENSIONS) -> np.ndarray:
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dimensions).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def create_app(latency_ms: float = 0.0, jitter_ms: float = 0.0) -> FastAPI:
+    app = FastAPI(title="Embeddings stub")
+    app.state.requests = 0
+
+    @app.post("/v1/embeddings")
+    async def create_embeddings(request: EmbeddingRequest):
+        app.state.requests += 1
+        delay = latency_ms + random.uniform(-jitter_ms, jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        texts = [request.input] if isinstance(request.input, str) else request.input
+        dimensions = request.dimensions or DEFAULT_DIMENSIONS
+
+        data = []
+        for index, text in enumerate(texts):
+            vector = stub_embedding(text, dimensions)
+            # The OpenAI SDK asks for base64 float32 by default
+            if request.encoding_format == "base64":
+                embedding = base64.b64encode(vector.tobytes()).decode("ascii")
+            else:
+                embedding = vector.tolist()
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+
+        tokens = sum(len(text.split()) for text in texts)
+        return {
+            "object": "list",
+            "data": data,
+            "model": request.model,
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    @app.get("/stats")
+    def stats():
+        return {"requests": app.state.requests}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(args.latency_ms, args.jitter_ms),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
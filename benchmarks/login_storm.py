@@ -0,0 +1,95 @@
+"""
+Login storm: login throughput, and what a burst of logins does to the
+latency of unrelated endpoints in the same server.
+
+Run against a live server (e.g. `uvicorn app.main:app --workers 1`):
+
+    python -m benchmarks.login_storm --base-url http://127.0.0.1:8000 --users 50 --logins 500 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+import httpx
+
+from benchmarks.common import summarise
+
+
+async def probe(client: httpx.AsyncClient, path: str, stop: asyncio.Event, interval: float):
+    """Hit an unrelated endpoint at a steady rate until `stop` is set."""
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=120) as client:
+        prefix = uuid.uuid4().hex[:8]
+        users = [
+            {"email": f"storm-{prefix}-{i}@example.com", "password": "storm123"}
+            for i in range(args.users)
+        ]
+        for credentials in users:
+            await client.post("/auth/register", json=credentials)
+
+        # Baseline latency of the unrelated endpoint with no logins running
+        stop = asyncio.Event()
+        baseline_task = asyncio.create_task(probe(client, args.probe_path, stop, args.probe_interval))
+        await asyncio.sleep(3)
+        stop.set()
+        baseline = await baseline_task
+
+        stop = asyncio.Event()
+        during_task = asyncio.create_task(probe(client, args.probe_path, stop, args.probe_interval))
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+        login_latencies = []
+        statuses = {}
+
+        async def login(i):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/auth/login", json=users[i % len(users)])
+                login_latencies.append((time.perf_counter() - start) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(login(i) for i in range(args.logins)))
+        elapsed = time.monotonic() - started
+        stop.set()
+        during = await during_task
+
+    return {
+        "logins": args.logins,
+        "concurrency": args.concurrency,
+        "login_throughput_rps": round(args.logins / elapsed, 1),
+        "login_status_codes": statuses,
+        "login_latency": summarise(login_latencies),
+        "probe_path": args.probe_path,
+        "probe_latency_idle": summarise(baseline),
+        "probe_latency_during_storm": summarise(during),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--probe-path", default="/health")
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
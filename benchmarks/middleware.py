@@ -0,0 +1,127 @@
+"""
+Request-wrapper overhead: the old @app.middleware("http") wrapper versus
+the pure ASGI RequestLoggingMiddleware, on a small JSON endpoint and on a
+streamed response.
+
+Runs in-process through httpx's ASGI transport, so the numbers isolate
+middleware cost from networking and the database.
+
+    python -m benchmarks.middleware --requests 5000
+    python -m benchmarks.middleware --requests 2000 --chunks 1000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.access_log import access_log
+from app.core.logging_middleware import RequestLoggingMiddleware, route_template
+from app.core.metrics import metrics
+
+
+async def http_middleware_wrapper(request: Request, call_next):
+    """The previous log_requests shape: same work, via call_next."""
+    start_time = time.perf_counter()
+    response = await call_next(request)
+    latency = round((time.perf_counter() - start_time) * 1000, 2)
+    metrics.record_request(
+        request.url.path,
+        latency,
+        response.status_code,
+        method=request.method,
+        route=route_template(request.scope),
+    )
+    user = getattr(request.state, "user", None)
+    access_log.log({
+        "method": request.method,
+        "path": request.url.path,
+        "status_code": response.status_code,
+        "user_id": getattr(user, "id", None),
+        "latency_ms": latency,
+    })
+    return response
+
+
+def build_app(variant: str, chunks: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    def health():
+        return {"status": "healthy"}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(
+            (b"x" * 64 + b"\n" for _ in range(chunks)),
+            media_type="text/plain",
+        )
+
+    if variant == "http":
+        app.middleware("http")(http_middleware_wrapper)
+    else:
+        app.add_middleware(RequestLoggingMiddleware)
+    return app
+
+
+async def measure(app: FastAPI, path: str, requests: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):
+            await client.get(path)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    return {"requests_per_second": round(requests / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--chunks", type=int, default=500, help="Chunks per streamed response")
+    args = parser.parse_args()
+
+    # Measure the wrappers, not stdout
+    access_log.sample_rate = 0.0
+    access_log.slow_ms = float("inf")
+
+    results = {}
+    for variant in ("http", "asgi"):
+        app = build_app(variant, args.chunks)
+        results[variant] = {
+            path: asyncio.run(measure(app, path, args.requests, args.concurrency))
+            for path in ("/health", "/stream")
+        }
+
+    report = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "stream_chunks": args.chunks,
+        "results": results,
+        "speedup": {
+            path: round(
+                results["asgi"][path]["requests_per_second"]
+                / results["http"][path]["requests_per_second"],
+                2,
+            )
+            for path in ("/health", "/stream")
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
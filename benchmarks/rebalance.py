@@ -0,0 +1,99 @@
+"""
+Backlog rebalancing: similarity matrix and capacity-constrained assignment.
+
+Synthetic mode times the in-memory steps on random embeddings (10k tasks
+x 1k users by default), where a few "generalist" resumes sit close to
+every task. It compares per-user load and mean similarity against
+nearest-resume assignment. --database does a dry run of the real
+POST /ai/rebalance code path against the configured database
+(e.g. after benchmarks.seed).
+
+    python -m benchmarks.rebalance --tasks 10000 --users 1000
+    python -m benchmarks.rebalance --database
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.services.assignment_service import normalize_rows
+from app.services.rebalance import capacities, load_summary, plan_assignment
+
+
+def synthetic(tasks: int, users: int, dim: int, generalists: int, seed: int):
+    rng = np.random.default_rng(seed)
+    task_vectors = rng.standard_normal((tasks, dim)).astype(np.float32)
+    resume_vectors = rng.standard_normal((users, dim)).astype(np.float32)
+    # Generalists: resumes near the centre of the task distribution
+    centre = task_vectors.mean(axis=0)
+    resume_vectors[:generalists] = centre + 0.05 * resume_vectors[:generalists]
+    minutes = rng.integers(15, 480, tasks).astype(np.float64)
+    return task_vectors, resume_vectors, minutes
+
+
+def run_synthetic(args) -> dict:
+    task_vectors, resume_vectors, minutes = synthetic(
+        args.tasks, args.users, args.dim, args.generalists, args.seed
+    )
+
+    start = time.perf_counter()
+    similarity = normalize_rows(task_vectors) @ normalize_rows(resume_vectors).T
+    similarity_ms = (time.perf_counter() - start) * 1000
+
+    nearest = similarity.argmax(axis=1)
+
+    start = time.perf_counter()
+    capacity = capacities(minutes, np.zeros(args.users), args.slack)
+    assignment = plan_assignment(similarity, minutes, capacity, args.candidates)
+    assign_ms = (time.perf_counter() - start) * 1000
+
+    rows = np.arange(args.tasks)
+
+    def summary(chosen):
+        return {
+            "mean_similarity": round(float(similarity[rows, chosen].mean()), 4),
+            "load_minutes": load_summary(np.bincount(chosen, weights=minutes, minlength=args.users)),
+        }
+
+    return {
+        "tasks": args.tasks,
+        "users": args.users,
+        "dim": args.dim,
+        "timings_ms": {
+            "similarity_ms": round(similarity_ms, 2),
+            "assign_ms": round(assign_ms, 2),
+        },
+        "nearest": summary(nearest),
+        "rebalanced": summary(assignment),
+    }
+
+
+def run_database() -> dict:
+    from app.db.session import SessionLocal
+    from app.services.rebalance import rebalance_backlog
+
+    with SessionLocal() as db:
+        report = rebalance_backlog(db, dry_run=True)
+    report.pop("changes")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--generalists", type=int, default=10)
+    parser.add_argument("--slack", type=float, default=0.2)
+    parser.add_argument("--candidates", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", action="store_true", help="Dry-run against the configured database")
+    args = parser.parse_args()
+
+    report = run_database() if args.database else run_synthetic(args)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Scripted load scenarios against a running (or freshly started) API, with
+throughput and p50/p95/p99 per endpoint as JSON, optionally compared
+against a stored baseline.
+
+Scenarios: login_storm, create_burst, listing, stats_polling. Users are
+the ones created by benchmarks.seed (same prefix and password).
+
+    python -m benchmarks.seed --users 200 --tasks 50000
+    python -m benchmarks.scenarios --start-server --embedding-latency-ms 80 \\
+        --output results.json --save-baseline benchmarks/baseline.json
+    python -m benchmarks.scenarios --start-server --baseline benchmarks/baseline.json
+
+Exits with status 1 when a baseline is given and throughput or p95
+regressed by more than --tolerance.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+
+import httpx
+
+from benchmarks.common import summarise, wait_until_up
+from benchmarks.seed import DEFAULT_PREFIX, SEED_PASSWORD, seeded_email
+
+SCENARIO_NAMES = ("login_storm", "create_burst", "listing", "stats_polling")
+
+
+class Recorder:
+    """Latencies and errors per endpoint label for one scenario."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, path: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+            if response.status_code >= 400:
+                self.errors[label] += 1
+        except httpx.HTTPError:
+            response = None
+            self.errors[label] += 1
+        self.latencies[label].append((time.perf_counter() - start) * 1000)
+        return response
+
+    def summary(self, elapsed: float) -> dict:
+        return {
+            label: {
+                "errors": self.errors[label],
+                "throughput_rps": round(len(latencies) / elapsed, 1),
+                **summarise(latencies),
+            }
+            for label, latencies in sorted(self.latencies.items())
+        }
+
+
+async def run_concurrently(count: int, concurrency: int, fn):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            await fn(i)
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+
+
+async def login_storm(client, recorder, context, args):
+    async def login(i):
+        credentials = context["credentials"][i % len(context["credentials"])]
+        await recorder.request(client, "POST /auth/login", "POST", "/auth/login", json=credentials)
+
+    await run_concurrently(args.requests, args.concurrency, login)
+
+
+async def create_burst(client, recorder, context, args):
+    run_id = uuid.uuid4().hex[:8]
+
+    async def create(i):
+        await recorder.request(
+            client,
+            "POST /tasks/",
+            "POST",
+            "/tasks/",
+            json={
+                "title": f"Burst task {i}",
+                "description": f"Benchmark run {run_id}: implement feature {i} end to end",
+                "total_minutes": 30 + i % 240,
+            },
+            headers=context["headers"][i % len(context["headers"])],
+        )
+
+    await run_concurrently(args.requests, args.concurrency, create)
+
+
+async def listing(client, recorder, context, args):
+    async def list_tasks(i):
+        await recorder.request(
+            client,
+            "GET /tasks/",
+            "GET",
+            "/tasks/",
+            params={"limit": args.page_size},
+            headers=context["headers"][i % len(context["headers"])],
+        )
+
+    await run_concurrently(args.requests, args.concurrency, list_tasks)
+
+
+async def stats_polling(client, recorder, context, args):
+    async def poll(i):
+        if i % 2:
+            await recorder.request(client, "GET /stats/top-users?days", "GET", "/stats/top-users", params={"limit": 10, "days": 7})
+        else:
+            await recorder.request(client, "GET /stats/top-users", "GET", "/stats/top-users", params={"limit": 10})
+
+    await run_concurrently(args.requests, args.concurrency, poll)
+
+
+SCENARIOS = {
+    "login_storm": login_storm,
+    "create_burst": create_burst,
+    "listing": listing,
+    "stats_polling": stats_polling,
+}
+
+
+async def run(args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=120) as client:
+        credentials = [
+            {"email": seeded_email(args.prefix, i), "password": SEED_PASSWORD}
+            for i in range(1, args.users + 1)
+        ]
+
+        # Tokens for the authenticated scenarios; not part of any measurement
+        headers = []
+        for credential in credentials[:args.concurrency]:
+            response = await client.post("/auth/login", json=credential)
+            response.raise_for_status()
+            headers.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+
+        context = {"credentials": credentials, "headers": headers}
+        results = {}
+        for name in args.scenarios.split(","):
+            recorder = Recorder()
+            started = time.perf_counter()
+            await SCENARIOS[name](client, recorder, context, args)
+            results[name] = recorder.summary(time.perf_counter() - started)
+
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    """Regressions of throughput or p95 beyond `tolerance` versus the baseline."""
+    regressions = []
+    for scenario, endpoints in results.items():
+        for label, current in endpoints.items():
+            previous = baseline.get("scenarios", {}).get(scenario, {}).get(label)
+            if not previous:
+                continue
+            if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{scenario} {label}: throughput {current['throughput_rps']} rps "
+                    f"< baseline {previous['throughput_rps']} rps"
+                )
+            if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{scenario} {label}: p95 {current['p95_ms']} ms "
+                    f"> baseline {previous['p95_ms']} ms"
+                )
+    return regressions
+
+
+def start_servers(args):
+    """Start the embeddings stub and the API pointed at it."""
+    stub = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.embeddings_stub",
+        "--port", str(args.stub_port),
+        "--latency-ms", str(args.embedding_latency_ms),
+        "--jitter-ms", str(args.embedding_jitter_ms),
+    ])
+    env = {
+        **os.environ,
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{args.stub_port}/v1",
+        "OPENAI_API_KEY": "stub",
+    }
+    api = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(args.port), "--workers", str(args.workers),
+            "--log-level", "warning",
+        ],
+        env=env,
+    )
+    args.base_url = f"http://127.0.0.1:{args.port}"
+    wait_until_up(f"http://127.0.0.1:{args.stub_port}/stats")
+    wait_until_up(f"{args.base_url}/health/ready")
+    return [api, stub]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--start-server", action="store_true", help="Start the API and embeddings stub locally")
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--stub-port", type=int, default=8900)
+    parser.add_argument("--embedding-latency-ms", type=float, default=50.0)
+    parser.add_argument("--embedding-jitter-ms", type=float, default=10.0)
+    parser.add_argument("--scenarios", default=",".join(SCENARIO_NAMES))
+    parser.add_argument("--users", type=int, default=200, help="Seeded users to log in as")
+    parser.add_argument("--prefix", default=DEFAULT_PREFIX)
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--output", help="Write results JSON here as well as stdout")
+    parser.add_argument("--baseline", help="Compare against this results file")
+    parser.add_argument("--save-baseline", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios.split(",")) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    servers = start_servers(args) if args.start_server else []
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "embedding_latency_ms": args.embedding_latency_ms if args.start_server else None,
+        },
+        "scenarios": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            f.write(output + "\n")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
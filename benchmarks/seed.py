@@ -0,0 +1,131 @@
+"""
+Seed a benchmark dataset: N users with distinct random resume vectors and
+M tasks spread across them and over the past year. Everything is generated
+in SQL, so a million tasks takes seconds rather than hours.
+
+All seeded users share one password and an email prefix, which is what
+scenarios log in with and what --remove deletes.
+
+    python -m benchmarks.seed --users 500 --tasks 200000
+    python -m benchmarks.seed --remove
+"""
+import argparse
+import json
+import time
+
+from sqlalchemy import text
+
+from app.core.config import EMBEDDING_DIMENSIONS
+from app.core.password_pool import pwd_context
+from app.db.session import SessionLocal, engine
+from app.services import leaderboard
+
+DEFAULT_PREFIX = "seed"
+SEED_PASSWORD = "bench123"
+
+
+def seeded_email(prefix: str, i: int) -> str:
+    return f"{prefix}-{i}@bench.example.com"
+
+
+def seed_users(connection, count: int, prefix: str = DEFAULT_PREFIX, seed: float = 0.42):
+    connection.execute(text("SELECT setseed(:seed)"), {"seed": seed})
+    connection.execute(
+        text(
+            """
+            INSERT INTO users (email, hashed_password, is_admin, resume_text, resume_embedding)
+            SELECT :prefix || '-' || g || '@bench.example.com', :hashed_password, false,
+                   'Seeded resume ' || g,
+                   ARRAY(SELECT random() - 0.5 + g * 0 FROM generate_series(1, :dim))::vector
+            FROM generate_series(1, :count) AS g
+            ON CONFLICT (email) DO NOTHING
+            """
+        ),
+        {
+            "prefix": prefix,
+            "hashed_password": pwd_context.hash(SEED_PASSWORD),
+            "dim": EMBEDDING_DIMENSIONS,
+            "count": count,
+        },
+    )
+    connection.commit()
+
+
+def seed_tasks(connection, count: int, prefix: str = DEFAULT_PREFIX):
+    connection.execute(
+        text(
+            """
+            WITH seeded AS (
+                SELECT array_agg(id ORDER BY id) AS ids
+                FROM users WHERE email LIKE :prefix || '-%@bench.example.com'
+            )
+            INSERT INTO tasks (title, description, status, total_minutes, user_id,
+                               assigned_user_id, created_at, embedding_status)
+            SELECT 'Seeded task ' || g,
+                   'Seeded description ' || g,
+                   (ARRAY['TODO', 'IN_PROGRESS', 'DONE'])[1 + g % 3],
+                   (g * 37) % 480,
+                   ids[1 + g % array_length(ids, 1)],
+                   ids[1 + (g * 7) % array_length(ids, 1)],
+                   timezone('utc', now()) - (g % 365) * interval '1 day' - g * interval '1 second',
+                   'ready'
+            FROM seeded, generate_series(1, :count) AS g
+            """
+        ),
+        {"prefix": prefix, "count": count},
+    )
+    connection.commit()
+
+
+def remove_seeded(connection, prefix: str = DEFAULT_PREFIX):
+    seeded = "SELECT id FROM users WHERE email LIKE :prefix || '-%@bench.example.com'"
+    params = {"prefix": prefix}
+    connection.execute(text(f"UPDATE tasks SET assigned_user_id = NULL WHERE assigned_user_id IN ({seeded})"), params)
+    connection.execute(text(f"DELETE FROM tasks WHERE user_id IN ({seeded})"), params)
+    connection.execute(text(f"DELETE FROM users WHERE id IN ({seeded})"), params)
+    connection.commit()
+
+
+def seed(users: int, tasks: int, prefix: str = DEFAULT_PREFIX) -> dict:
+    """Seed users and tasks, then bring the leaderboard and statistics up to date."""
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        seed_users(connection, users, prefix)
+        if tasks:
+            seed_tasks(connection, tasks, prefix)
+        connection.execute(text("ANALYZE users"))
+        connection.execute(text("ANALYZE tasks"))
+        connection.commit()
+
+    with SessionLocal() as db:
+        leaderboard.rebuild(db)
+
+    return {"users": users, "tasks": tasks, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def remove(prefix: str = DEFAULT_PREFIX):
+    with engine.connect() as connection:
+        remove_seeded(connection, prefix)
+
+    with SessionLocal() as db:
+        leaderboard.rebuild(db)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--prefix", default=DEFAULT_PREFIX)
+    parser.add_argument("--remove", action="store_true", help="Delete previously seeded data instead")
+    args = parser.parse_args()
+
+    if args.remove:
+        remove(args.prefix)
+        print(json.dumps({"removed": args.prefix}))
+        return
+
+    print(json.dumps(seed(args.users, args.tasks, args.prefix), indent=2))
+
+
+if __name__ == "__main__":
+    main()
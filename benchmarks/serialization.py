@@ -0,0 +1,90 @@
+"""
+Task listing serialisation throughput: response_model validation plus the
+standard encoder (what FastAPI does for `List[TaskResponse]`) versus the
+fast path that dumps row tuples directly.
+
+Uses synthetic rows shaped like page_owned_tasks() results, so it needs
+no database.
+
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --sizes 100,1000,10000 --repeat 20
+"""
+import argparse
+import json
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.responses import dumps, orjson, rows_as_dicts
+from app.schemas.task import TaskResponse
+
+TaskRow = namedtuple("TaskRow", list(TaskResponse.model_fields))
+
+
+def make_rows(count: int):
+    now = datetime.utcnow()
+    return [
+        TaskRow(**{
+            "title": f"Task {i}",
+            "description": f"Benchmark task number {i} with a realistic description",
+            "id": i,
+            "status": "TODO",
+            "total_minutes": i % 480,
+            "created_at": now - timedelta(minutes=i),
+            "assigned_user_id": i % 50,
+            "embedding_status": "ready",
+        })
+        for i in range(count)
+    ]
+
+
+def response_model_path(adapter, rows) -> bytes:
+    validated = adapter.validate_python(rows, from_attributes=True)
+    content = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(adapter, rows) -> bytes:
+    return dumps(rows_as_dicts(rows))
+
+
+def measure(fn, adapter, rows, repeat: int) -> dict:
+    fn(adapter, rows)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = fn(adapter, rows)
+    elapsed = (time.perf_counter() - started) / repeat
+    return {
+        "ms_per_response": round(elapsed * 1000, 3),
+        "rows_per_second": round(len(rows) / elapsed),
+        "bytes": len(body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    adapter = TypeAdapter(List[TaskResponse])
+    results = {}
+    for size in (int(s) for s in args.sizes.split(",")):
+        rows = make_rows(size)
+        baseline = measure(response_model_path, adapter, rows, args.repeat)
+        fast = measure(fast_path, adapter, rows, args.repeat)
+        results[size] = {
+            "response_model": baseline,
+            "fast": fast,
+            "speedup": round(baseline["ms_per_response"] / fast["ms_per_response"], 2),
+        }
+
+    print(json.dumps({"encoder": "orjson" if orjson else "json", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Start-up cost: `import app.main` (from python -X importtime) and the
+startup hook, each in a fresh interpreter.
+
+Reports the median cumulative import time over --runs, the modules with
+the largest self time, and how long the startup hook blocks. Exits with
+status 1 when the median import time exceeds --budget-ms (the same
+budget tests/test_startup.py enforces).
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --module app.routers.tasks --top 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "2000"))
+
+STARTUP_HOOK = """
+import asyncio, json, time
+from app.main import app
+start = time.perf_counter()
+asyncio.run(app.router.startup())
+print(json.dumps({"startup_hook_ms": round((time.perf_counter() - start) * 1000, 2)}))
+"""
+
+
+def parse_importtime(stderr: str):
+    """{module: (self_us, cumulative_us)} from `python -X importtime` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def import_profile(module: str):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def startup_hook_ms():
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_HOOK], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])["startup_hook_ms"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules (by self time) to list")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--skip-startup-hook", action="store_true", help="Only measure imports")
+    args = parser.parse_args()
+
+    profiles = [import_profile(args.module) for _ in range(args.runs)]
+    totals = [profile[args.module][1] / 1000 for profile in profiles]
+    median_ms = statistics.median(totals)
+
+    # Per-module figures from the run closest to the median
+    profile = min(profiles, key=lambda p: abs(p[args.module][1] / 1000 - median_ms))
+    slowest = sorted(profile.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+
+    report = {
+        "module": args.module,
+        "runs": args.runs,
+        "import_ms": {
+            "median": round(median_ms, 2),
+            "min": round(min(totals), 2),
+            "max": round(max(totals), 2),
+        },
+        "budget_ms": args.budget_ms,
+        "modules_imported": len(profile),
+        "slowest_self_ms": {name: round(self_us / 1000, 2) for name, (self_us, _) in slowest},
+    }
+    if args.module == "app.main" and not args.skip_startup_hook:
+        report["startup_hook_ms"] = startup_hook_ms()
+
+    print(json.dumps(report, indent=2))
+    if median_ms > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
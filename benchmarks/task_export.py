@@ -0,0 +1,137 @@
+"""
+Streaming task export: time-to-first-byte, total time and the server's
+peak RSS while exporting a large task table.
+
+Seeds `--tasks` rows for a fresh benchmark user (generated in SQL), starts
+a uvicorn server, then downloads `GET /tasks/export` in each format.
+Peak RSS is read from /proc, so this needs Linux.
+
+    python -m benchmarks.task_export --tasks 1000000
+    python -m benchmarks.task_export --tasks 200000 --formats csv --keep
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from app.db.session import DATABASE_URL
+from benchmarks.common import wait_until_up
+
+
+def memory_kb(pid: int) -> dict:
+    """Current (VmRSS) and peak (VmHWM) resident set size of a process."""
+    values = {}
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                values[key] = int(value.split()[0])
+    return values
+
+
+def seed_tasks(connection, user_id: int, count: int):
+    connection.execute(
+        text(
+            """
+            INSERT INTO tasks (title, description, status, total_minutes, user_id, created_at)
+            SELECT 'Export task ' || g,
+                   'Seeded for the export benchmark, row ' || g,
+                   'TODO',
+                   g % 480,
+                   :user_id,
+                   now() - g * interval '1 second'
+            FROM generate_series(1, :count) AS g
+            """
+        ),
+        {"user_id": user_id, "count": count},
+    )
+    connection.commit()
+
+
+def download(client: httpx.Client, fmt: str, headers: dict) -> dict:
+    start = time.perf_counter()
+    ttfb = None
+    size = 0
+    lines = 0
+
+    with client.stream("GET", "/tasks/export", params={"format": fmt}, headers=headers) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes():
+            if ttfb is None:
+                ttfb = time.perf_counter() - start
+            size += len(chunk)
+            lines += chunk.count(b"\n")
+
+    return {
+        "ttfb_ms": round(ttfb * 1000, 2) if ttfb is not None else None,
+        "total_s": round(time.perf_counter() - start, 2),
+        "bytes": size,
+        "lines": lines,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--formats", default="ndjson,csv")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded tasks afterwards")
+    args = parser.parse_args()
+
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(args.port), "--workers", "1", "--log-level", "warning",
+        ],
+        env=os.environ.copy(),
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    engine = create_engine(DATABASE_URL)
+    user_id = None
+
+    try:
+        wait_until_up(f"{base_url}/health/ready")
+        with httpx.Client(base_url=base_url, timeout=None) as client:
+            credentials = {"email": f"export-{uuid.uuid4().hex[:8]}@example.com", "password": "bench123"}
+            client.post("/auth/register", json=credentials).raise_for_status()
+            token = client.post("/auth/login", json=credentials).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            user_id = client.get("/me", headers=headers).json()["id"]
+
+            with engine.connect() as connection:
+                seed_start = time.perf_counter()
+                seed_tasks(connection, user_id, args.tasks)
+                seed_seconds = time.perf_counter() - seed_start
+
+            baseline = memory_kb(server.pid)
+            results = {}
+            for fmt in args.formats.split(","):
+                results[fmt] = download(client, fmt, headers)
+                results[fmt]["server_peak_rss_mb"] = round(memory_kb(server.pid)["VmHWM"] / 1024, 1)
+
+        report = {
+            "tasks": args.tasks,
+            "seed_s": round(seed_seconds, 2),
+            "server_rss_before_mb": round(baseline["VmRSS"] / 1024, 1),
+            "results": results,
+        }
+        print(json.dumps(report, indent=2))
+    finally:
+        server.terminate()
+        server.wait()
+        if user_id is not None and not args.keep:
+            with engine.connect() as connection:
+                connection.execute(text("DELETE FROM tasks WHERE user_id = :user_id"), {"user_id": user_id})
+                connection.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": user_id})
+                connection.commit()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
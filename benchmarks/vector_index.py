@@ -0,0 +1,104 @@
+"""
+Recall-vs-latency benchmark for the resume-embedding ANN index.
+
+Compares the HNSW index used by auto-assignment against the exact
+(sequential scan) nearest-neighbour query for a range of ef_search values.
+
+    python -m benchmarks.vector_index --queries 200 --k 10 --ef-search 10,40,100
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.db.session import engine
+from benchmarks.common import summarise
+
+NEAREST_USERS = text(
+    "SELECT id FROM users "
+    "WHERE resume_embedding IS NOT NULL "
+    "ORDER BY resume_embedding <=> CAST(:query AS vector) "
+    "LIMIT :k"
+)
+
+
+def random_vector(dim: int):
+    return [random.gauss(0.0, 1.0) for _ in range(dim)]
+
+
+def run_queries(connection, queries, k, settings):
+    """Run every query inside its own transaction with `settings` applied."""
+    results = []
+    latencies = []
+
+    for query in queries:
+        with connection.begin():
+            for name, value in settings.items():
+                connection.execute(text(f"SET LOCAL {name} = {value}"))
+
+            start = time.perf_counter()
+            rows = connection.execute(NEAREST_USERS, {"query": query, "k": k})
+            results.append([row.id for row in rows])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    return results, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--ef-search", default="10,40,100,200")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    queries = [str(random_vector(args.dim)) for _ in range(args.queries)]
+
+    with engine.connect() as connection:
+        user_count = connection.execute(
+            text("SELECT count(*) FROM users WHERE resume_embedding IS NOT NULL")
+        ).scalar()
+        connection.commit()
+        if not user_count:
+            raise SystemExit("No users with resume embeddings to benchmark against")
+
+        exact, exact_latencies = run_queries(
+            connection,
+            queries,
+            args.k,
+            {"enable_indexscan": "off", "enable_bitmapscan": "off"},
+        )
+
+        report = {
+            "users": user_count,
+            "k": args.k,
+            "exact": summarise(exact_latencies, digits=3),
+            "hnsw": [],
+        }
+
+        for ef_search in [int(v) for v in args.ef_search.split(",")]:
+            approx, latencies = run_queries(
+                connection, queries, args.k, {"hnsw.ef_search": ef_search}
+            )
+            recall = statistics.fmean(
+                len(set(a) & set(e)) / max(len(e), 1)
+                for a, e in zip(approx, exact)
+            )
+            report["hnsw"].append(
+                {
+                    "ef_search": ef_search,
+                    "recall_at_k": round(recall, 4),
+                    **summarise(latencies, digits=3),
+                }
+            )
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Embedding storage options: dimensions x column type (vector / halfvec).
+
+For every combination the same vectors are loaded into a scratch table
+and the benchmark reports table and HNSW index size, index build time,
+nearest-neighbour query latency, and how often the top-1 match (the
+user a task would be assigned to) agrees with exact full-precision
+search. "exact_agreement" isolates the storage loss from the ANN index.
+
+Reduced dimensions are the leading components renormalised, which is what
+text-embedding-3 returns when asked for fewer `dimensions`. Vectors come
+from users.resume_embedding (corpus) and tasks.embedding (queries), or are
+synthetic with --synthetic or when the database has none.
+
+    python -m benchmarks.vector_storage --dimensions 1536,768,256 --storage vector,halfvec
+    python -m benchmarks.vector_storage --synthetic --corpus 20000 --queries 500
+"""
+import argparse
+import io
+import json
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+from app.db.session import engine
+from benchmarks.common import summarise
+
+
+def parse_vectors(rows):
+    return np.array([json.loads(row[0]) for row in rows], dtype=np.float32)
+
+
+def load_vectors(connection, corpus: int, queries: int):
+    users = connection.execute(
+        text(
+            "SELECT resume_embedding::text FROM users "
+            "WHERE resume_embedding IS NOT NULL ORDER BY id LIMIT :n"
+        ),
+        {"n": corpus},
+    ).all()
+    tasks = connection.execute(
+        text(
+            "SELECT embedding::text FROM tasks "
+            "WHERE embedding IS NOT NULL ORDER BY id DESC LIMIT :n"
+        ),
+        {"n": queries},
+    ).all()
+    connection.commit()
+    if not users or not tasks:
+        return None, None
+    return parse_vectors(users), parse_vectors(tasks)
+
+
+def synthetic_vectors(corpus: int, queries: int, dim: int, seed: int):
+    """
+    Gaussian vectors whose per-dimension scale decays, so (like Matryoshka
+    embeddings) the leading dimensions carry most of the signal. Queries
+    are noisy copies of random corpus rows so top-1 is well defined.
+    """
+    rng = np.random.default_rng(seed)
+    scale = 1.0 / np.sqrt(np.arange(1, dim + 1, dtype=np.float32))
+    base = rng.standard_normal((corpus, dim)).astype(np.float32) * scale
+    picks = rng.integers(0, corpus, queries)
+    noise = rng.standard_normal((queries, dim)).astype(np.float32) * scale
+    return base, base[picks] + 0.8 * noise
+
+
+def reduce(vectors: np.ndarray, dimensions: int) -> np.ndarray:
+    reduced = vectors[:, :dimensions]
+    norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+    return reduced / np.where(norms > 0, norms, 1)
+
+
+def exact_top1(corpus: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    return (reduce(queries, queries.shape[1]) @ reduce(corpus, corpus.shape[1]).T).argmax(axis=1)
+
+
+def vector_literal(vector) -> str:
+    return "[" + ",".join(repr(float(x)) for x in vector) + "]"
+
+
+def load_table(connection, table: str, column_type: str, vectors: np.ndarray):
+    connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    connection.execute(
+        text(f"CREATE TEMPORARY TABLE {table} (id integer PRIMARY KEY, embedding {column_type})")
+    )
+    buffer = io.StringIO()
+    for i, vector in enumerate(vectors):
+        buffer.write(f"{i}\t{vector_literal(vector)}\n")
+    buffer.seek(0)
+    cursor = connection.connection.cursor()
+    cursor.copy_expert(f"COPY {table} (id, embedding) FROM STDIN", buffer)
+    cursor.close()
+    connection.commit()
+
+
+def measure(connection, storage: str, dimensions: int, corpus, queries, reference, ef_search: int):
+    table = f"bench_{storage}_{dimensions}"
+    column_type = f"{storage}({dimensions})"
+    corpus = reduce(corpus, dimensions)
+    queries = reduce(queries, dimensions)
+
+    load_table(connection, table, column_type, corpus)
+
+    start = time.perf_counter()
+    connection.execute(
+        text(
+            f"CREATE INDEX {table}_hnsw ON {table} USING hnsw (embedding {storage}_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+    )
+    connection.commit()
+    build_seconds = time.perf_counter() - start
+    connection.execute(text(f"ANALYZE {table}"))
+    connection.commit()
+
+    sizes = connection.execute(
+        text("SELECT pg_table_size(:table), pg_relation_size(:index)"),
+        {"table": table, "index": f"{table}_hnsw"},
+    ).one()
+
+    nearest = text(
+        f"SELECT id FROM {table} ORDER BY embedding <=> CAST(:query AS {column_type}) LIMIT 1"
+    )
+    connection.execute(text(f"SET hnsw.ef_search = {int(ef_search)}"))
+    latencies = []
+    matches = []
+    for query in queries:
+        start = time.perf_counter()
+        matches.append(connection.execute(nearest, {"query": vector_literal(query)}).scalar())
+        latencies.append((time.perf_counter() - start) * 1000)
+    connection.commit()
+
+    # The same search without the index, on the values as stored
+    stored = corpus.astype(np.float16).astype(np.float32) if storage == "halfvec" else corpus
+    exact = exact_top1(stored, queries)
+
+    connection.execute(text(f"DROP TABLE {table}"))
+    connection.commit()
+
+    return {
+        "storage": storage,
+        "dimensions": dimensions,
+        "table_bytes": sizes[0],
+        "index_bytes": sizes[1],
+        "index_build_seconds": round(build_seconds, 3),
+        "query_latency": summarise(latencies, digits=3),
+        "agreement": round(float(np.mean(np.array(matches) == reference)), 4),
+        "exact_agreement": round(float(np.mean(exact == reference)), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dimensions", default="1536,768,512,256")
+    parser.add_argument("--storage", default="vector,halfvec")
+    parser.add_argument("--corpus", type=int, default=10_000, help="Resume vectors to index")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--ef-search", type=int, default=40)
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--synthetic-dim", type=int, default=1536)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with engine.connect() as connection:
+        corpus = queries = None
+        if not args.synthetic:
+            corpus, queries = load_vectors(connection, args.corpus, args.queries)
+        source = "database"
+        if corpus is None:
+            source = "synthetic"
+            corpus, queries = synthetic_vectors(args.corpus, args.queries, args.synthetic_dim, args.seed)
+
+        # Full-precision, full-size exact search is the reference assignment
+        reference = exact_top1(corpus, queries)
+        full_dim = corpus.shape[1]
+
+        results = [
+            measure(connection, storage, dimensions, corpus, queries, reference, args.ef_search)
+            for dimensions in [int(v) for v in args.dimensions.split(",")]
+            if dimensions <= full_dim
+            for storage in args.storage.split(",")
+        ]
+
+    report = {
+        "source": source,
+        "corpus": len(corpus),
+        "queries": len(queries),
+        "full_dimensions": full_dim,
+        "ef_search": args.ef_search,
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
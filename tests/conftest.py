@@ -2,6 +2,9 @@ import pytest
 from app.db.session import engine, Base
 import app.models.user
 import app.models.task
+import app.models.embedding_cache
+import app.models.leaderboard
+import app.models.daily_plan
 
 @pytest.fixture(scope="session", autouse=True)
 def create_test_tables():
@@ -0,0 +1,23 @@
+import logging
+import queue
+
+from app.core.access_log import AccessLog, DroppingQueueHandler
+
+
+def test_sampling_always_keeps_errors_and_slow_requests():
+    log = AccessLog(queue_size=10, sample_rate=0.0, slow_ms=500)
+
+    assert not log.should_log(200, 12.0)
+    assert log.should_log(404, 12.0)
+    assert log.should_log(200, 750.0)
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord("sprintsync.access", logging.INFO, __file__, 0, {"path": "/"}, None, None)
+
+    handler.handle(record)
+    handler.handle(record)
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
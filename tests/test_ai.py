@@ -1,18 +1,27 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
 from fastapi.testclient import TestClient
+from app.core.config import EMBEDDING_DIMENSIONS
+from app.db.session import SessionLocal
 from app.main import app
+from app.models.task import Task
+from app.models.user import User
+from app.services import leaderboard
+from app.services.plan_cache import FRESH, MISS, STALE, plan_state
 
 client = TestClient(app)
 
 
-def get_token():
+def get_token(email="aiuser@test.com"):
     client.post(
         "/auth/register",
-        json={"email": "aiuser@test.com", "password": "test123"}
+        json={"email": email, "password": "test123"}
     )
 
     response = client.post(
         "/auth/login",
-        json={"email": "aiuser@test.com", "password": "test123"}
+        json={"email": email, "password": "test123"}
     )
 
     return response.json()["access_token"]
@@ -28,4 +37,105 @@ def test_ai_stub_response():
 
     assert response.status_code == 200
     assert "daily_plan" in response.json()
-    assert isinstance(response.json()["daily_plan"], list)
\ No newline at end of file
+    assert isinstance(response.json()["daily_plan"], list)
+
+
+def test_suggest_caches_plan_until_tasks_change():
+    headers = {"Authorization": f"Bearer {get_token('planuser@test.com')}"}
+    client.post("/tasks/", json={"title": "Plan me"}, headers=headers)
+
+    first = client.get("/ai/suggest", headers=headers)
+    second = client.get("/ai/suggest", headers=headers)
+    assert first.headers["X-Plan-Cache"] == MISS
+    assert second.headers["X-Plan-Cache"] == FRESH
+    assert second.json() == first.json()
+
+    client.post("/tasks/", json={"title": "Plan me too"}, headers=headers)
+
+    # The old plan is served while it is rebuilt in the background
+    third = client.get("/ai/suggest", headers=headers)
+    assert third.headers["X-Plan-Cache"] == STALE
+    assert third.json() == first.json()
+
+
+def test_plan_state_expires_by_version_and_age():
+    now = datetime.now(timezone.utc)
+
+    def row(plan_version, age_seconds):
+        return SimpleNamespace(
+            task_set_version=3,
+            plan_version=plan_version,
+            plan={"daily_plan": []},
+            generated_at=now - timedelta(seconds=age_seconds),
+        )
+
+    assert plan_state(None) == MISS
+    assert plan_state(row(3, 60), now) == FRESH
+    assert plan_state(row(2, 60), now) == STALE
+    assert plan_state(row(3, 10 ** 7), now) == MISS
+
+
+def test_rebalance_requires_admin():
+    token = get_token()
+
+    response = client.post(
+        "/ai/rebalance",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 403
+
+
+def unit_vector(axis: int):
+    vector = [0.0] * EMBEDDING_DIMENSIONS
+    vector[axis] = 1.0
+    return vector
+
+
+def test_rebalance_moves_only_todo_tasks_and_updates_leaderboard():
+    get_token("rebalance-admin@test.com")
+    with SessionLocal() as db:
+        admin = db.query(User).filter(User.email == "rebalance-admin@test.com").one()
+        admin.is_admin = True
+        # Two specialists; every task below is closest to `expert`
+        busy = User(email="rebalance-busy@test.com", hashed_password="x", resume_embedding=unit_vector(0))
+        expert = User(email="rebalance-expert@test.com", hashed_password="x", resume_embedding=unit_vector(1))
+        db.add_all([busy, expert])
+        db.flush()
+        # Busy's started work dwarfs everyone's share, so busy has no room
+        # left and expert has plenty, however many other users exist
+        started = Task(
+            title="Started", status="IN_PROGRESS", total_minutes=1_000_000, user_id=busy.id,
+            assigned_user_id=busy.id, embedding=unit_vector(1), embedding_status="ready",
+        )
+        waiting = Task(
+            title="Waiting", status="TODO", total_minutes=30, user_id=busy.id,
+            assigned_user_id=busy.id, embedding=unit_vector(1), embedding_status="ready",
+        )
+        db.add_all([started, waiting])
+        db.commit()
+        started_id, waiting_id = started.id, waiting.id
+        busy_id, expert_id = busy.id, expert.id
+
+    headers = {"Authorization": f"Bearer {get_token('rebalance-admin@test.com')}"}
+
+    preview = client.post("/ai/rebalance", headers=headers).json()
+    assert preview["dry_run"] is True
+    assert started_id not in {change["task_id"] for change in preview["changes"]}
+
+    report = client.post("/ai/rebalance?dry_run=false", headers=headers).json()
+    assert report["dry_run"] is False
+    changes = {change["task_id"]: change for change in report["changes"]}
+    assert started_id not in changes
+    assert changes[waiting_id] == {
+        "task_id": waiting_id, "from_user_id": busy_id, "to_user_id": expert_id, "total_minutes": 30,
+    }
+
+    with SessionLocal() as db:
+        assigned = dict(
+            db.query(Task.id, Task.assigned_user_id).filter(Task.id.in_([started_id, waiting_id]))
+        )
+        assert assigned[started_id] == busy_id
+        assert assigned[waiting_id] == expert_id
+        # The bulk UPDATE applied matching leaderboard deltas
+        assert leaderboard.check(db) == []
@@ -0,0 +1,42 @@
+import numpy as np
+
+from app.services.assignment_service import ResumeMatrix
+from app.services.rebalance import capacities, plan_assignment
+
+
+def test_resume_matrix_top_k_and_incremental_upsert():
+    matrix = ResumeMatrix(dim=3)
+    matrix.loaded_at = 0.0
+
+    matrix.upsert(1, [1.0, 0.0, 0.0])
+    matrix.upsert(2, [0.0, 2.0, 0.0])
+
+    assert matrix.top_k([0.1, 0.9, 0.0], k=1)[0][0] == 2
+
+    # Updating a resume replaces the user's row instead of adding one,
+    # leaving snapshots already handed to readers untouched
+    _, before = matrix._snapshot
+    matrix.upsert(2, [0.0, 0.0, 1.0])
+    assert len(matrix) == 2
+    assert before[1].tolist() == [0.0, 1.0, 0.0]
+    assert matrix.top_k([0.0, 0.0, 5.0], k=2)[0] == (2, 1.0)
+    assert matrix.best_matches(np.eye(3, dtype=np.float32)[:2]) == [1, 1]
+
+
+def test_plan_assignment_spreads_work_within_capacity():
+    # Every task's nearest resume is user 0, the generalist
+    similarity = np.array([
+        [0.95, 0.8, 0.1],
+        [0.94, 0.7, 0.2],
+        [0.93, 0.1, 0.6],
+        [0.92, 0.2, 0.5],
+    ])
+    minutes = np.array([60.0, 60.0, 60.0, 60.0])
+
+    unconstrained = plan_assignment(similarity, minutes, np.full(3, 1e9), candidates=3)
+    assert list(unconstrained) == [0, 0, 0, 0]
+
+    # Even share is 80 minutes; with 50% slack each user takes at most two tasks
+    capacity = capacities(minutes, np.zeros(3), slack=0.5)
+    assignment = plan_assignment(similarity, minutes, capacity, candidates=3)
+    assert list(assignment) == [0, 0, 2, 2]
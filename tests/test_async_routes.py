@@ -0,0 +1,92 @@
+"""
+The DB_MODE=async app (app/routers/aio). DB_MODE is read when app.main is
+imported, so the requests run in a child interpreter against the same
+database. Skipped unless the `async` extra (asyncpg) is installed.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+SCRIPT = """
+import json
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+from app.core.config import BCRYPT_ROUNDS
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.user import User
+
+credentials = {"email": "asyncuser@test.com", "password": "test123"}
+results = {}
+
+# Hash made with another bcrypt cost, upgraded by the async login route
+with SessionLocal() as db:
+    db.add(User(
+        email="asyncoldhash@test.com",
+        hashed_password=CryptContext(schemes=["bcrypt"]).hash("test123", rounds=4),
+    ))
+    db.commit()
+
+# One portal (event loop) for every request: asyncpg connections are tied to it
+with TestClient(app) as client:
+    results["register"] = client.post("/auth/register", json=credentials).status_code
+    login = client.post("/auth/login", json=credentials)
+    results["login"] = login.status_code
+    headers = {"Authorization": "Bearer " + login.json()["access_token"]}
+
+    results["me"] = client.get("/me", headers=headers).json()["email"]
+
+    created = client.post("/tasks/", json={"title": "Async task", "total_minutes": 15}, headers=headers)
+    results["create"] = created.status_code
+    task_id = created.json()["id"]
+
+    results["list"] = [task["id"] for task in client.get("/tasks/", headers=headers).json()]
+    results["get"] = client.get(f"/tasks/{task_id}", headers=headers).json()["title"]
+
+    bulk = client.post(
+        "/tasks/bulk",
+        content="title,total_minutes\\nAsync import,30\\n",
+        headers={**headers, "Content-Type": "text/csv"},
+    )
+    results["bulk"] = bulk.json()
+
+    export = client.get("/tasks/export", headers=headers)
+    results["export"] = sorted(json.loads(line)["title"] for line in export.text.splitlines())
+
+    results["rehash_login"] = client.post(
+        "/auth/login", json={"email": "asyncoldhash@test.com", "password": "test123"}
+    ).status_code
+
+with SessionLocal() as db:
+    stored = db.query(User).filter(User.email == "asyncoldhash@test.com").one().hashed_password
+results["rehashed_cost"] = int(stored.split("$")[2])
+results["bcrypt_rounds"] = BCRYPT_ROUNDS
+
+print(json.dumps(results))
+"""
+
+
+def test_async_app_round_trip():
+    env = dict(os.environ, DB_MODE="async", EMBEDDING_MODE="sync")
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT], capture_output=True, text=True, env=env
+    )
+    assert result.returncode == 0, result.stderr
+
+    results = json.loads(result.stdout.strip().splitlines()[-1])
+    assert results["register"] == 200
+    assert results["login"] == 200
+    assert results["me"] == "asyncuser@test.com"
+    assert results["create"] == 200
+    assert len(results["list"]) == 1
+    assert results["get"] == "Async task"
+    # Sync bulk import and export routes mounted on the async router
+    assert results["bulk"] == {"imported": 1, "failed": 0, "errors": []}
+    assert results["export"] == ["Async import", "Async task"]
+    assert results["rehash_login"] == 200
+    assert results["rehashed_cost"] == results["bcrypt_rounds"]
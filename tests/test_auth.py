@@ -1,5 +1,10 @@
 from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+from app.core.config import BCRYPT_ROUNDS
+from app.core.password_pool import PasswordPoolBusy, password_pool
+from app.db.session import SessionLocal
 from app.main import app
+from app.models.user import User
 
 client = TestClient(app)
 
@@ -18,4 +23,66 @@ def test_login_success():
     )
 
     assert response.status_code == 200
-    assert "access_token" in response.json()
\ No newline at end of file
+    assert "access_token" in response.json()
+
+def test_current_user_lookup_is_cached():
+    client.post(
+        "/auth/register",
+        json={"email": "cacheduser@test.com", "password": "test123"}
+    )
+    token = client.post(
+        "/auth/login",
+        json={"email": "cacheduser@test.com", "password": "test123"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/me", headers=headers)
+    hits_before = client.get("/metrics").json()["auth_cache"]["principal"]["hits"]
+    second = client.get("/me", headers=headers)
+    hits_after = client.get("/metrics").json()["auth_cache"]["principal"]["hits"]
+
+    assert first.json() == second.json()
+    assert first.json()["email"] == "cacheduser@test.com"
+    assert hits_after == hits_before + 1
+
+
+def test_login_returns_503_when_password_pool_is_full(monkeypatch):
+    client.post(
+        "/auth/register",
+        json={"email": "busyuser@test.com", "password": "test123"}
+    )
+
+    def busy(*args):
+        raise PasswordPoolBusy()
+
+    async def busy_async(*args):
+        raise PasswordPoolBusy()
+
+    monkeypatch.setattr(password_pool, "verify", busy)
+    monkeypatch.setattr(password_pool, "verify_async", busy_async)
+
+    response = client.post(
+        "/auth/login",
+        json={"email": "busyuser@test.com", "password": "test123"}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+def test_login_rehashes_password_made_with_another_cost():
+    cheap_hash = CryptContext(schemes=["bcrypt"]).hash("test123", rounds=4)
+    assert cheap_hash.startswith("$2b$04$")
+    with SessionLocal() as db:
+        db.add(User(email="oldhash@test.com", hashed_password=cheap_hash))
+        db.commit()
+
+    response = client.post(
+        "/auth/login",
+        json={"email": "oldhash@test.com", "password": "test123"}
+    )
+    assert response.status_code == 200
+
+    with SessionLocal() as db:
+        stored = db.query(User).filter(User.email == "oldhash@test.com").one().hashed_password
+    assert stored != cheap_hash
+    assert stored.split("$")[2] == f"{BCRYPT_ROUNDS:02d}"
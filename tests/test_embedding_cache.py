@@ -0,0 +1,24 @@
+from app.services.embedding_cache import EmbeddingCache, cache_key
+
+
+def test_cache_key_ignores_whitespace_but_not_model():
+    assert cache_key("m", "  fix  login\nbug ") == cache_key("m", "fix login bug")
+    assert cache_key("m", "fix login bug") != cache_key("other", "fix login bug")
+
+
+def test_lru_tier_counts_hits_misses_and_evictions():
+    cache = EmbeddingCache(max_size=2, persist=False)
+
+    assert cache.get("a") is None
+    cache.put("a", "m", [1.0, 0.0])
+    cache.put("b", "m", [0.0, 1.0])
+    assert list(cache.get("a")) == [1.0, 0.0]
+
+    # "b" is now least recently used and gets evicted
+    cache.put("c", "m", [1.0, 1.0])
+    assert cache.get("b") is None
+
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["evictions"] == 1
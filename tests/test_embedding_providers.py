@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.embedding_providers import HashingProvider, OpenAIProvider
+
+
+def test_hashing_provider_is_deterministic_and_normalised():
+    provider = HashingProvider(dimensions=256)
+    texts = ["Build the login page", "Build the login page", "Tune Postgres autovacuum"]
+
+    vectors = np.asarray(provider.embed(texts))
+
+    assert vectors.shape == (3, 256)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+    assert np.allclose(vectors[0], vectors[1])
+    assert np.allclose(provider.embed([texts[2]])[0], vectors[2])
+
+
+def test_hashing_provider_keeps_similar_texts_close():
+    provider = HashingProvider(dimensions=256)
+    base, similar, unrelated = np.asarray(provider.embed([
+        "Add JWT authentication to the login endpoint",
+        "Add JWT authentication to the signup endpoint",
+        "Migrate nightly reports to the data warehouse",
+    ]))
+
+    assert base @ similar > base @ unrelated
+
+
+def test_hashing_provider_token_cache_stays_bounded():
+    provider = HashingProvider(dimensions=64, cache_size=16)
+    text = " ".join(f"word{i}" for i in range(200))
+
+    first = provider.embed([text])[0]
+
+    # 200 unigrams + 199 bigrams went through a 16-entry cache
+    assert provider._direction.cache_info().currsize == 16
+    # Evicted directions are regenerated identically
+    assert np.allclose(provider.embed([text])[0], first)
+
+
+class RecordingEmbeddings:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(data=[
+            SimpleNamespace(index=i, embedding=[0.0] * kwargs.get("dimensions", 1536))
+            for i in range(len(kwargs["input"]))
+        ])
+
+
+def test_openai_provider_requests_reduced_dimensions():
+    embeddings = RecordingEmbeddings()
+    client = SimpleNamespace(embeddings=embeddings)
+
+    full = OpenAIProvider(dimensions=1536, client=client)
+    reduced = OpenAIProvider(dimensions=256, client=client)
+
+    assert len(full.embed(["a"])[0]) == 1536
+    assert len(reduced.embed(["a"])[0]) == 256
+    assert "dimensions" not in embeddings.calls[0]
+    assert embeddings.calls[1]["dimensions"] == 256
+    # Cached vectors of different sizes must never be mixed up
+    assert full.cache_namespace != reduced.cache_namespace
@@ -0,0 +1,66 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.embedding_service import EmbeddingDispatcher
+
+
+def test_dispatcher_batches_and_coalesces_concurrent_requests():
+    calls = []
+    release = threading.Event()
+
+    def embed_batch(texts):
+        release.wait(5)
+        calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    dispatcher = EmbeddingDispatcher(window_ms=50, max_batch=8, concurrency=2, embed_batch=embed_batch)
+    texts = ["a", "bb", "a", "ccc", "bb"]
+    with ThreadPoolExecutor(len(texts)) as pool:
+        futures = [pool.submit(dispatcher.submit, text) for text in texts]
+        shared = [future.result() for future in futures]
+        release.set()
+        results = [future.result(timeout=5) for future in shared]
+
+    assert results == [[1.0], [2.0], [1.0], [3.0], [2.0]]
+    # Duplicates joined the queued request instead of being sent again
+    assert sorted(text for batch in calls for text in batch) == ["a", "bb", "ccc"]
+
+    stats = dispatcher.stats()
+    assert stats["requests"] == 5
+    assert stats["coalesced"] == 2
+    assert stats["largest_batch_size"] <= 8
+    dispatcher.close()
+
+
+def test_dispatcher_sends_full_batches_without_waiting_for_the_window():
+    dispatcher = EmbeddingDispatcher(
+        window_ms=60_000, max_batch=2, concurrency=1,
+        embed_batch=lambda texts: [[1.0] for _ in texts],
+    )
+
+    futures = [dispatcher.submit(text) for text in ("x", "y")]
+
+    assert [future.result(timeout=5) for future in futures] == [[1.0], [1.0]]
+    assert dispatcher.stats()["batches"] == 1
+    dispatcher.close()
+
+
+def test_dispatcher_embeds_after_close_without_holding_the_lock():
+    started = threading.Event()
+    release = threading.Event()
+
+    def embed_batch(texts):
+        started.set()
+        release.wait(5)
+        return [[1.0] for _ in texts]
+
+    dispatcher = EmbeddingDispatcher(window_ms=50, max_batch=8, concurrency=1, embed_batch=embed_batch)
+    dispatcher.close()
+
+    with ThreadPoolExecutor(1) as pool:
+        late = pool.submit(dispatcher.submit, "late")
+        assert started.wait(5)
+        # The direct call is still running, yet the dispatcher stays usable
+        assert dispatcher.stats()["requests"] == 0
+        release.set()
+        assert late.result(timeout=5).result() == [1.0]
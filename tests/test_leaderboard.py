@@ -0,0 +1,42 @@
+import json
+
+from app.core.responses import dumps, rows_as_dicts
+from app.db.session import SessionLocal
+from app.models.task import Task
+from app.models.user import User
+from app.repositories import stats as stats_repo
+from app.services import leaderboard
+
+
+def test_leaderboard_follows_task_changes():
+    db = SessionLocal()
+    try:
+        first = User(email="leader-a@test.com", hashed_password="x")
+        second = User(email="leader-b@test.com", hashed_password="x")
+        db.add_all([first, second])
+        db.commit()
+
+        task = Task(title="Ranked", user_id=first.id, assigned_user_id=first.id, total_minutes=30)
+        db.add(task)
+        db.commit()
+
+        task.total_minutes = 90
+        db.commit()
+        task.assigned_user_id = second.id
+        db.commit()
+
+        top = {row.id: row.total_minutes for row in stats_repo.top_users(db, limit=100)}
+        assert top[second.id] == 90
+        assert first.id not in top
+        windowed = stats_repo.top_users(db, limit=100, days=1)
+        assert windowed[0].total_minutes >= 90
+        # SUM() comes back as NUMERIC; the fast serialiser must still encode it
+        assert json.loads(dumps(rows_as_dicts(windowed)))[0]["total_minutes"] >= 90
+        assert leaderboard.check(db) == []
+
+        db.delete(task)
+        db.commit()
+        assert second.id not in {row.id for row in stats_repo.top_users(db, limit=100)}
+        assert leaderboard.check(db) == []
+    finally:
+        db.close()
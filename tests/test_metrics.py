@@ -0,0 +1,49 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.core.metrics import LatencyHistogram, Metrics
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for latency_ms in range(1, 101):
+        histogram.observe(float(latency_ms))
+
+    assert histogram.count == 100
+    # Bucket interpolation keeps estimates within ~10%
+    assert 45 <= histogram.percentile(0.50) <= 55
+    assert 85 <= histogram.percentile(0.95) <= 105
+    assert histogram.percentile(0.99) <= 110
+
+
+def test_metrics_merge_thread_shards():
+    metrics = Metrics()
+
+    def record():
+        for _ in range(100):
+            metrics.record_request("/tasks/7", 12.5, 200, method="GET", route="/tasks/{task_id}")
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snapshot = metrics.get_metrics()
+    assert snapshot["total_requests"] == 400
+    assert snapshot["requests_by_path"]["/tasks/7"] == 400
+    assert snapshot["latency_by_route"]["GET /tasks/{task_id}"]["200"]["count"] == 400
+
+
+def test_prometheus_exposition():
+    client.get("/health")
+
+    response = client.get("/metrics/prometheus")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "sprintsync_http_request_duration_seconds_bucket" in response.text
+    assert 'method="GET",route="/health",status="200"' in response.text
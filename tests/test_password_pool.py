@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.config import BCRYPT_ROUNDS
+from app.core.password_pool import PasswordPool, PasswordPoolBusy, password_needs_rehash
+
+
+def test_pool_rejects_jobs_beyond_max_pending():
+    pool = PasswordPool(workers=1, max_pending=1)
+    try:
+        slow = pool.submit(time.sleep, 2)
+
+        with pytest.raises(PasswordPoolBusy):
+            pool.submit(time.sleep, 0)
+        assert pool.stats()["rejected"] == 1
+        assert pool.stats()["pending"] == 1
+
+        slow.result(timeout=30)
+        # The finished job gave its slot back
+        pool.submit(time.sleep, 0).result(timeout=30)
+        assert pool.stats()["pending"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_inline_pool_hashes_without_worker_processes():
+    pool = PasswordPool(workers=0, max_pending=1)
+
+    hashed = pool.hash("secret")
+    assert pool.verify("secret", hashed)
+    assert not pool.verify("wrong", hashed)
+    assert asyncio.run(pool.verify_async("secret", asyncio.run(pool.hash_async("secret"))))
+
+    assert pool._executor is None
+    assert not password_needs_rehash(hashed)
+    assert hashed.split("$")[2] == f"{BCRYPT_ROUNDS:02d}"
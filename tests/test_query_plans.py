@@ -0,0 +1,235 @@
+"""
+Query-plan regression tests.
+
+Seeds a realistically sized dataset, drives every router endpoint through
+the TestClient while recording the SQL they issue, then runs
+EXPLAIN (FORMAT JSON) on each statement. A test fails when a plan
+sequentially scans a large table, or when its estimated cost grows past
+the recorded baseline by more than QUERY_PLAN_COST_TOLERANCE.
+
+Seeding takes a while, so these tests only run when QUERY_PLAN_TESTS is
+set (CI runs them as a separate step):
+
+    QUERY_PLAN_TESTS=1 pytest tests/test_query_plans.py
+
+Record or refresh the baseline after an intentional change with:
+
+    QUERY_PLAN_TESTS=1 QUERY_PLAN_BASELINE=update pytest tests/test_query_plans.py
+"""
+import hashlib
+import json
+import os
+import re
+import warnings
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from app.core.config import EMBEDDING_DIMENSIONS
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.services import leaderboard
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("QUERY_PLAN_TESTS"),
+    reason="seeds 100k tasks; set QUERY_PLAN_TESTS=1 to run",
+)
+
+client = TestClient(app)
+
+BASELINE_PATH = Path(__file__).with_name("query_plans_baseline.json")
+# Enough users that the planner's choices on `users` (HNSW for nearest
+# resume, index lookups for the leaderboard join) match production
+SEED_USERS = 10_000
+SEED_TASKS = 100_000
+# Seq scans on tables smaller than this are the planner's right call
+SEQ_SCAN_MIN_ROWS = 1000
+QUERY_PLAN_COST_TOLERANCE = float(os.getenv("QUERY_PLAN_COST_TOLERANCE", "0.5"))
+EXPLAINED_STATEMENTS = ("SELECT", "UPDATE", "DELETE", "WITH")
+CREDENTIALS = {"email": "planuser@test.com", "password": "test123"}
+
+
+def fingerprint(statement: str):
+    normalized = re.sub(r"%\(\w+\)s", "?", statement)
+    normalized = re.sub(r"\?(?:, \?)+", "?", normalized)
+    normalized = " ".join(normalized.split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12], normalized
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def seed(connection):
+    connection.execute(text("SELECT setseed(0.42)"))
+    connection.execute(
+        text(
+            """
+            INSERT INTO users (email, hashed_password, is_admin, resume_text, resume_embedding)
+            SELECT 'plan-seed-' || g || '@example.com', 'x', false, 'Seeded resume ' || g,
+                   ARRAY(SELECT random() + g * 0 FROM generate_series(1, :dim))::vector
+            FROM generate_series(1, :users) AS g
+            """
+        ),
+        {"users": SEED_USERS, "dim": EMBEDDING_DIMENSIONS},
+    )
+    connection.execute(
+        text(
+            """
+            WITH seeded AS (
+                SELECT array_agg(id) AS ids FROM users WHERE email LIKE 'plan-seed-%'
+            )
+            INSERT INTO tasks (title, description, status, total_minutes, user_id,
+                               assigned_user_id, created_at, embedding_status)
+            SELECT 'Seeded task ' || g,
+                   'Seeded description ' || g,
+                   (ARRAY['TODO', 'IN_PROGRESS', 'DONE'])[1 + g % 3],
+                   (g * 37) % 480,
+                   ids[1 + g % array_length(ids, 1)],
+                   ids[1 + (g * 7) % array_length(ids, 1)],
+                   timezone('utc', now()) - (g % 365) * interval '1 day' - g * interval '1 second',
+                   'ready'
+            FROM seeded, generate_series(1, :tasks) AS g
+            """
+        ),
+        {"tasks": SEED_TASKS},
+    )
+    connection.commit()
+
+
+def unseed(connection):
+    seeded = "SELECT id FROM users WHERE email LIKE 'plan-seed-%'"
+    connection.execute(text(f"UPDATE tasks SET assigned_user_id = NULL WHERE assigned_user_id IN ({seeded})"))
+    connection.execute(text(f"DELETE FROM tasks WHERE user_id IN ({seeded})"))
+    connection.execute(text(f"DELETE FROM users WHERE id IN ({seeded})"))
+    connection.commit()
+
+
+def exercise_routers(statements):
+    """Call every router endpoint once, recording the SQL each one issues."""
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+            statements.append((statement, parameters))
+
+    client.post("/auth/register", json=CREDENTIALS)
+    token = client.post("/auth/login", json=CREDENTIALS).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        client.post("/auth/login", json=CREDENTIALS)
+        client.get("/me", headers=headers)
+        task_id = client.post(
+            "/tasks/",
+            json={"title": "Plan task", "description": "Profile the planner"},
+            headers=headers,
+        ).json()["id"]
+        for i in range(3):
+            client.post("/tasks/", json={"title": f"Plan task {i}"}, headers=headers)
+
+        page = client.get("/tasks/?limit=2", headers=headers)
+        client.get(
+            "/tasks/",
+            params={"limit": 2, "cursor": page.headers["X-Next-Cursor"]},
+            headers=headers,
+        )
+        client.get("/tasks/?status=DONE&created_after=2026-01-01T00:00:00", headers=headers)
+        client.get(f"/tasks/{task_id}", headers=headers)
+        client.put(f"/tasks/{task_id}", json={"total_minutes": 45}, headers=headers)
+        client.patch(f"/tasks/{task_id}/status", json={"status": "DONE"}, headers=headers)
+        client.get("/tasks/export", headers=headers)
+        client.get("/stats/top-users", headers=headers)
+        client.get("/stats/top-users?days=7&limit=10", headers=headers)
+        client.get("/ai/suggest", headers=headers)
+        client.delete(f"/tasks/{task_id}", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture(scope="module")
+def explained_plans():
+    with engine.connect() as connection:
+        seed(connection)
+    with SessionLocal() as db:
+        leaderboard.rebuild(db)
+
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("ANALYZE"))
+            connection.commit()
+            table_rows = {
+                name: rows
+                for name, rows in connection.execute(
+                    text("SELECT relname, reltuples FROM pg_class WHERE relkind = 'r'")
+                )
+            }
+
+        statements = []
+        exercise_routers(statements)
+
+        plans = {}
+        with engine.connect() as connection:
+            cursor = connection.connection.cursor()
+            for statement, parameters in statements:
+                key, normalized = fingerprint(statement)
+                if key in plans:
+                    continue
+                cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+                result = cursor.fetchone()[0]
+                if isinstance(result, str):
+                    result = json.loads(result)
+                plans[key] = (normalized, result[0]["Plan"])
+            cursor.close()
+
+        yield plans, table_rows
+    finally:
+        with engine.connect() as connection:
+            unseed(connection)
+        with SessionLocal() as db:
+            leaderboard.rebuild(db)
+
+
+def test_router_queries_avoid_sequential_scans(explained_plans):
+    plans, table_rows = explained_plans
+    assert plans, "no router queries were recorded"
+
+    offenders = [
+        f"{node['Relation Name']}: {normalized}"
+        for normalized, plan in plans.values()
+        for node in plan_nodes(plan)
+        if node["Node Type"] == "Seq Scan"
+        and table_rows.get(node["Relation Name"], 0) >= SEQ_SCAN_MIN_ROWS
+    ]
+    assert not offenders, "Sequential scans on large tables:\n" + "\n".join(offenders)
+
+
+def test_router_query_costs_match_baseline(explained_plans):
+    plans, _ = explained_plans
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+
+    if os.getenv("QUERY_PLAN_BASELINE") == "update":
+        recorded = {
+            key: {"sql": normalized, "total_cost": plan["Total Cost"]}
+            for key, (normalized, plan) in sorted(plans.items())
+        }
+        BASELINE_PATH.write_text(json.dumps(recorded, indent=2) + "\n")
+        return
+
+    assert baseline, f"no recorded baseline at {BASELINE_PATH}; run with QUERY_PLAN_BASELINE=update"
+
+    for key, (normalized, _) in plans.items():
+        if key not in baseline:
+            warnings.warn(f"no recorded cost for: {normalized}")
+
+    regressions = [
+        f"{plan['Total Cost']:.1f} > {baseline[key]['total_cost']:.1f}: {normalized}"
+        for key, (normalized, plan) in plans.items()
+        if key in baseline
+        and plan["Total Cost"] > baseline[key]["total_cost"] * (1 + QUERY_PLAN_COST_TOLERANCE)
+    ]
+    assert not regressions, "Plan cost regressions:\n" + "\n".join(regressions)
@@ -0,0 +1,42 @@
+from app.db.session import SessionLocal
+from app.models.task import Task
+from app.models.user import User
+from app.services.reembed import Checkpoint, reembed
+
+
+def test_checkpoint_keeps_runs_apart_and_clears(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = Checkpoint(path)
+    assert checkpoint.load("tasks:missing") == 0
+
+    checkpoint.save("tasks:missing", 500)
+    checkpoint.save("users:all", 20)
+    assert Checkpoint(path).load("tasks:missing") == 500
+
+    checkpoint.clear("tasks:missing")
+    assert checkpoint.load("tasks:missing") == 0
+    assert checkpoint.load("users:all") == 20
+    assert not (tmp_path / "checkpoint.json.tmp").exists()
+
+
+def test_reembed_collects_ids_only_when_asked():
+    with SessionLocal() as db:
+        owner = User(email="reembed-owner@test.com", hashed_password="x")
+        db.add(owner)
+        db.flush()
+        first = Task(title="Backfill me", user_id=owner.id)
+        db.add(first)
+        db.commit()
+        owner_id = first.user_id
+
+    done, ids = reembed("tasks", batch_size=2, workers=2)
+    assert done >= 1 and ids == []
+
+    with SessionLocal() as db:
+        second = Task(title="Backfill me too", user_id=owner_id)
+        db.add(second)
+        db.commit()
+        second_id = second.id
+
+    done, ids = reembed("tasks", batch_size=2, workers=2, collect_ids=True)
+    assert ids == [second_id]
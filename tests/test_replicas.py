@@ -0,0 +1,22 @@
+import time
+
+from app.db.replicas import ReplicaRouter
+
+
+def test_reads_stick_to_primary_after_own_write_or_when_replicas_lag():
+    router = ReplicaRouter("primary", ["replica-a", "replica-b"])
+    # Pretend the lag checker already ran and found both replicas healthy
+    router._checker = object()
+    router._healthy = [0, 1]
+
+    assert router.engine_for(user_id=1) in ("replica-a", "replica-b")
+
+    router.mark_write(1)
+    assert router.engine_for(user_id=1) == "primary"
+    assert router.engine_for(user_id=2) != "primary"
+
+    # The cookie carries stickiness across workers
+    assert router.engine_for(user_id=3, last_write_at=time.time()) == "primary"
+
+    router._healthy = []
+    assert router.engine_for(user_id=2) == "primary"
@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+# Import-time budget for app.main; `python -m benchmarks.startup` shows where it goes
+BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "2000"))
+
+# Loaded on first use, not when a worker starts
+LAZY_MODULES = ("openai", "app.services.rebalance", "app.services.task_import", "app.services.task_export")
+
+
+def run_python(*args):
+    env = dict(os.environ)
+    # Importing the app must not need an API key
+    env.pop("OPENAI_API_KEY", None)
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, env=env, check=True
+    )
+
+
+def test_import_app_main_within_budget():
+    timings = []
+    for _ in range(2):
+        stderr = run_python("-X", "importtime", "-c", "import app.main").stderr
+        line = next(line for line in stderr.splitlines() if line.endswith("| app.main"))
+        timings.append(int(line.split("|")[1]) / 1000)
+
+    assert min(timings) < BUDGET_MS
+
+
+def test_heavy_modules_load_lazily():
+    stdout = run_python(
+        "-c",
+        "import json, sys, app.main; "
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))",
+    ).stdout
+    assert json.loads(stdout) == []
+
+
+def test_liveness_and_readiness():
+    with TestClient(app) as client:
+        assert client.get("/health").json() == {"status": "healthy"}
+
+        for _ in range(100):
+            response = client.get("/health/ready")
+            if response.status_code == 200:
+                break
+            time.sleep(0.1)
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        assert response.json()["warmed_connections"] >= 1
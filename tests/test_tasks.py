@@ -1,5 +1,14 @@
+import json
+import time
+from datetime import datetime, timezone
+
 from fastapi.testclient import TestClient
+from app.db.session import SessionLocal
 from app.main import app
+from app.models.task import Task
+from app.schemas.task import TaskResponse
+from app.services import embedding_worker
+from app.services.task_import import import_tasks
 
 client = TestClient(app)
 
@@ -31,4 +40,129 @@ def test_create_task():
     )
 
     assert response.status_code == 200
-    assert response.json()["title"] == "Test Task"
\ No newline at end of file
+    assert response.json()["title"] == "Test Task"
+    assert response.json()["embedding_status"] == "ready"
+
+def test_bulk_import_reports_row_errors():
+    token = get_token()
+
+    body = (
+        "title,description,total_minutes\n"
+        "Import A,Write the data migration,30\n"
+        ",Missing a title,15\n"
+        "Import B,,45\n"
+    )
+
+    response = client.post(
+        "/tasks/bulk",
+        content=body,
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "text/csv",
+        },
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["imported"] == 2
+    assert report["failed"] == 1
+    assert report["errors"][0]["row"] == 3
+
+def test_bulk_import_caps_stored_errors():
+    lines = ["title,description,total_minutes"] + [f",No title {i},15" for i in range(5)]
+
+    with SessionLocal() as db:
+        report = import_tasks(db, lines, "csv", user_id=0, max_errors=2)
+
+    assert report.imported == 0
+    assert report.failed == 5
+    assert [error.row for error in report.errors] == [2, 3]
+
+def test_list_tasks_paginates_with_cursor():
+    token = get_token()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for i in range(3):
+        client.post("/tasks/", json={"title": f"Page Task {i}"}, headers=headers)
+
+    first = client.get("/tasks/?limit=2", headers=headers)
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/tasks/", params={"limit": 2, "cursor": cursor}, headers=headers)
+    assert second.status_code == 200
+    first_ids = {task["id"] for task in first.json()}
+    assert not first_ids & {task["id"] for task in second.json()}
+
+    bad = client.get("/tasks/?cursor=not-a-cursor", headers=headers)
+    assert bad.status_code == 400
+
+def test_export_tasks_streams_ndjson():
+    token = get_token()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client.post("/tasks/", json={"title": "Export Task"}, headers=headers)
+
+    response = client.get("/tasks/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert "Export Task" in {row["title"] for row in rows}
+
+    csv_response = client.get("/tasks/export?format=csv", headers=headers)
+    assert csv_response.text.startswith("id,title,description,status")
+
+    assert client.get("/tasks/export/all", headers=headers).status_code == 403
+
+def test_list_tasks_renders_task_response_fields():
+    token = get_token()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client.post("/tasks/", json={"title": "Shape Task"}, headers=headers)
+
+    task = client.get("/tasks/?limit=1", headers=headers).json()[0]
+    assert set(task) == set(TaskResponse.model_fields)
+    TaskResponse.model_validate(task)
+
+def test_failed_embedding_is_rescheduled_and_swept(monkeypatch):
+    token = get_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    task_id = client.post(
+        "/tasks/", json={"title": "Sweep Task", "description": "Retry me"}, headers=headers
+    ).json()["id"]
+
+    with SessionLocal() as db:
+        db.query(Task).filter(Task.id == task_id).update({"embedding_status": "pending", "embedding": None})
+        db.commit()
+
+    def outage(texts):
+        raise RuntimeError("embeddings API unavailable")
+
+    # A failure returns at once and schedules the retry on the row
+    monkeypatch.setattr(embedding_worker, "get_embeddings", outage)
+    with SessionLocal() as db:
+        assert embedding_worker.process_pending(db, task_ids=[task_id]) == (1, 1)
+        task = db.get(Task, task_id)
+        assert task.embedding_status == "pending"
+        assert task.embedding_attempts == 1
+        assert task.embedding_retry_at > datetime.now(timezone.utc)
+        # Not due yet
+        assert embedding_worker.process_pending(db, task_ids=[task_id]) == (0, 0)
+    monkeypatch.undo()
+
+    with SessionLocal() as db:
+        db.query(Task).filter(Task.id == task_id).update({"embedding_retry_at": None})
+        db.commit()
+
+    # The sweep picks due pending rows up, e.g. after a restart
+    pipeline = embedding_worker.EmbeddingPipeline(workers=1, sweep_interval=60)
+    pipeline.sweep()
+    for _ in range(100):
+        with SessionLocal() as db:
+            status = db.query(Task.embedding_status).filter(Task.id == task_id).scalar()
+        if status == "ready":
+            break
+        time.sleep(0.05)
+    pipeline.shutdown()
+    assert status == "ready"